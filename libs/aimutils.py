@@ -0,0 +1,586 @@
+import numpy
+
+from enum import IntEnum
+from dcc.dataclasses import vector, transformationmatrix
+from dcc.decorators.undo import undo
+from . import matrixarray, querycache, writequeue, hierarchyutils, fnpool, profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+__axes__ = 'xyz'
+__axis_vectors__ = vector.Vector.xAxis, vector.Vector.yAxis, vector.Vector.zAxis
+
+
+class WorldUpType(IntEnum):
+    """
+    Enum class of all available world up types.
+    """
+
+    SCENE = 0
+    OBJECT = 1
+    OBJECT_ROTATION = 2
+    VECTOR = 3
+
+
+def forwardVector(start, end, normalize=False, cache=None):
+    """
+    Returns the forward vector between two nodes.
+
+    :type start: Any
+    :type end: Any
+    :type normalize: bool
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: vector.Vector
+    """
+
+    # Get forward vector between nodes
+    #
+    cache = querycache.QueryCache() if cache is None else cache
+
+    with fnpool.borrow('FnTransform', start, end) as (startNode, endNode):
+
+        startPoint = cache.translation(startNode, worldSpace=True)
+        endPoint = cache.translation(endNode, worldSpace=True)
+        vec = endPoint - startPoint
+
+    # Check if vector should be normalized
+    #
+    if normalize:
+
+        return vec.normalize()
+
+    else:
+
+        return vec
+
+
+def averageVectors(vectors, normalize=False):
+    """
+    Returns the averaged vector from a list of vectors.
+
+    :type vectors: List[vector.Vector]
+    :type normalize: bool
+    :rtype: vector.Vector
+    """
+
+    vec = sum(vectors) / len(vectors)
+
+    if normalize:
+
+        vec.normalize()
+
+    return vec
+
+
+def perpendicularVector(nodes, cache=None):
+    """
+    Returns the perpendicular vector from the supplied nodes.
+    This function is intended to be used with limbs in order to derive a pole vector.
+
+    :type nodes: List[Any]
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: Union[vector.Vector, None]
+    """
+
+    # Verify there are enough nodes
+    #
+    numNodes = len(nodes)
+
+    if not (numNodes >= 3):
+
+        log.warning(f'perpendicularVector() expects at least 3 nodes ({numNodes} given)!')
+        return
+
+    # Iterate through nodes
+    #
+    cache = querycache.QueryCache() if cache is None else cache
+
+    vectors = []
+
+    with fnpool.borrow('FnTransform', nodes[0], None) as (startNode, endNode):
+
+        origin = cache.translation(startNode, worldSpace=True)
+
+        for (startObj, endObj) in zip(nodes[1:-1], nodes[2:]):
+
+            startNode.setObject(startObj)
+            endNode.setObject(endObj)
+
+            startPoint = cache.translation(startNode, worldSpace=True)
+            endPoint = cache.translation(endNode, worldSpace=True)
+
+            cross = (startPoint - origin).normalize() ^ (endPoint - origin).normalize()
+            vectors.append(cross)
+
+    return averageVectors(vectors, normalize=True)
+
+
+def axisVector(node, axis, cache=None):
+    """
+    Returns the axis vector from the supplied node.
+
+    :type node: Any
+    :type axis: int
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: vector.Vector
+    """
+
+    cache = querycache.QueryCache() if cache is None else cache
+
+    with fnpool.borrow('FnTransform', node) as (fnTransform,):
+
+        worldMatrix = cache.worldMatrix(fnTransform)
+        rows = worldMatrix.decompose(normalize=True)
+
+    return rows[axis]
+
+
+def sceneUpVector(scene):
+    """
+    Returns the up vector from the supplied scene.
+
+    :type scene: fnscene.FnScene
+    :rtype: vector.Vector
+    """
+
+    upAxis = scene.getUpAxis()
+
+    index = __axes__.index(upAxis.lower())
+
+    return __axis_vectors__[index].copy()
+
+
+def worldUpObjectVector(start, worldUpObject, worldUpVector, normalize=False, cache=None):
+    """
+    Returns the vector from the start node to the world up object.
+    If the world up object is invalid then the world up vector is returned instead.
+
+    :type start: Any
+    :type worldUpObject: fntransform.FnTransform
+    :type worldUpVector: vector.Vector
+    :type normalize: bool
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: vector.Vector
+    """
+
+    # Check if world up object is valid
+    #
+    vec = worldUpVector.copy()
+
+    if worldUpObject is not None and worldUpObject.isValid():
+
+        cache = querycache.QueryCache() if cache is None else cache
+
+        with fnpool.borrow('FnTransform', start) as (startNode,):
+
+            startPoint = cache.translation(startNode, worldSpace=True)
+            endPoint = cache.translation(worldUpObject, worldSpace=True)
+
+        vec = endPoint - startPoint
+
+    else:
+
+        log.warning('Unable to locate world up object!')
+
+    # Check if vector should be normalized
+    #
+    if normalize:
+
+        return vec.normalize()
+
+    else:
+
+        return vec
+
+
+def worldUpObjectMatrix(worldUpObject, cache=None):
+    """
+    Returns the world matrix from the world up object.
+    If the world up object is invalid then an identity matrix is returned instead.
+
+    :type worldUpObject: fntransform.FnTransform
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: transformationmatrix.TransformationMatrix
+    """
+
+    if worldUpObject is not None and worldUpObject.isValid():
+
+        cache = querycache.QueryCache() if cache is None else cache
+        return cache.worldMatrix(worldUpObject)
+
+    else:
+
+        return transformationmatrix.TransformationMatrix()
+
+
+def worldUpObjectRotationVector(worldUpObject, worldUpVector, cache=None):
+    """
+    Returns the world up vector transformed by the world up object's rotation.
+    If the world up object is invalid then the world up vector is returned instead.
+
+    :type worldUpObject: fntransform.FnTransform
+    :type worldUpVector: vector.Vector
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: vector.Vector
+    """
+
+    if worldUpObject is not None and worldUpObject.isValid():
+
+        worldMatrix = worldUpObjectMatrix(worldUpObject, cache=cache)
+        xAxis, yAxis, zAxis, position = worldMatrix.decompose(normalize=True)
+
+        return ((xAxis * worldUpVector.x) + (yAxis * worldUpVector.y) + (zAxis * worldUpVector.z)).normalize()
+
+    else:
+
+        return worldUpVector.normal()
+
+
+def upVector(start, scene, worldUpType=WorldUpType.SCENE, worldUpVector=vector.Vector.zAxis, worldUpObject=None, cache=None):
+    """
+    Returns the up vector based on the supplied world up settings.
+
+    :type start: Any
+    :type scene: fnscene.FnScene
+    :type worldUpType: WorldUpType
+    :type worldUpVector: vector.Vector
+    :type worldUpObject: fntransform.FnTransform
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: vector.Vector
+    """
+
+    # Inspect world up type
+    #
+    if worldUpType == WorldUpType.SCENE:
+
+        return sceneUpVector(scene)
+
+    elif worldUpType == WorldUpType.OBJECT:
+
+        return worldUpObjectVector(start, worldUpObject, worldUpVector, cache=cache)
+
+    elif worldUpType == WorldUpType.OBJECT_ROTATION:
+
+        return worldUpObjectRotationVector(worldUpObject, worldUpVector, cache=cache)
+
+    elif worldUpType == WorldUpType.VECTOR:
+
+        return worldUpVector.normal()
+
+    else:
+
+        raise RuntimeError(f'upVector() expects a valid world up type ({worldUpType} given)!')
+
+
+def aimMatrices(origins, forwardVectors, upVectors, forwardAxis=0, forwardAxisSign=1.0, upAxis=1, upAxisSign=1.0):
+    """
+    Returns an array of aim matrices from the supplied origins, forward and up vectors.
+    Single vectors are broadcast against the remaining arrays.
+
+    :type origins: Union[numpy.ndarray, List[vector.Vector]]
+    :type forwardVectors: Union[numpy.ndarray, List[vector.Vector], vector.Vector]
+    :type upVectors: Union[numpy.ndarray, List[vector.Vector], vector.Vector]
+    :type forwardAxis: int
+    :type forwardAxisSign: float
+    :type upAxis: int
+    :type upAxisSign: float
+    :rtype: matrixarray.MatrixArray
+    """
+
+    matrices = matrixarray.MatrixArray.fromTranslations(matrixarray.asVectors(origins))
+    matrices.lookAt(
+        forwardVector=matrixarray.asVectors(forwardVectors), forwardAxis=forwardAxis, forwardAxisSign=forwardAxisSign,
+        upVector=matrixarray.asVectors(upVectors), upAxis=upAxis, upAxisSign=upAxisSign,
+    )
+
+    return matrices
+
+
+def aimMatrix(origin, forwardVector, upVector, forwardAxis=0, forwardAxisSign=1.0, upAxis=1, upAxisSign=1.0):
+    """
+    Returns an aim matrix from the supplied origin, forward and up vectors.
+
+    :type origin: vector.Vector
+    :type forwardVector: vector.Vector
+    :type upVector: vector.Vector
+    :type forwardAxis: int
+    :type forwardAxisSign: float
+    :type upAxis: int
+    :type upAxisSign: float
+    :rtype: transformationmatrix.TransformationMatrix
+    """
+
+    matrices = aimMatrices(
+        [origin], forwardVector, upVector,
+        forwardAxis=forwardAxis, forwardAxisSign=forwardAxisSign,
+        upAxis=upAxis, upAxisSign=upAxisSign
+    )
+
+    return matrices[0]
+
+
+def getUpVectors(origins, scene, worldUpType=WorldUpType.SCENE, worldUpVector=vector.Vector.zAxis, worldUpObject=None, cache=None):
+    """
+    Returns the up vectors for the supplied Nx3 origins based on the world up settings.
+    World up types that do not depend on the origin return a single 1x3 vector instead.
+
+    :type origins: numpy.ndarray
+    :type scene: fnscene.FnScene
+    :type worldUpType: WorldUpType
+    :type worldUpVector: vector.Vector
+    :type worldUpObject: fntransform.FnTransform
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: numpy.ndarray
+    """
+
+    isValidObject = worldUpObject is not None and worldUpObject.isValid()
+
+    if worldUpType == WorldUpType.OBJECT and isValidObject:
+
+        cache = querycache.QueryCache() if cache is None else cache
+        endPoint = numpy.array(cache.translation(worldUpObject, worldSpace=True).toList(), dtype=numpy.float64)
+
+        return endPoint - origins
+
+    elif worldUpType == WorldUpType.OBJECT:
+
+        log.warning('Unable to locate world up object!')
+        return matrixarray.asVectors(worldUpVector)
+
+    else:
+
+        return matrixarray.asVectors(upVector(None, scene, worldUpType=worldUpType, worldUpVector=worldUpVector, worldUpObject=worldUpObject, cache=cache))
+
+
+def propagateAimMatrices(worldMatrices, parentInverseMatrices, startIndices, scene, forwardAxis=0, forwardAxisSign=1.0, upAxis=1, upAxisSign=1.0, worldUpType=WorldUpType.SCENE, worldUpVector=vector.Vector.zAxis, worldUpObject=None, preserveChildren=False, parents=None, descendants=None, cache=None):
+    """
+    Returns the local aim matrices for nodes that are related to one another.
+    Each aim is evaluated in selection order and its result is propagated to the affected descendants in memory.
+    This reproduces the results of aiming each node in the scene one at a time without re-evaluating the scene!
+    Every matrix is inverted in one batch up front, after which the inverses are updated alongside their matrices.
+
+    :type worldMatrices: matrixarray.MatrixArray
+    :type parentInverseMatrices: matrixarray.MatrixArray
+    :type startIndices: numpy.ndarray
+    :type scene: fnscene.FnScene
+    :type forwardAxis: int
+    :type forwardAxisSign: float
+    :type upAxis: int
+    :type upAxisSign: float
+    :type worldUpType: WorldUpType
+    :type worldUpVector: vector.Vector
+    :type worldUpObject: fntransform.FnTransform
+    :type preserveChildren: bool
+    :type parents: List[int]
+    :type descendants: List[List[int]]
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: matrixarray.MatrixArray
+    """
+
+    # Get affected indices
+    # When preserving children only the immediate children's parent matrices are affected!
+    #
+    worldArray = worldMatrices.array
+    worldInverseArray = numpy.linalg.inv(worldArray)
+
+    parentInverseArray = parentInverseMatrices.array.copy()
+    parentArray = numpy.linalg.inv(parentInverseArray)
+
+    if preserveChildren:
+
+        affected = [numpy.array([child for (child, parent) in enumerate(parents) if parent == index], dtype=int) for index in range(len(parents))]
+
+    else:
+
+        affected = [numpy.array(indices, dtype=int) for indices in descendants]
+
+    # Evaluate world up settings once
+    # Only object up vectors depend on the origin, in which case the world up object's position is returned instead!
+    #
+    isObjectUp = worldUpType == WorldUpType.OBJECT and worldUpObject is not None and worldUpObject.isValid()
+    worldUp = getUpVectors(numpy.zeros((1, 3)), scene, worldUpType=worldUpType, worldUpVector=worldUpVector, worldUpObject=worldUpObject, cache=cache)
+
+    # Iterate through start nodes
+    #
+    for index in startIndices:
+
+        # Compose aim matrix in parent space
+        #
+        origin = worldArray[index, 3, :3].copy()
+        forward = worldArray[index + 1, 3, :3] - origin
+        up = (worldUp - origin) if isObjectUp else worldUp
+
+        aimMatrix = aimMatrices(
+            origin, forward, up,
+            forwardAxis=forwardAxis, forwardAxisSign=forwardAxisSign,
+            upAxis=upAxis, upAxisSign=upAxisSign
+        ).array[0]
+
+        matrix = aimMatrix @ parentInverseArray[index]
+
+        # Evaluate resulting local matrix
+        # Since translation and scale are skipped only the local rotation is replaced!
+        #
+        localMatrix = worldArray[index] @ parentInverseArray[index]
+
+        scale = numpy.linalg.norm(localMatrix[:3, :3], axis=1)
+        norms = numpy.linalg.norm(matrix[:3, :3], axis=1)
+
+        newLocalMatrix = localMatrix.copy()
+        newLocalMatrix[:3, :3] = matrix[:3, :3] * (scale / norms)[:, None]
+
+        # Invert new local matrix
+        # Its rotation is the orthonormal aim matrix in parent space with rescaled rows, so the parent matrix and the aim's transpose undo it!
+        #
+        newLocalInverse = numpy.identity(4)
+        newLocalInverse[:3, :3] = (parentArray[index, :3, :3] @ aimMatrix[:3, :3].T) * (norms / scale)[None, :]
+        newLocalInverse[3, :3] = -newLocalMatrix[3, :3] @ newLocalInverse[:3, :3]
+
+        # Evaluate resulting world matrix and its change
+        #
+        newWorldMatrix = newLocalMatrix @ parentArray[index]
+        newWorldInverse = parentInverseArray[index] @ newLocalInverse
+
+        delta = worldInverseArray[index] @ newWorldMatrix
+        deltaInverse = newWorldInverse @ worldArray[index]
+
+        worldArray[index] = newWorldMatrix
+        worldInverseArray[index] = newWorldInverse
+
+        # Propagate changes to affected nodes
+        #
+        indices = affected[index]
+
+        if len(indices) == 0:
+
+            continue
+
+        parentArray[indices] = parentArray[indices] @ delta
+        parentInverseArray[indices] = deltaInverse @ parentInverseArray[indices]
+
+        if not preserveChildren:
+
+            worldArray[indices] = worldArray[indices] @ delta
+            worldInverseArray[indices] = deltaInverse @ worldInverseArray[indices]
+
+    # Compose final matrices in parent space
+    # Start nodes can be moved by ancestors that are aimed after them!
+    #
+    matrices = matrixarray.MatrixArray(worldArray[startIndices] @ parentInverseArray[startIndices])
+
+    return matrices
+
+
+@undo(name='Aim Transforms')
+def aimTransforms(nodes, scene, forwardAxis=0, forwardAxisSign=1.0, upAxis=1, upAxisSign=1.0, worldUpType=WorldUpType.SCENE, worldUpVector=vector.Vector.zAxis, worldUpObject=None, preserveChildren=False, freezeTransform=False, cache=None):
+    """
+    Aims each node towards the subsequent node.
+    The last node is only used as an aim target!
+    Chain matrices are read once and every aim matrix is composed in memory before anything is written.
+    Rotations are written using the euler solution closest to each node's current channels, so they never flip at 180 degrees.
+
+    :type nodes: List[Any]
+    :type scene: fnscene.FnScene
+    :type forwardAxis: int
+    :type forwardAxisSign: float
+    :type upAxis: int
+    :type upAxisSign: float
+    :type worldUpType: WorldUpType
+    :type worldUpVector: vector.Vector
+    :type worldUpObject: fntransform.FnTransform
+    :type preserveChildren: bool
+    :type freezeTransform: bool
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: None
+    """
+
+    # Attach nodes to function sets
+    # Function sets are returned to the pool once the matrices have been written!
+    #
+    cache = querycache.QueryCache() if cache is None else cache
+
+    with fnpool.borrow('FnTransform', *nodes) as fnTransforms:
+
+        # Read world and parent matrices once
+        # Pairs with an invalid start or end node are skipped!
+        #
+        isValid = numpy.array([node.isValid() for node in fnTransforms], dtype=bool)
+
+        startIndices = numpy.flatnonzero(isValid[:-1] & isValid[1:])
+        endIndices = startIndices + 1
+
+        if len(startIndices) == 0:
+
+            return
+
+        startNodes = [fnTransforms[index] for index in startIndices]
+
+        worldMatrices = matrixarray.MatrixArray(len(fnTransforms))
+        parentInverseMatrices = matrixarray.MatrixArray(len(fnTransforms))
+
+        profiler.count('nodes', len(fnTransforms))
+
+        with profiler.phase('readMatrices'):
+
+            for index in numpy.flatnonzero(isValid):
+
+                worldMatrices.array[index] = matrixarray.toArray(cache.worldMatrix(fnTransforms[index]))
+                parentInverseMatrices.array[index] = matrixarray.toArray(cache.parentInverseMatrix(fnTransforms[index]))
+
+        # Check if any nodes are related
+        # If so, then each aim has to be propagated to the affected descendants in memory
+        #
+        with profiler.phase('hierarchy'):
+
+            parents, ancestors = hierarchyutils.getSelectedHierarchy(fnTransforms)
+            isRelated = any(len(indices) > 0 for indices in ancestors)
+
+        if isRelated:
+
+            with profiler.phase('math'):
+
+                matrices = propagateAimMatrices(
+                    worldMatrices, parentInverseMatrices, startIndices, scene,
+                    forwardAxis=forwardAxis, forwardAxisSign=forwardAxisSign,
+                    upAxis=upAxis, upAxisSign=upAxisSign,
+                    worldUpType=worldUpType, worldUpVector=worldUpVector, worldUpObject=worldUpObject,
+                    preserveChildren=preserveChildren,
+                    parents=parents,
+                    descendants=hierarchyutils.getSelectedDescendants(ancestors),
+                    cache=cache
+                )
+
+        else:
+
+            # Compose aim matrices in parent space
+            #
+            with profiler.phase('math'):
+
+                positions = worldMatrices.translation()
+
+                origins = positions[startIndices]
+                forwardVectors = positions[endIndices] - origins
+                upVectors = getUpVectors(origins, scene, worldUpType=worldUpType, worldUpVector=worldUpVector, worldUpObject=worldUpObject, cache=cache)
+
+                matrices = aimMatrices(
+                    origins, forwardVectors, upVectors,
+                    forwardAxis=forwardAxis, forwardAxisSign=forwardAxisSign,
+                    upAxis=upAxis, upAxisSign=upAxisSign
+                )
+
+                matrices *= parentInverseMatrices[startIndices]
+
+        # Apply matrices to start nodes
+        # Best to skip scale since we could accidentally zero it out
+        #
+        queue = writequeue.WriteQueue(cache=cache, unwrapEulers=True)
+        depths = [len(ancestors[index]) for index in startIndices]
+
+        queue.pushMany(startNodes, matrices, depths=depths, preserveChildren=preserveChildren, freezeTransform=freezeTransform, skipTranslate=True, skipScale=True)
+
+        log.info(f'Applying aim matrices to {len(startNodes)} node(s).')
+        queue.flush()
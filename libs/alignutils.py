@@ -0,0 +1,416 @@
+import numpy
+
+from enum import IntEnum
+from dcc.dataclasses import transformationmatrix
+from . import matrixarray, scenesnapshot, writequeue, hierarchyutils, fnpool, profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+class OffsetType(IntEnum):
+    """
+    Enum class of all available bounding box offsets.
+    """
+
+    MINIMUM = 0
+    CENTER = 1
+    PIVOT = 2
+    MAXIMUM = 3
+    ORIENTED_MINIMUM = 4
+    ORIENTED_CENTER = 5
+    ORIENTED_MAXIMUM = 6
+
+
+__oriented_offsets__ = {
+    OffsetType.MINIMUM: OffsetType.ORIENTED_MINIMUM,
+    OffsetType.CENTER: OffsetType.ORIENTED_CENTER,
+    OffsetType.MAXIMUM: OffsetType.ORIENTED_MAXIMUM
+}
+
+
+class AlignMode(IntEnum):
+    """
+    Enum class of all available selection modes.
+    """
+
+    ONE_TO_MANY = 0
+    PAIRS = 1
+
+
+def splitSelection(selection, alignMode=AlignMode.ONE_TO_MANY):
+    """
+    Splits the supplied selection into source and target nodes.
+    One-to-many uses the first node as the source for all remaining nodes.
+    Pairs expects interleaved source and target nodes: s1, t1, s2, t2...
+
+    :type selection: List[Any]
+    :type alignMode: AlignMode
+    :rtype: Tuple[List[Any], List[Any]]
+    """
+
+    selectionCount = len(selection)
+
+    if alignMode == AlignMode.ONE_TO_MANY:
+
+        if selectionCount < 2:
+
+            raise TypeError(f'splitSelection() expects at least 2 selected nodes ({selectionCount} given)!')
+
+        return selection[:1], selection[1:]
+
+    elif alignMode == AlignMode.PAIRS:
+
+        if selectionCount < 2 or (selectionCount % 2) != 0:
+
+            raise TypeError(f'splitSelection() expects an even number of selected nodes ({selectionCount} given)!')
+
+        return selection[0::2], selection[1::2]
+
+    else:
+
+        raise TypeError(f'splitSelection() expects a valid align mode ({alignMode} given)!')
+
+
+def getTransforms(nodes):
+    """
+    Returns a list of transform function sets from the supplied nodes.
+    The function sets are acquired from the shared pool and should be released once they are no longer needed!
+
+    :type nodes: List[Any]
+    :rtype: List[fntransform.FnTransform]
+    """
+
+    fnTransforms = fnpool.acquireMany('FnTransform', nodes)
+
+    for (node, fnTransform) in zip(nodes, fnTransforms):
+
+        if not fnTransform.isValid():
+
+            fnpool.release(*fnTransforms)
+            raise TypeError(f'getTransforms() expects a transform node ({node} given)!')
+
+    return fnTransforms
+
+
+def isBoundingBoxOffset(offsetType):
+    """
+    Evaluates if the supplied offset type requires a bounding box.
+
+    :type offsetType: OffsetType
+    :rtype: bool
+    """
+
+    return offsetType in (OffsetType.MINIMUM, OffsetType.CENTER, OffsetType.MAXIMUM)
+
+
+def isOrientedBoundingBoxOffset(offsetType):
+    """
+    Evaluates if the supplied offset type requires an oriented bounding box.
+
+    :type offsetType: OffsetType
+    :rtype: bool
+    """
+
+    return offsetType in __oriented_offsets__.values()
+
+
+def setOriented(offsetType, oriented):
+    """
+    Returns the oriented, or axis-aligned, equivalent of the supplied offset type.
+    Pivots are returned unchanged.
+
+    :type offsetType: OffsetType
+    :type oriented: bool
+    :rtype: OffsetType
+    """
+
+    offsetType = OffsetType(offsetType)
+
+    if oriented:
+
+        return __oriented_offsets__.get(offsetType, offsetType)
+
+    else:
+
+        return next((aligned for (aligned, orientedType) in __oriented_offsets__.items() if orientedType == offsetType), offsetType)
+
+
+def getReadFlags(offsetType):
+    """
+    Returns the `ReadTransaction.read` keywords required by the supplied offset type.
+
+    :type offsetType: OffsetType
+    :rtype: Dict[str, bool]
+    """
+
+    return dict(boundingBox=isBoundingBoxOffset(offsetType), orientedBoundingBox=isOrientedBoundingBoxOffset(offsetType))
+
+
+def getOffsetPoints(snapshots, offsetType=OffsetType.PIVOT):
+    """
+    Returns the Nx3 world points from the supplied transform snapshots for the specified offset type.
+    Please be aware that axis-aligned bounding boxes are evaluated in world space!
+
+    :type snapshots: List[scenesnapshot.TransformSnapshot]
+    :type offsetType: OffsetType
+    :rtype: numpy.ndarray
+    """
+
+    if offsetType == OffsetType.MINIMUM:
+
+        return numpy.array([snapshot.boundingBox[0] for snapshot in snapshots]).reshape(-1, 3)
+
+    elif offsetType == OffsetType.CENTER:
+
+        return numpy.array([snapshot.boundingBox.mean(axis=0) for snapshot in snapshots]).reshape(-1, 3)
+
+    elif offsetType == OffsetType.MAXIMUM:
+
+        return numpy.array([snapshot.boundingBox[1] for snapshot in snapshots]).reshape(-1, 3)
+
+    elif isOrientedBoundingBoxOffset(offsetType):
+
+        row = (OffsetType.ORIENTED_MINIMUM, OffsetType.ORIENTED_CENTER, OffsetType.ORIENTED_MAXIMUM).index(offsetType)
+        return numpy.array([snapshot.orientedBoundingBox[row] for snapshot in snapshots]).reshape(-1, 3)
+
+    else:
+
+        return numpy.array([snapshot.pivot() for snapshot in snapshots]).reshape(-1, 3)
+
+
+def getOffsetMatrices(worldMatrices, points):
+    """
+    Returns the offset matrices from each world matrix to the supplied world points.
+    Points that coincide with their pivots will result in identity matrices.
+
+    :type worldMatrices: matrixarray.MatrixArray
+    :type points: numpy.ndarray
+    :rtype: matrixarray.MatrixArray
+    """
+
+    translateMatrices = matrixarray.MatrixArray.fromTranslations(points)
+    return (translateMatrices * worldMatrices.inverse()).translationPart()
+
+
+def getOffsetMatrix(node, offsetType=OffsetType.PIVOT):
+    """
+    Returns the offset matrix from the supplied node's pivot to the specified bounding box point.
+    Please be aware that bounding boxes are evaluated in world space!
+
+    :type node: fntransform.FnTransform
+    :type offsetType: OffsetType
+    :rtype: transformationmatrix.TransformationMatrix
+    """
+
+    transaction = scenesnapshot.ReadTransaction()
+    handles = [transaction.read(node, **getReadFlags(offsetType))]
+    snapshot = transaction.freeze()
+
+    offsetMatrices = getOffsetMatrices(snapshot.worldMatrices(handles), getOffsetPoints(snapshot.get(handles), offsetType=offsetType))
+    return offsetMatrices[0]
+
+
+def getSkipFlags(matchTranslate=(True, True, True), matchRotate=(True, True, True), matchScale=(False, False, False)):
+    """
+    Returns the `setMatrix` skip keywords from the supplied match flags.
+
+    :type matchTranslate: Tuple[bool, bool, bool]
+    :type matchRotate: Tuple[bool, bool, bool]
+    :type matchScale: Tuple[bool, bool, bool]
+    :rtype: Dict[str, bool]
+    """
+
+    skipTranslateX, skipTranslateY, skipTranslateZ = (not x for x in matchTranslate)
+    skipRotateX, skipRotateY, skipRotateZ = (not x for x in matchRotate)
+    skipScaleX, skipScaleY, skipScaleZ = (not x for x in matchScale)
+
+    return dict(
+        skipTranslateX=skipTranslateX, skipTranslateY=skipTranslateY, skipTranslateZ=skipTranslateZ,
+        skipRotateX=skipRotateX, skipRotateY=skipRotateY, skipRotateZ=skipRotateZ,
+        skipScaleX=skipScaleX, skipScaleY=skipScaleY, skipScaleZ=skipScaleZ
+    )
+
+
+def getAlignMatrices(sourceWorldMatrices, targetParentInverseMatrices, sourceOffsetMatrices=None, targetOffsetMatrices=None):
+    """
+    Returns the source transforms in their target's parent space.
+    Any single matrices are broadcast against the remaining arrays.
+
+    :type sourceWorldMatrices: matrixarray.MatrixArray
+    :type targetParentInverseMatrices: matrixarray.MatrixArray
+    :type sourceOffsetMatrices: Union[matrixarray.MatrixArray, None]
+    :type targetOffsetMatrices: Union[matrixarray.MatrixArray, None]
+    :rtype: matrixarray.MatrixArray
+    """
+
+    matrices = sourceWorldMatrices
+
+    if sourceOffsetMatrices is not None:
+
+        matrices = sourceOffsetMatrices * matrices
+
+    if targetOffsetMatrices is not None:
+
+        matrices = targetOffsetMatrices * matrices
+
+    return matrices * targetParentInverseMatrices
+
+
+def getSnapshotAlignMatrices(snapshot, sourceHandles, targetHandles, sourceType=OffsetType.PIVOT, targetType=OffsetType.PIVOT, nested=None, nearest=None):
+    """
+    Returns the source transforms in their target's parent space from the supplied scene snapshot.
+    A single source handle is broadcast against every target handle.
+    Nested targets can be supplied along with their nearest target ancestor so their parent space moves along with that ancestor.
+
+    :type snapshot: scenesnapshot.SceneSnapshot
+    :type sourceHandles: List[int]
+    :type targetHandles: List[int]
+    :type sourceType: OffsetType
+    :type targetType: OffsetType
+    :type nested: Union[List[int], None]
+    :type nearest: Union[List[int], None]
+    :rtype: matrixarray.MatrixArray
+    """
+
+    sourceWorldMatrices = snapshot.worldMatrices(sourceHandles)
+    sourcePoints = getOffsetPoints(snapshot.get(sourceHandles), offsetType=sourceType)
+
+    targetWorldMatrices = snapshot.worldMatrices(targetHandles)
+    targetPoints = getOffsetPoints(snapshot.get(targetHandles), offsetType=targetType)
+
+    worldArray = getAlignMatrices(
+        sourceWorldMatrices,
+        numpy.eye(4),
+        sourceOffsetMatrices=getOffsetMatrices(sourceWorldMatrices, sourcePoints),
+        targetOffsetMatrices=getOffsetMatrices(targetWorldMatrices, targetPoints)
+    ).array
+
+    worldArray = numpy.broadcast_to(worldArray, (len(targetHandles), 4, 4))
+    parentInverseArray = snapshot.parentInverseMatrices(targetHandles).array.copy()
+
+    # Move nested parent spaces along with their aligned ancestors
+    #
+    if nested:
+
+        parentInverseArray[nested] = numpy.linalg.inv(worldArray[nearest]) @ targetWorldMatrices.array[nearest] @ parentInverseArray[nested]
+
+    return matrixarray.MatrixArray(worldArray @ parentInverseArray)
+
+
+def getAlignMatrix(sourceNode, targetNode, sourceType=OffsetType.PIVOT, targetType=OffsetType.PIVOT):
+    """
+    Returns the source transform in the target's parent space.
+    Don't forget the offset matrices are included!
+
+    :type sourceNode: fntransform.FnTransform
+    :type targetNode: fntransform.FnTransform
+    :type sourceType: OffsetType
+    :type targetType: OffsetType
+    :rtype: transformationmatrix.TransformationMatrix
+    """
+
+    transaction = scenesnapshot.ReadTransaction()
+    sourceHandles = [transaction.read(sourceNode, **getReadFlags(sourceType))]
+    targetHandles = [transaction.read(targetNode, parentInverseMatrix=True, **getReadFlags(targetType))]
+    snapshot = transaction.freeze()
+
+    matrices = getSnapshotAlignMatrices(snapshot, sourceHandles, targetHandles, sourceType=sourceType, targetType=targetType)
+    return matrices[0]
+
+
+def alignTransforms(sources, targets, sourceType=OffsetType.PIVOT, targetType=OffsetType.PIVOT, matchTranslate=(True, True, True), matchRotate=(True, True, True), matchScale=(False, False, False), preserveChildren=False, freezeTransform=False, transaction=None):
+    """
+    Copies the transforms from the source nodes onto the target nodes.
+    A single source is evaluated once and then copied onto every target!
+    Every scene value is read exactly once before any matrices are composed and then written in a single pass.
+    Rotations are written using the euler solution closest to each target's current channels, unless any rotation axis is skipped, so they never flip at 180 degrees.
+
+    :type sources: List[Any]
+    :type targets: List[Any]
+    :type sourceType: OffsetType
+    :type targetType: OffsetType
+    :type matchTranslate: Tuple[bool, bool, bool]
+    :type matchRotate: Tuple[bool, bool, bool]
+    :type matchScale: Tuple[bool, bool, bool]
+    :type preserveChildren: bool
+    :type freezeTransform: bool
+    :type transaction: Union[scenesnapshot.ReadTransaction, None]
+    :rtype: None
+    """
+
+    # Verify node counts
+    #
+    sourceCount, targetCount = len(sources), len(targets)
+
+    if sourceCount not in (1, targetCount):
+
+        raise TypeError(f'alignTransforms() expects 1 or {targetCount} source nodes ({sourceCount} given)!')
+
+    # Read source and target values
+    #
+    transaction = scenesnapshot.ReadTransaction() if transaction is None else transaction
+
+    sourceNodes = getTransforms(sources)
+
+    try:
+
+        targetNodes = getTransforms(targets)
+
+    except TypeError:
+
+        fnpool.release(*sourceNodes)
+        raise
+
+    try:
+
+        sourceHandles = transaction.readMany(sourceNodes, **getReadFlags(sourceType))
+        targetHandles = transaction.readMany(targetNodes, parentInverseMatrix=True, **getReadFlags(targetType))
+
+        snapshot = transaction.freeze()
+        profiler.count('nodes', len(sourceHandles) + len(targetHandles))
+
+        # Evaluate selected target hierarchy
+        # Preserved children keep their world matrix so only targets parented directly under a target need to follow it!
+        #
+        with profiler.phase('hierarchy'):
+
+            parents, ancestors = hierarchyutils.getSelectedHierarchy(targetNodes)
+            nested = [index for index in range(targetCount) if len(ancestors[index]) > 0 and (not preserveChildren or parents[index] != -1)]
+            nearest = [ancestors[index][0] for index in nested]
+
+        # Compose align matrices
+        #
+        with profiler.phase('math'):
+
+            matrices = getSnapshotAlignMatrices(snapshot, sourceHandles, targetHandles, sourceType=sourceType, targetType=targetType, nested=nested, nearest=nearest)
+
+        # Queue transform matrices
+        #
+        skipFlags = getSkipFlags(matchTranslate=matchTranslate, matchRotate=matchRotate, matchScale=matchScale)
+        queue = writequeue.WriteQueue(cache=transaction.cache, unwrapEulers=True)
+
+        isDebugging = log.isEnabledFor(logging.DEBUG)
+
+        for (index, (targetHandle, matrix)) in enumerate(zip(targetHandles, matrices)):
+
+            target = snapshot.transforms[targetHandle]
+
+            if isDebugging:
+
+                source = snapshot.transforms[sourceHandles[index if sourceCount > 1 else 0]]
+                log.debug(f'Copying from: {source.node.name()}, pasting to {target.node.name()}')
+
+            queue.push(target.node, matrix, preserveChildren=preserveChildren, freezeTransform=freezeTransform, depth=len(ancestors[index]), **skipFlags)
+
+        # Write transform matrices
+        #
+        log.info(f'Aligning {len(targetHandles)} node(s).')
+
+        queue.flush()
+
+    finally:
+
+        fnpool.release(*sourceNodes, *targetNodes)
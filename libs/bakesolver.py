@@ -0,0 +1,268 @@
+import os
+import sys
+import pickle
+import numpy
+import multiprocessing
+import multiprocessing.spawn
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Union
+from . import keyutils, eulerutils, profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+__threshold__ = 1000000
+__interpreters__ = ('python', 'mayapy', 'hython', '3dsmaxpy')
+
+
+@dataclass
+class BakeJob(object):
+    """
+    Data class that stores the sampled arrays required to solve a single bake group.
+    Jobs only hold arrays so they can be solved inside headless worker processes without a scene.
+    """
+
+    frames: numpy.ndarray
+    sourceWorldArray: numpy.ndarray
+    targetParentInverseArray: numpy.ndarray
+    nearestWorldArray: numpy.ndarray
+    nested: numpy.ndarray
+    nearest: numpy.ndarray
+    offsetMatrices: Union[numpy.ndarray, None] = None
+    tolerance: Union[float, None] = None
+    hermite: bool = True
+    rotationOrders: Union[numpy.ndarray, None] = None
+    eulerRotations: Union[numpy.ndarray, None] = None
+
+    @property
+    def targetCount(self):
+        """
+        Getter method that returns the number of targets in this job.
+
+        :rtype: int
+        """
+
+        return self.targetParentInverseArray.shape[0]
+
+
+@dataclass
+class BakeResult(object):
+    """
+    Data class that stores the solved keys for a single bake group.
+    """
+
+    matrices: numpy.ndarray
+    masks: Union[numpy.ndarray, None] = None
+    tangents: Union[numpy.ndarray, None] = None
+    eulerRotations: Union[numpy.ndarray, None] = None
+
+
+def getBakeMatrices(sourceWorldArray, targetCount, offsetMatrices=None):
+    """
+    Returns the per-frame world matrices for each target from the supplied sampled source array.
+    A single source is broadcast against every target.
+
+    :type sourceWorldArray: numpy.ndarray
+    :type targetCount: int
+    :type offsetMatrices: Union[numpy.ndarray, None]
+    :rtype: numpy.ndarray
+    """
+
+    frameCount = sourceWorldArray.shape[1]
+    targetWorldArray = numpy.broadcast_to(sourceWorldArray, (targetCount, frameCount, 4, 4))
+
+    if offsetMatrices is not None:
+
+        targetWorldArray = offsetMatrices.reshape(-1, 1, 4, 4) @ targetWorldArray
+
+    return targetWorldArray
+
+
+def solveBake(job):
+    """
+    Returns the local keys for the supplied bake job.
+    Targets nested under other targets follow their ancestor's baked matrices rather than its original animation.
+    If the job has a tolerance then the keys are reduced, and if it has rotation orders then the euler rotations are unwrapped.
+    Keys are reduced against hermite tangents, unless the job disables them, in which case no tangents are returned and linear interpolation is used.
+
+    :type job: BakeJob
+    :rtype: BakeResult
+    """
+
+    targetCount, frameCount = job.targetCount, len(job.frames)
+
+    # Compose per-frame target matrices
+    #
+    with profiler.phase('math'):
+
+        bakedWorldArray = getBakeMatrices(job.sourceWorldArray, targetCount, offsetMatrices=job.offsetMatrices)
+        targetParentInverseArray = job.targetParentInverseArray
+
+        # Move nested parent spaces along with their baked ancestors
+        #
+        if len(job.nested) > 0:
+
+            targetParentInverseArray = targetParentInverseArray.copy()
+            targetParentInverseArray[job.nested] = numpy.linalg.inv(bakedWorldArray[job.nearest]) @ job.nearestWorldArray @ targetParentInverseArray[job.nested]
+
+        matrices = bakedWorldArray @ targetParentInverseArray
+
+    result = BakeResult(matrices=matrices)
+
+    # Reduce keys to fit within the tolerance
+    #
+    if job.tolerance is not None and job.tolerance > 0.0:
+
+        if job.hermite:
+
+            with profiler.phase('math'):
+
+                result.tangents = keyutils.getTangents(job.frames, matrices.reshape(targetCount, frameCount, 16)).reshape(matrices.shape)
+
+        tangents = keyutils.getChannels(result.tangents) if result.tangents is not None else None
+        result.masks = keyutils.reduceKeys(job.frames, keyutils.getChannels(matrices), tolerance=job.tolerance, tangents=tangents)
+
+    # Unwrap euler rotations across every frame
+    # Each target starts from the euler solution closest to its current channels!
+    #
+    if job.rotationOrders is not None:
+
+        with profiler.phase('eulers'):
+
+            result.eulerRotations = eulerutils.unwrapEulers(eulerutils.getEulers(matrices, job.rotationOrders), job.rotationOrders, previous=job.eulerRotations)
+
+    return result
+
+
+def getProcessCount(jobs, processes=None):
+    """
+    Returns the number of worker processes to use for the supplied jobs.
+    If no process count is supplied then one process is used per CPU, unless there are too few target frames to outweigh spawning the workers.
+
+    :type jobs: List[BakeJob]
+    :type processes: Union[int, None]
+    :rtype: int
+    """
+
+    if processes is None:
+
+        workload = sum(job.targetCount * len(job.frames) for job in jobs)
+        processes = (os.cpu_count() or 1) if workload >= __threshold__ else 1
+
+    return max(min(int(processes), len(jobs)), 1)
+
+
+def isInterpreter(path):
+    """
+    Evaluates if the supplied executable is a headless python interpreter rather than a DCC that embeds python.
+
+    :type path: str
+    :rtype: bool
+    """
+
+    name = os.path.splitext(os.path.basename(path))[0].lower()
+    return name.startswith(__interpreters__)
+
+
+def getExecutable():
+    """
+    Returns the headless python interpreter used to spawn worker processes.
+    If this process is embedded inside a DCC then the DCC's interpreter is looked up alongside its executable.
+    If no interpreter can be found then none is returned!
+
+    :rtype: Union[str, None]
+    """
+
+    # Check if the current executable is already an interpreter
+    #
+    executable = multiprocessing.spawn.get_executable() or sys.executable
+
+    if not executable:
+
+        return None
+
+    executable = os.fsdecode(executable)
+
+    if isInterpreter(executable):
+
+        return executable
+
+    # Look for an interpreter next to the DCC executable
+    #
+    directory = os.path.dirname(executable)
+    extension = os.path.splitext(executable)[1]
+
+    for name in __interpreters__:
+
+        path = os.path.join(directory, f'{name}{extension}')
+
+        if os.path.isfile(path):
+
+            return path
+
+    return None
+
+
+def solveBakes(jobs, processes=None, executable=None):
+    """
+    Returns the solved keys for the supplied bake jobs in order.
+    Jobs are distributed across a pool of spawned worker processes, which only need numpy, and are solved serially if only one process is required.
+    If no executable is supplied then the workers are spawned from `getExecutable`, since spawning the DCC itself would relaunch it for each worker.
+    The previous spawn executable is restored once the pool closes.
+    If no interpreter can be found, or the pool cannot be started, then the jobs are solved serially instead.
+
+    :type jobs: List[BakeJob]
+    :type processes: Union[int, None]
+    :type executable: Union[str, None]
+    :rtype: List[BakeResult]
+    """
+
+    processCount = getProcessCount(jobs, processes=processes)
+
+    if processCount <= 1:
+
+        return [solveBake(job) for job in jobs]
+
+    # Resolve headless interpreter
+    #
+    executable = getExecutable() if executable is None else executable
+
+    if executable is None:
+
+        log.warning('Unable to find a headless python interpreter, solving bakes serially instead!')
+        return [solveBake(job) for job in jobs]
+
+    # Distribute jobs across worker processes
+    #
+    context = multiprocessing.get_context('spawn')
+    previous = multiprocessing.spawn.get_executable()
+
+    chunkSize = max(len(jobs) // (processCount * 4), 1)
+
+    try:
+
+        context.set_executable(executable)
+
+        with profiler.phase('solveBakes'):
+
+            with ProcessPoolExecutor(max_workers=processCount, mp_context=context) as executor:
+
+                results = list(executor.map(solveBake, jobs, chunksize=chunkSize))
+
+        profiler.count('processes', processCount)
+        return results
+
+    except (OSError, BrokenProcessPool, pickle.PicklingError) as exception:
+
+        log.warning(f'Unable to solve bakes in parallel, solving serially instead: {exception}')
+        return [solveBake(job) for job in jobs]
+
+    finally:
+
+        context.set_executable(previous)
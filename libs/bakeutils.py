@@ -0,0 +1,533 @@
+import numpy
+
+from functools import lru_cache
+from dcc.decorators.undo import undo
+from . import matrixarray, querycache, bakesolver, eulerutils, hierarchyutils, alignutils, fnpool, profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+@lru_cache(maxsize=None)
+def warnOnce(message):
+    """
+    Logs the supplied warning the first time it is encountered.
+
+    :type message: str
+    :rtype: None
+    """
+
+    log.warning(message)
+
+
+def getFrameRange(scene=None):
+    """
+    Returns the start and end frames from the supplied scene.
+    Scenes without a frame range fall back on the current time.
+
+    :type scene: Union[fnscene.FnScene, None]
+    :rtype: Tuple[int, int]
+    """
+
+    scene = fnpool.createScene() if scene is None else scene
+
+    getStartTime, getEndTime = getattr(scene, 'getStartTime', None), getattr(scene, 'getEndTime', None)
+
+    if callable(getStartTime) and callable(getEndTime):
+
+        return int(round(getStartTime())), int(round(getEndTime()))
+
+    else:
+
+        currentTime = int(round(scene.getTime()))
+        return currentTime, currentTime
+
+
+def getFrames(startFrame, endFrame, step=1):
+    """
+    Returns the sampled frames between the supplied start and end frames.
+    The end frame is always included even if the step does not land on it!
+
+    :type startFrame: int
+    :type endFrame: int
+    :type step: int
+    :rtype: numpy.ndarray
+    """
+
+    if endFrame < startFrame:
+
+        raise TypeError(f'getFrames() expects an end frame after the start frame ({startFrame} > {endFrame})!')
+
+    step = max(int(step), 1)
+    frames = numpy.arange(startFrame, endFrame + 1, step, dtype=numpy.float64)
+
+    if frames[-1] != endFrame:
+
+        frames = numpy.append(frames, float(endFrame))
+
+    return frames
+
+
+def asFlags(flags, count):
+    """
+    Returns a boolean array from the supplied flag or sequence of per-node flags.
+
+    :type flags: Union[bool, Sequence[bool]]
+    :type count: int
+    :rtype: numpy.ndarray
+    """
+
+    if isinstance(flags, (bool, numpy.bool_)):
+
+        return numpy.full(count, flags, dtype=bool)
+
+    else:
+
+        return numpy.asarray(flags, dtype=bool).reshape(count)
+
+
+def sampleMatrices(nodes, frames, scene=None, worldMatrix=True, parentInverseMatrix=False, frameCache=None):
+    """
+    Returns the world and parent inverse matrices for the supplied transforms at every frame.
+    All nodes are read within a single sweep over the frame range, and only the flagged matrices are queried.
+    If a frame cache is supplied then only the frames missing from it are swept, and the new samples are stored back into it.
+    Matrices that were not requested are left as identity matrices!
+
+    :type nodes: List[fntransform.FnTransform]
+    :type frames: numpy.ndarray
+    :type scene: Union[fnscene.FnScene, None]
+    :type worldMatrix: Union[bool, Sequence[bool]]
+    :type parentInverseMatrix: Union[bool, Sequence[bool]]
+    :type frameCache: Union[framecache.FrameCache, None]
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+
+    scene = fnpool.createScene() if scene is None else scene
+
+    nodeCount, frameCount = len(nodes), len(frames)
+    worldFlags, parentInverseFlags = asFlags(worldMatrix, nodeCount), asFlags(parentInverseMatrix, nodeCount)
+
+    worldArray = numpy.tile(numpy.eye(4), (nodeCount, frameCount, 1, 1))
+    parentInverseArray = numpy.tile(numpy.eye(4), (nodeCount, frameCount, 1, 1))
+
+    # Collect requested queries
+    # Each query is flagged with the frames that still need to be sampled
+    #
+    queries = [(index, 'worldMatrix', worldArray) for index in numpy.flatnonzero(worldFlags)]
+    queries.extend((index, 'parentInverseMatrix', parentInverseArray) for index in numpy.flatnonzero(parentInverseFlags))
+
+    missing = numpy.ones((len(queries), frameCount), dtype=bool)
+    versions = {}
+
+    if frameCache is not None:
+
+        with profiler.phase('readFrameCache'):
+
+            for (queryIndex, (index, name, array)) in enumerate(queries):
+
+                if index not in versions:
+
+                    versions[index] = frameCache.version(nodes[index])
+
+                array[index], found = frameCache.get(nodes[index], name, frames, version=versions[index])
+                missing[queryIndex] = ~found
+
+    # Sweep the missing frames once
+    # The current time is always restored afterwards!
+    #
+    frameIndices = numpy.flatnonzero(missing.any(axis=0))
+    sampleCounts = {'worldMatrix': 0, 'parentInverseMatrix': 0}
+
+    if len(frameIndices) > 0:
+
+        currentTime = scene.getTime()
+
+        try:
+
+            with profiler.phase('sampleMatrices'):
+
+                for frameIndex in frameIndices:
+
+                    scene.setTime(frames[frameIndex])
+
+                    for queryIndex in numpy.flatnonzero(missing[:, frameIndex]):
+
+                        index, name, array = queries[queryIndex]
+                        array[index, frameIndex] = matrixarray.toArray(getattr(nodes[index], name)())
+
+                        sampleCounts[name] += 1
+
+        finally:
+
+            scene.setTime(currentTime)
+
+    profiler.count('samples', sum(sampleCounts.values()))
+
+    # Store new samples
+    #
+    if frameCache is not None:
+
+        for (queryIndex, (index, name, array)) in enumerate(queries):
+
+            mask = missing[queryIndex]
+
+            if mask.any():
+
+                frameCache.put(nodes[index], name, frames[mask], array[index, mask], version=versions[index])
+
+    return worldArray, parentInverseArray
+
+
+def canBulkKey(nodes):
+    """
+    Evaluates if the supplied transforms can be keyed in bulk, along with tangents, by `writeKeys`.
+
+    :type nodes: List[fntransform.FnTransform]
+    :rtype: bool
+    """
+
+    return all(callable(getattr(node, 'setMatrixKeys', None)) for node in nodes)
+
+
+def canWriteEulers(nodes):
+    """
+    Evaluates if the supplied transforms can be keyed with euler rotations by `writeKeys`.
+    Bulk keys accept euler rotations directly, otherwise every function set must be able to read and write its euler channels.
+
+    :type nodes: List[fntransform.FnTransform]
+    :rtype: bool
+    """
+
+    if canBulkKey(nodes):
+
+        return all(callable(getattr(node, name, None)) for node in nodes for name in ('rotationOrder', 'eulerRotation'))
+
+    else:
+
+        return eulerutils.canWriteEulers(nodes)
+
+
+def writeKeys(nodes, frames, matrices, scene=None, masks=None, tangents=None, eulerRotations=None, **kwargs):
+    """
+    Keys the supplied per-frame local matrices onto the specified transforms.
+    The frames are swept once and each frame is set and keyed in turn through `setMatrix` and `keyTransform`.
+    None of the shipped function sets can key in bulk, however, function sets that implement the optional `setMatrixKeys` receive every frame in a single call instead, replacing any keys inside the range, along with the optional tangents.
+    If masks are supplied then each node is only keyed at its masked frames, and frames without any masked keys are skipped entirely.
+    The per-frame sweep cannot set tangents or remove existing keys, so the DCC's default tangents are used and any keys already inside the range are left in place!
+    A warning is logged the first time the per-frame sweep is taken.
+    If euler rotations are supplied then they are written after each matrix, through `setEulerRotation` or along with the bulk keys, so the keyed euler channels stay continuous.
+    Euler rotations are ignored whenever any rotation axis is skipped!
+
+    :type nodes: List[fntransform.FnTransform]
+    :type frames: numpy.ndarray
+    :type matrices: numpy.ndarray
+    :type scene: Union[fnscene.FnScene, None]
+    :type masks: Union[numpy.ndarray, None]
+    :type tangents: Union[numpy.ndarray, None]
+    :type eulerRotations: Union[numpy.ndarray, None]
+    :rtype: None
+    """
+
+    masks = numpy.ones((len(nodes), len(frames)), dtype=bool) if masks is None else masks
+
+    # Check if bulk keys are supported
+    #
+    if canBulkKey(nodes):
+
+        with profiler.phase('writeKeys'):
+
+            for (index, (node, mask)) in enumerate(zip(nodes, masks)):
+
+                func = node.setMatrixKeys
+
+                keywords = dict(kwargs)
+
+                if tangents is not None:
+
+                    keywords['tangents'] = tangents[index][mask]
+
+                if eulerRotations is not None:
+
+                    keywords['eulerRotations'] = eulerRotations[index][mask]
+
+                func(frames[mask], matrices[index][mask], **keywords)
+
+        return
+
+    # Fallback on keying each frame
+    #
+    warnOnce('Unable to bulk key without `setMatrixKeys`, keying one frame at a time with default tangents!')
+
+    scene = fnpool.createScene() if scene is None else scene
+    currentTime = scene.getTime()
+
+    writeEulers = eulerRotations is not None and not eulerutils.isRotateSkipped(**kwargs)
+
+    try:
+
+        with profiler.phase('writeKeys'):
+
+            for frameIndex in numpy.flatnonzero(masks.any(axis=0)):
+
+                scene.setTime(frames[frameIndex])
+
+                for index in numpy.flatnonzero(masks[:, frameIndex]):
+
+                    node, nodeMatrices = nodes[index], matrices[index]
+
+                    node.setMatrix(matrixarray.toMatrix(nodeMatrices[frameIndex]), **kwargs)
+
+                    if writeEulers:
+
+                        node.setEulerRotation(eulerRotations[index][frameIndex])
+
+                    node.keyTransform()
+
+    finally:
+
+        scene.setTime(currentTime)
+
+
+def bakeTransforms(sources, targets, startFrame=None, endFrame=None, step=1, maintainOffset=False, matchTranslate=(True, True, True), matchRotate=(True, True, True), matchScale=(False, False, False), tolerance=None, scene=None, cache=None, frameCache=None):
+    """
+    Bakes the source transforms onto the target transforms over the specified frame range.
+    Sources are sampled in a single sweep, every per-frame target is composed in one batched step and the keys are then written frame by frame, see `writeKeys`.
+    Targets nested under other targets follow their ancestor's baked matrices rather than its original animation.
+    Samples are not cached unless a frame cache is supplied.
+    Passing the shared `framecache.getCache()` lets repeated bakes over the same range only scrub frames that changed, however, this is only safe if the function sets implement `animationVersion` or the scene is left untouched between bakes!
+    If a tolerance is supplied then the baked keys are reduced to the fewest keys that stay within it.
+    Keys are reduced against hermite tangents when the targets can be keyed in bulk, otherwise against linear interpolation since the per-frame sweep cannot set tangents.
+    Rotations are unwrapped across every frame before they are written, so the keyed euler channels never flip at 180 degrees.
+    A single group cannot be split across worker processes so it is always solved in this process, see `batchBakeTransforms` for baking many groups at once.
+
+    :type sources: List[Any]
+    :type targets: List[Any]
+    :type startFrame: Union[int, None]
+    :type endFrame: Union[int, None]
+    :type step: int
+    :type maintainOffset: bool
+    :type matchTranslate: Tuple[bool, bool, bool]
+    :type matchRotate: Tuple[bool, bool, bool]
+    :type matchScale: Tuple[bool, bool, bool]
+    :type tolerance: Union[float, None]
+    :type scene: Union[fnscene.FnScene, None]
+    :type cache: Union[querycache.QueryCache, None]
+    :type frameCache: Union[framecache.FrameCache, None]
+    :rtype: None
+    """
+
+    batchBakeTransforms(
+        [(sources, targets)],
+        startFrame=startFrame,
+        endFrame=endFrame,
+        step=step,
+        maintainOffset=maintainOffset,
+        matchTranslate=matchTranslate,
+        matchRotate=matchRotate,
+        matchScale=matchScale,
+        tolerance=tolerance,
+        processes=1,
+        scene=scene,
+        cache=cache,
+        frameCache=frameCache
+    )
+
+
+@undo(name='Bake Transforms')
+def batchBakeTransforms(groups, startFrame=None, endFrame=None, step=1, maintainOffset=False, matchTranslate=(True, True, True), matchRotate=(True, True, True), matchScale=(False, False, False), tolerance=None, processes=None, executable=None, scene=None, cache=None, frameCache=None):
+    """
+    Bakes the supplied groups of source and target transforms, such as one group per character, over the specified frame range.
+    Every group is sampled within the same sweep over the frame range, since the scene can only be evaluated by this process.
+    The sampled arrays are then split by group and solved across a pool of headless worker processes, see `bakesolver.solveBakes`.
+    Finally, the solved keys are merged and written within a single undo chunk.
+    Each group is baked independently so targets should not be nested under targets from another group!
+    If no frame cache is supplied then every frame is sampled from the scene, see `bakeTransforms` for opting into the shared cache.
+
+    :type groups: List[Tuple[List[Any], List[Any]]]
+    :type startFrame: Union[int, None]
+    :type endFrame: Union[int, None]
+    :type step: int
+    :type maintainOffset: bool
+    :type matchTranslate: Tuple[bool, bool, bool]
+    :type matchRotate: Tuple[bool, bool, bool]
+    :type matchScale: Tuple[bool, bool, bool]
+    :type tolerance: Union[float, None]
+    :type processes: Union[int, None]
+    :type executable: Union[str, None]
+    :type scene: Union[fnscene.FnScene, None]
+    :type cache: Union[querycache.QueryCache, None]
+    :type frameCache: Union[framecache.FrameCache, None]
+    :rtype: None
+    """
+
+    # Verify node counts
+    #
+    for (sources, targets) in groups:
+
+        sourceCount, targetCount = len(sources), len(targets)
+
+        if sourceCount not in (1, targetCount):
+
+            raise TypeError(f'bakeTransforms() expects 1 or {targetCount} source nodes ({sourceCount} given)!')
+
+    # Evaluate frame range
+    #
+    scene = fnpool.createScene() if scene is None else scene
+    cache = querycache.QueryCache() if cache is None else cache
+
+    defaultStart, defaultEnd = getFrameRange(scene)
+    startFrame = defaultStart if startFrame is None else startFrame
+    endFrame = defaultEnd if endFrame is None else endFrame
+
+    frames = getFrames(startFrame, endFrame, step=step)
+    frameCount = len(frames)
+
+    # Collect function sets for each group
+    #
+    sourceGroups, targetGroups = [], []
+
+    try:
+
+        for (sources, targets) in groups:
+
+            sourceGroups.append(alignutils.getTransforms(sources))
+            targetGroups.append(alignutils.getTransforms(targets))
+
+    except TypeError:
+
+        fnpool.release(*[node for nodes in sourceGroups + targetGroups for node in nodes])
+        raise
+
+    sourceNodes = [node for nodes in sourceGroups for node in nodes]
+    targetNodes = [node for nodes in targetGroups for node in nodes]
+
+    try:
+
+        # Evaluate selected target hierarchies
+        #
+        profiler.count('nodes', len(sourceNodes) + len(targetNodes))
+        profiler.count('frames', frameCount)
+
+        hierarchies = []
+
+        with profiler.phase('hierarchy'):
+
+            for nodes in targetGroups:
+
+                parents, ancestors = hierarchyutils.getSelectedHierarchy(nodes)
+                nested = [index for index in range(len(nodes)) if len(ancestors[index]) > 0]
+                nearest = [ancestors[index][0] for index in nested]
+
+                hierarchies.append((numpy.array(nested, dtype=numpy.int64), numpy.array(nearest, dtype=numpy.int64)))
+
+        # Read offsets at the current time
+        #
+        offsetGroups = [None] * len(groups)
+
+        if maintainOffset:
+
+            with profiler.phase('readMatrices'):
+
+                for (index, (sources, targets)) in enumerate(zip(sourceGroups, targetGroups)):
+
+                    sourceWorldMatrices = matrixarray.MatrixArray.fromMatrices([cache.worldMatrix(node) for node in sources]).array
+                    targetWorldMatrices = matrixarray.MatrixArray.fromMatrices([cache.worldMatrix(node) for node in targets]).array
+
+                    offsetGroups[index] = targetWorldMatrices @ numpy.linalg.inv(sourceWorldMatrices)
+
+        # Sample every group in a single sweep
+        # Sources are stored before targets, and target world matrices are only required by nested ancestors!
+        #
+        sourceCount = len(sourceNodes)
+        nodes = sourceNodes + targetNodes
+
+        worldFlags = numpy.zeros(len(nodes), dtype=bool)
+        worldFlags[:sourceCount] = True
+
+        parentInverseFlags = numpy.zeros(len(nodes), dtype=bool)
+        parentInverseFlags[sourceCount:] = True
+
+        sourceOffsets = numpy.cumsum([0] + [len(sources) for sources in sourceGroups])
+        targetOffsets = numpy.cumsum([0] + [len(targets) for targets in targetGroups])
+
+        for (targetOffset, (nested, nearest)) in zip(targetOffsets, hierarchies):
+
+            worldFlags[sourceCount + targetOffset + nearest] = True
+
+        worldArray, parentInverseArray = sampleMatrices(nodes, frames, scene=scene, worldMatrix=worldFlags, parentInverseMatrix=parentInverseFlags, frameCache=frameCache)
+
+        # Read current euler channels
+        # Skip the reads if the keys cannot be written with euler rotations anyway!
+        #
+        skipFlags = alignutils.getSkipFlags(matchTranslate=matchTranslate, matchRotate=matchRotate, matchScale=matchScale)
+        writeEulers = canWriteEulers(targetNodes) and not eulerutils.isRotateSkipped(**skipFlags)
+
+        eulers = eulerutils.readEulers(targetNodes) if writeEulers else None
+        rotationOrders, eulerRotations = eulers if eulers is not None else (None, None)
+
+        # Split sampled arrays into jobs
+        # Keys written one frame at a time cannot carry tangents, so they are reduced against linear interpolation instead!
+        #
+        hermite = canBulkKey(targetNodes)
+        jobs = []
+
+        for (index, (nested, nearest)) in enumerate(hierarchies):
+
+            sourceStart, sourceEnd = sourceOffsets[index], sourceOffsets[index + 1]
+            targetStart, targetEnd = targetOffsets[index], targetOffsets[index + 1]
+            targetWorldArray = worldArray[sourceCount + targetStart:sourceCount + targetEnd]
+
+            job = bakesolver.BakeJob(
+                frames=frames,
+                sourceWorldArray=worldArray[sourceStart:sourceEnd],
+                targetParentInverseArray=parentInverseArray[sourceCount + targetStart:sourceCount + targetEnd],
+                nearestWorldArray=targetWorldArray[nearest],
+                nested=nested,
+                nearest=nearest,
+                offsetMatrices=offsetGroups[index],
+                tolerance=tolerance,
+                hermite=hermite,
+                rotationOrders=rotationOrders[targetStart:targetEnd] if rotationOrders is not None else None,
+                eulerRotations=eulerRotations[targetStart:targetEnd] if eulerRotations is not None else None
+            )
+
+            jobs.append(job)
+
+        # Solve jobs and merge results
+        #
+        results = bakesolver.solveBakes(jobs, processes=processes, executable=executable)
+
+        matrices = numpy.concatenate([result.matrices for result in results])
+        masks, tangents, eulerRotations = None, None, None
+
+        if tolerance is not None and tolerance > 0.0:
+
+            masks = numpy.concatenate([result.masks for result in results])
+            tangents = numpy.concatenate([result.tangents for result in results]) if hermite else None
+
+            log.info(f'Reduced {masks.size} key(s) to {masks.sum()} key(s).')
+
+        if rotationOrders is not None:
+
+            eulerRotations = numpy.concatenate([result.eulerRotations for result in results])
+
+        # Write keys to targets
+        #
+        log.info(f'Baking {len(targetNodes)} node(s) over {frameCount} frame(s).')
+
+        writeKeys(targetNodes, frames, matrices, scene=scene, masks=masks, tangents=tangents, eulerRotations=eulerRotations, **skipFlags)
+
+        # Invalidate keyed targets
+        # Their descendants' samples are also stale now!
+        #
+        if frameCache is not None:
+
+            for targetNode in targetNodes:
+
+                frameCache.invalidate(targetNode)
+
+    finally:
+
+        fnpool.release(*sourceNodes, *targetNodes)
@@ -0,0 +1,684 @@
+import sys
+import json
+import importlib
+import time
+import numpy
+import argparse
+import tracemalloc
+
+from functools import lru_cache
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Callable
+from . import mockscene, alignutils, aimutils, matrixutils, bakeutils, keyutils, matrixarray
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+__application__ = None
+
+
+@lru_cache(maxsize=None)
+def warnOnce(message):
+    """
+    Logs the supplied warning the first time it is encountered.
+
+    :type message: str
+    :rtype: None
+    """
+
+    log.warning(message)
+
+
+@dataclass
+class BenchmarkResult(object):
+    """
+    Data class that stores the measurements from a single benchmark.
+    """
+
+    name: str
+    size: int
+    wallTime: float = 0.0
+    peakMemory: int = 0
+    calls: Dict[str, int] = field(default_factory=dict)
+    skipped: bool = False
+    engineOnly: bool = False
+
+    @property
+    def key(self):
+        """
+        Getter method that returns the baseline key for this result.
+        Results that measured the engine function in place of the tab are keyed separately so they are never compared against the tab baselines!
+
+        :rtype: str
+        """
+
+        suffix = ':engine' if self.engineOnly else ''
+        return f'{self.name}[{self.size}]{suffix}'
+
+    def totalCalls(self):
+        """
+        Returns the total number of scene calls.
+
+        :rtype: int
+        """
+
+        return sum(self.calls.values())
+
+
+@dataclass
+class Benchmark(object):
+    """
+    Data class that stores a benchmark scenario.
+    The setup function receives a fresh mock scene and its scene function set and returns the function to measure.
+    """
+
+    name: str
+    sizes: List[int]
+    setup: Callable
+
+
+def randomMatrices(count, seed=0):
+    """
+    Returns an array of random rigid matrices.
+
+    :type count: int
+    :type seed: int
+    :rtype: numpy.ndarray
+    """
+
+    rng = numpy.random.default_rng(seed)
+
+    matrices = matrixarray.MatrixArray.fromTranslations(rng.uniform(-10.0, 10.0, size=(count, 3)))
+    matrices.lookAt(forwardVector=rng.normal(size=(count, 3)), upVector=rng.normal(size=(count, 3)))
+
+    return matrices.array
+
+
+def engineOnly(func):
+    """
+    Marks the supplied function as measuring an engine function in place of its tab.
+
+    :type func: Callable
+    :rtype: Callable
+    """
+
+    func.engineOnly = True
+    return func
+
+
+def createTab(moduleName, className, fnScene):
+    """
+    Returns a tab bound to the supplied scene function set.
+    If Qt is unavailable then none is returned and the engine function is measured instead!
+    Any other failure to construct the tab is raised so broken tabs cannot produce results.
+
+    :type moduleName: str
+    :type className: str
+    :type fnScene: mockscene.FnMockScene
+    :rtype: Union[QAbstractTab, None]
+    """
+
+    global __application__
+
+    try:
+
+        from Qt import QtWidgets
+
+    except ImportError as exception:
+
+        warnOnce(f'Unable to import Qt, measuring engine functions in place of tabs: {exception}')
+        return None
+
+    module = importlib.import_module(f'..ui.tabs.{moduleName}', package=__package__)
+    __application__ = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    return getattr(module, className)(scene=fnScene)
+
+
+def setupAlign(scene, fnScene, size):
+    """
+    Returns a function that aligns the specified number of interleaved source and target pairs.
+
+    :type scene: mockscene.MockScene
+    :type fnScene: mockscene.FnMockScene
+    :type size: int
+    :rtype: Callable
+    """
+
+    names = [f'node{i}' for i in range(size * 2)]
+    handles = scene.createNodes(names, matrices=randomMatrices(size * 2))
+
+    scene.setActiveSelection(handles)
+
+    tab = createTab('qaligntab', 'QAlignTab', fnScene)
+
+    if tab is not None:
+
+        tab.alignMode = alignutils.AlignMode.PAIRS
+        return tab.apply
+
+    else:
+
+        return engineOnly(lambda: alignutils.alignTransforms(handles[0::2], handles[1::2]))
+
+
+def setupAim(scene, fnScene, size):
+    """
+    Returns a function that aims a chain of the specified length.
+
+    :type scene: mockscene.MockScene
+    :type fnScene: mockscene.FnMockScene
+    :type size: int
+    :rtype: Callable
+    """
+
+    handles = scene.createChain(size)
+    scene.setActiveSelection(handles)
+
+    tab = createTab('qaimtab', 'QAimTab', fnScene)
+
+    if tab is not None:
+
+        return tab.apply
+
+    else:
+
+        return engineOnly(lambda: aimutils.aimTransforms(handles, fnScene))
+
+
+def setupMatrix(scene, fnScene, size):
+    """
+    Returns a function that applies a matrix to the specified number of nodes while maintaining their offsets.
+
+    :type scene: mockscene.MockScene
+    :type fnScene: mockscene.FnMockScene
+    :type size: int
+    :rtype: Callable
+    """
+
+    names = [f'node{i}' for i in range(size)]
+    handles = scene.createNodes(names, matrices=randomMatrices(size))
+
+    scene.setActiveSelection(handles)
+
+    matrix = matrixarray.toMatrix(randomMatrices(1, seed=1)[0])
+    tab = createTab('qmatrixtab', 'QMatrixTab', fnScene)
+
+    if tab is not None:
+
+        tab.matrixEdit.setMatrix(matrix)
+        tab.maintainOffset = True
+
+        return tab.apply
+
+    else:
+
+        return engineOnly(lambda: matrixutils.applyMatrix(handles, matrix, maintainOffset=True))
+
+
+def setupTime(scene, fnScene, size):
+    """
+    Returns a function that bakes ten animated source and target pairs over the specified number of frames.
+
+    :type scene: mockscene.MockScene
+    :type fnScene: mockscene.FnMockScene
+    :type size: int
+    :rtype: Callable
+    """
+
+    names = [f'node{i}' for i in range(20)]
+    handles = scene.createNodes(names, matrices=randomMatrices(20))
+
+    for (i, handle) in enumerate(handles[0::2]):
+
+        scene.setKeys(handle, [0.0, float(size)], randomMatrices(2, seed=i + 1))
+
+    scene.setStartTime(0.0)
+    scene.setEndTime(float(size))
+    scene.setActiveSelection(handles)
+
+    tab = createTab('qtimetab', 'QTimeTab', fnScene)
+
+    if tab is not None:
+
+        tab.alignMode = alignutils.AlignMode.PAIRS
+        tab.startFrame, tab.endFrame = 0, size
+
+        return tab.apply
+
+    else:
+
+        return engineOnly(lambda: bakeutils.bakeTransforms(handles[0::2], handles[1::2], startFrame=0, endFrame=size, scene=fnScene))
+
+
+def setupBatchBake(scene, fnScene, size):
+    """
+    Returns a function that bakes the specified number of characters, each with one animated source and five targets, over two hundred frames.
+
+    :type scene: mockscene.MockScene
+    :type fnScene: mockscene.FnMockScene
+    :type size: int
+    :rtype: Callable
+    """
+
+    groups = []
+
+    for i in range(size):
+
+        handles = scene.createNodes([f'character{i}_node{j}' for j in range(6)], matrices=randomMatrices(6, seed=i))
+        scene.setKeys(handles[0], [0.0, 200.0], randomMatrices(2, seed=size + i))
+
+        groups.append((handles[:1], handles[1:]))
+
+    scene.setStartTime(0.0)
+    scene.setEndTime(200.0)
+
+    return lambda: bakeutils.batchBakeTransforms(groups, startFrame=0, endFrame=200, scene=fnScene)
+
+
+def setupReduceKeys(scene, fnScene, size):
+    """
+    Returns a function that reduces ten smoothly baked matrix curves over the specified number of frames.
+
+    :type scene: mockscene.MockScene
+    :type fnScene: mockscene.FnMockScene
+    :type size: int
+    :rtype: Callable
+    """
+
+    frames = numpy.arange(size, dtype=numpy.float64)
+    angles = (frames / 48.0) + numpy.linspace(0.0, numpy.pi, 10)[:, None]
+
+    positions = numpy.stack([numpy.sin(angles * 2.0), numpy.cos(angles * 1.5), angles], axis=-1)
+    forwardVectors = numpy.stack([numpy.cos(angles), numpy.sin(angles), numpy.zeros_like(angles)], axis=-1)
+
+    matrices = matrixarray.MatrixArray.fromTranslations(positions.reshape(-1, 3))
+    matrices.lookAt(forwardVector=forwardVectors.reshape(-1, 3))
+
+    matrices = matrices.array.reshape(10, size, 4, 4)
+    tangents = keyutils.getTangents(frames, matrices.reshape(10, size, 16)).reshape(matrices.shape)
+
+    return lambda: keyutils.reduceKeys(frames, keyutils.getChannels(matrices), tolerance=1e-3, tangents=keyutils.getChannels(tangents))
+
+
+def setupMesh(scene, size):
+    """
+    Creates a grid mesh with approximately the specified number of selected vertices.
+
+    :type scene: mockscene.MockScene
+    :type size: int
+    :rtype: int
+    """
+
+    divisions = max(int(numpy.sqrt(size)) - 1, 1)
+    handle = scene.createGrid('grid', divisions, divisions, size=10.0, matrix=randomMatrices(1)[0])
+
+    scene.selectVertices(handle, numpy.arange(scene.mesh(handle).numVertices()))
+
+    return handle
+
+
+def setupCenterPosition(scene, fnScene, size):
+    """
+    Returns a function that evaluates the center of the selected vertices.
+
+    :type scene: mockscene.MockScene
+    :type fnScene: mockscene.FnMockScene
+    :type size: int
+    :rtype: Callable
+    """
+
+    handle = setupMesh(scene, size)
+
+    tab = createTab('qmatrixtab', 'QMatrixTab', fnScene)
+
+    if tab is not None:
+
+        return tab.getCenterPosition
+
+    else:
+
+        return engineOnly(lambda: matrixutils.getCenterPosition([handle]))
+
+
+def setupAveragedNormal(scene, fnScene, size):
+    """
+    Returns a function that evaluates the averaged normal of the selected vertices.
+
+    :type scene: mockscene.MockScene
+    :type fnScene: mockscene.FnMockScene
+    :type size: int
+    :rtype: Callable
+    """
+
+    handle = setupMesh(scene, size)
+
+    tab = createTab('qmatrixtab', 'QMatrixTab', fnScene)
+
+    if tab is not None:
+
+        return tab.getAveragedNormal
+
+    else:
+
+        return engineOnly(lambda: matrixutils.getAveragedNormal(handle))
+
+
+def setupStartup(scene, fnScene, size):
+    """
+    Returns a function that opens the main window and constructs its current tab.
+    Window startup can only be measured when Qt is available!
+
+    :type scene: mockscene.MockScene
+    :type fnScene: mockscene.FnMockScene
+    :type size: int
+    :rtype: Union[Callable, None]
+    """
+
+    global __application__
+
+    try:
+
+        from Qt import QtWidgets
+
+    except ImportError as exception:
+
+        log.warning(f'Unable to import Qt, skipping startup: {exception}')
+        return None
+
+    qezalign = importlib.import_module('..ui.qezalign', package=__package__)
+    __application__ = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+    def startup():
+
+        window = qezalign.QEzAlign()
+        window.currentTab()
+        window.close()
+
+    return startup
+
+
+__benchmarks__ = (
+    Benchmark(name='align', sizes=[10, 100, 1000], setup=setupAlign),
+    Benchmark(name='aim', sizes=[10, 100, 1000], setup=setupAim),
+    Benchmark(name='matrix', sizes=[10, 100, 1000], setup=setupMatrix),
+    Benchmark(name='time', sizes=[100, 1000, 2000], setup=setupTime),
+    Benchmark(name='batchBake', sizes=[10, 50, 100], setup=setupBatchBake),
+    Benchmark(name='reduceKeys', sizes=[100, 1000, 10000], setup=setupReduceKeys),
+    Benchmark(name='centerPosition', sizes=[1000, 10000, 100000, 1000000], setup=setupCenterPosition),
+    Benchmark(name='averagedNormal', sizes=[1000, 10000, 100000, 1000000], setup=setupAveragedNormal),
+    Benchmark(name='startup', sizes=[1], setup=setupStartup)
+)
+
+
+def iterBenchmarks(names=None):
+    """
+    Returns a generator that yields the registered benchmarks.
+
+    :type names: Union[List[str], None]
+    :rtype: Iterator[Benchmark]
+    """
+
+    for benchmark in __benchmarks__:
+
+        if names is None or benchmark.name in names:
+
+            yield benchmark
+
+
+def measure(benchmark, size, repeat=3):
+    """
+    Measures the supplied benchmark at the specified size.
+    Wall time is the fastest of the repeated runs while calls and peak memory are taken from the first run.
+
+    :type benchmark: Benchmark
+    :type size: int
+    :type repeat: int
+    :rtype: BenchmarkResult
+    """
+
+    result = BenchmarkResult(name=benchmark.name, size=size)
+    wallTimes = []
+
+    for i in range(max(repeat, 1)):
+
+        # Build a fresh scene for each run
+        #
+        scene = mockscene.MockScene()
+        fnScene = mockscene.install(scene)
+
+        try:
+
+            func = benchmark.setup(scene, fnScene, size)
+
+            if func is None:
+
+                result.skipped = True
+                return result
+
+            # Time function
+            #
+            result.engineOnly = getattr(func, 'engineOnly', False)
+            scene.resetCalls()
+
+            isFirst = (i == 0)
+
+            if isFirst:
+
+                tracemalloc.start()
+
+            startTime = time.perf_counter()
+            func()
+            wallTimes.append(time.perf_counter() - startTime)
+
+            if isFirst:
+
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                result.peakMemory = peak
+                result.calls = dict(scene.calls)
+
+        finally:
+
+            mockscene.uninstall()
+
+    result.wallTime = min(wallTimes)
+
+    return result
+
+
+def run(names=None, sizes=None, repeat=3):
+    """
+    Runs the registered benchmarks and returns their results.
+
+    :type names: Union[List[str], None]
+    :type sizes: Union[Dict[str, List[int]], None]
+    :type repeat: int
+    :rtype: List[BenchmarkResult]
+    """
+
+    results = []
+    sizes = {} if sizes is None else sizes
+
+    # Silence per-node logging while measuring
+    #
+    logging.disable(logging.INFO)
+
+    try:
+
+        for benchmark in iterBenchmarks(names=names):
+
+            for size in sizes.get(benchmark.name, benchmark.sizes):
+
+                results.append(measure(benchmark, size, repeat=repeat))
+
+    finally:
+
+        logging.disable(logging.NOTSET)
+
+    return results
+
+
+def saveResults(results, path):
+    """
+    Saves the supplied results to a baseline file.
+
+    :type results: List[BenchmarkResult]
+    :type path: str
+    :rtype: None
+    """
+
+    baseline = {result.key: asdict(result) for result in results if not result.skipped}
+
+    with open(path, 'w') as jsonFile:
+
+        json.dump(baseline, jsonFile, indent=4, sort_keys=True)
+
+
+def loadResults(path):
+    """
+    Loads the results from a baseline file.
+
+    :type path: str
+    :rtype: Dict[str, BenchmarkResult]
+    """
+
+    with open(path, 'r') as jsonFile:
+
+        baseline = json.load(jsonFile)
+
+    return {key: BenchmarkResult(**value) for (key, value) in baseline.items()}
+
+
+def compareResults(results, baseline, tolerance=0.25, minimumTime=0.001, minimumMemory=65536):
+    """
+    Compares the supplied results against a baseline and returns any regressions.
+    Wall time and peak memory may grow by the specified tolerance while scene calls may not grow at all.
+    Growth below the minimum time and memory is ignored since small benchmarks are dominated by noise.
+
+    :type results: List[BenchmarkResult]
+    :type baseline: Dict[str, BenchmarkResult]
+    :type tolerance: float
+    :type minimumTime: float
+    :type minimumMemory: int
+    :rtype: List[str]
+    """
+
+    regressions = []
+
+    for result in results:
+
+        # Check if baseline exists
+        #
+        previous = baseline.get(result.key, None)
+
+        if previous is None or result.skipped:
+
+            continue
+
+        # Compare measurements
+        #
+        if result.wallTime > previous.wallTime * (1.0 + tolerance) and (result.wallTime - previous.wallTime) > minimumTime:
+
+            regressions.append(f'{result.key}: wall time {previous.wallTime:.4f}s -> {result.wallTime:.4f}s')
+
+        if result.peakMemory > previous.peakMemory * (1.0 + tolerance) and (result.peakMemory - previous.peakMemory) > minimumMemory:
+
+            regressions.append(f'{result.key}: peak memory {previous.peakMemory} -> {result.peakMemory} bytes')
+
+        for (name, count) in result.calls.items():
+
+            previousCount = previous.calls.get(name, 0)
+
+            if count > previousCount:
+
+                regressions.append(f'{result.key}: {name} calls {previousCount} -> {count}')
+
+    return regressions
+
+
+def formatResults(results, baseline=None):
+    """
+    Returns a table summarizing the supplied results.
+
+    :type results: List[BenchmarkResult]
+    :type baseline: Union[Dict[str, BenchmarkResult], None]
+    :rtype: str
+    """
+
+    baseline = {} if baseline is None else baseline
+    lines = [f'{"benchmark":<28}{"time (ms)":>12}{"baseline":>12}{"calls":>10}{"peak (KB)":>12}']
+
+    for result in results:
+
+        if result.skipped:
+
+            lines.append(f'{result.key:<28}{"skipped":>12}')
+            continue
+
+        previous = baseline.get(result.key, None)
+        previousTime = f'{previous.wallTime * 1000.0:.2f}' if previous is not None else '-'
+
+        lines.append(f'{result.key:<28}{result.wallTime * 1000.0:>12.2f}{previousTime:>12}{result.totalCalls():>10}{result.peakMemory / 1024.0:>12.1f}')
+
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """
+    Runs the benchmarks from the command line.
+    Returns a non-zero exit code if any regressions were found.
+
+    :type argv: Union[List[str], None]
+    :rtype: int
+    """
+
+    parser = argparse.ArgumentParser(description='Benchmarks the align, aim and matrix operations against a mock scene.')
+    parser.add_argument('-b', '--benchmark', action='append', dest='names', help='Name of a benchmark to run.')
+    parser.add_argument('-s', '--size', action='append', type=int, dest='sizes', help='Overrides the sizes to run.')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='Number of times to run each benchmark.')
+    parser.add_argument('--baseline', help='Path to a baseline to compare against.')
+    parser.add_argument('--save', help='Path to save the results to.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed wall time and memory growth.')
+
+    args = parser.parse_args(argv)
+
+    # Run benchmarks
+    #
+    sizes = None
+
+    if args.sizes:
+
+        sizes = {benchmark.name: args.sizes for benchmark in __benchmarks__ if benchmark.name != 'startup'}
+
+    results = run(names=args.names, sizes=sizes, repeat=args.repeat)
+    baseline = loadResults(args.baseline) if args.baseline else None
+
+    print(formatResults(results, baseline=baseline))
+
+    if args.save:
+
+        saveResults(results, args.save)
+
+    # Compare against baseline
+    #
+    if baseline is None:
+
+        return 0
+
+    regressions = compareResults(results, baseline, tolerance=args.tolerance)
+
+    for regression in regressions:
+
+        print(f'REGRESSION: {regression}')
+
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == '__main__':
+
+    sys.exit(main())
@@ -0,0 +1,428 @@
+import types
+import inspect
+import functools
+
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+__active__ = []
+__totals__ = defaultdict(Counter)
+__depth__ = 0
+__instrumented__ = {}
+
+__budgets__ = {
+    'QAlignTab': {
+        'getActiveSelection': (0, 1),
+        'name': (0, 0),
+        'worldMatrix': (1, 0),
+        'parentInverseMatrix': (1, 0),
+        'boundingBox': (1, 0),
+        'parent': (17, 0),
+        'iterDescendants': (1, 0),
+        'rotationOrder': (1, 0),
+        'eulerRotation': (1, 0),
+        'setMatrix': (1, 0),
+        'setEulerRotation': (1, 0),
+        'freezeTransform': (1, 0),
+        'snapshot': (1, 0),
+        'assumeSnapshot': (1, 0)
+    },
+    'QAimTab': {
+        'getActiveSelection': (0, 1),
+        'getUpAxis': (0, 1),
+        'worldMatrix': (1, 1),
+        'parentInverseMatrix': (1, 0),
+        'translation': (0, 1),
+        'parent': (17, 0),
+        'iterDescendants': (1, 0),
+        'rotationOrder': (1, 0),
+        'eulerRotation': (1, 0),
+        'setMatrix': (1, 0),
+        'setEulerRotation': (1, 0),
+        'freezeTransform': (1, 0),
+        'snapshot': (1, 0),
+        'assumeSnapshot': (1, 0)
+    },
+    'QMatrixTab': {
+        'getActiveSelection': (0, 1),
+        'worldMatrix': (1, 0),
+        'parentInverseMatrix': (1, 0),
+        'parent': (17, 0),
+        'iterDescendants': (1, 0),
+        'rotationOrder': (1, 0),
+        'eulerRotation': (1, 0),
+        'setMatrix': (1, 0),
+        'setEulerRotation': (1, 0),
+        'freezeTransform': (1, 0),
+        'snapshot': (1, 0),
+        'assumeSnapshot': (1, 0)
+    },
+    'QTimeTab': {
+        'getActiveSelection': (0, 1),
+        'getTime': (0, 2),
+        'setTime': (0, 2, 2, 0),
+        'parent': (17, 0),
+        'worldMatrix': (1, 0, 0, 1),
+        'parentInverseMatrix': (0, 0, 0, 1),
+        'animationVersion': (1, 0),
+        'iterDescendants': (1, 0),
+        'rotationOrder': (1, 0),
+        'eulerRotation': (1, 0),
+        'setMatrixKeys': (1, 0),
+        'setMatrix': (0, 0, 0, 1),
+        'setEulerRotation': (0, 0, 0, 1),
+        'keyTransform': (0, 0, 0, 1)
+    }
+}
+
+
+class BudgetError(AssertionError):
+    """
+    Overload of `AssertionError` raised whenever an operation exceeds its scene call budget.
+    """
+
+    pass
+
+
+class CallCounter(object):
+    """
+    Tallies the calls an operation makes into the scene.
+    """
+
+    # region Dunderscores
+    __slots__ = ('_operation', '_calls')
+
+    def __init__(self, operation=''):
+        """
+        Private method called after a new instance has been created.
+
+        :type operation: str
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(CallCounter, self).__init__()
+
+        # Declare private variables
+        #
+        self._operation = operation
+        self._calls = Counter()
+
+    def __getitem__(self, name):
+        """
+        Private method that returns the number of calls made to the specified method.
+
+        :type name: str
+        :rtype: int
+        """
+
+        return self._calls[name]
+
+    def __repr__(self):
+        """
+        Private method that returns a string representation of this instance.
+
+        :rtype: str
+        """
+
+        return f'{self.__class__.__name__}({self._operation}, {dict(self._calls)})'
+    # endregion
+
+    # region Properties
+    @property
+    def operation(self):
+        """
+        Getter method that returns the name of the counted operation.
+
+        :rtype: str
+        """
+
+        return self._operation
+    # endregion
+
+    # region Methods
+    def record(self, name, amount=1):
+        """
+        Increments the call counter for the specified method.
+
+        :type name: str
+        :type amount: int
+        :rtype: None
+        """
+
+        self._calls[name] += amount
+
+    def calls(self):
+        """
+        Returns the call counters.
+
+        :rtype: Dict[str, int]
+        """
+
+        return dict(self._calls)
+
+    def total(self):
+        """
+        Returns the total number of calls.
+
+        :rtype: int
+        """
+
+        return sum(self._calls.values())
+    # endregion
+
+
+def isCounting():
+    """
+    Evaluates if an operation is currently being counted.
+
+    :rtype: bool
+    """
+
+    return len(__active__) > 0
+
+
+@contextmanager
+def counting(operation, *fnBases):
+    """
+    Returns a context manager that counts the scene calls made by the enclosed operation.
+    Nested operations are also tallied by every enclosing operation.
+    Function sets created before counting began, such as a tab's scene, can be supplied so they are instrumented until the operation ends.
+
+    :type operation: str
+    :type fnBases: Union[fnnode.FnNode, List[fnnode.FnNode]]
+    :rtype: Iterator[CallCounter]
+    """
+
+    counter = CallCounter(operation)
+    __active__.append(counter)
+
+    swapped = [(fnBase, type(fnBase)) for fnBase in fnBases if instrument(type(fnBase)) is not type(fnBase)]
+
+    for (fnBase, cls) in swapped:
+
+        fnBase.__class__ = instrument(cls)
+
+    try:
+
+        yield counter
+
+    finally:
+
+        for (fnBase, cls) in swapped:
+
+            fnBase.__class__ = cls
+
+        __active__.remove(counter)
+        __totals__[operation].update(counter.calls())
+
+
+def record(name, amount=1):
+    """
+    Increments the specified call counter on every active operation.
+
+    :type name: str
+    :type amount: int
+    :rtype: None
+    """
+
+    for counter in __active__:
+
+        counter.record(name, amount=amount)
+
+
+def wrapMethod(name, func):
+    """
+    Returns a wrapper that records each call to the supplied method while an operation is being counted.
+    Calls made from inside another recorded call are ignored since they never cross back into the tool!
+
+    :type name: str
+    :type func: Callable
+    :rtype: Callable
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+
+        global __depth__
+
+        if __depth__ > 0 or len(__active__) == 0:
+
+            return func(*args, **kwargs)
+
+        record(name)
+        __depth__ += 1
+
+        try:
+
+            return func(*args, **kwargs)
+
+        finally:
+
+            __depth__ -= 1
+
+    return wrapper
+
+
+def instrument(cls):
+    """
+    Returns a subclass of the supplied function set class that records every public method called on it.
+    Counting at the function set boundary means no scene call can slip past the budgets.
+    Subclasses are cached so repeated calls return the same class, and only add methods so instances can swap between the two classes.
+
+    :type cls: type
+    :rtype: type
+    """
+
+    # Check if class was already instrumented
+    #
+    instrumented = __instrumented__.get(cls, None)
+
+    if instrumented is not None:
+
+        return instrumented
+
+    elif cls in __instrumented__.values():
+
+        return cls
+
+    # Wrap public methods
+    #
+    namespace = {'__slots__': (), '__module__': cls.__module__, '__qualname__': cls.__qualname__, '__doc__': cls.__doc__}
+
+    for name in dir(cls):
+
+        if name.startswith('_'):
+
+            continue
+
+        func = inspect.getattr_static(cls, name)
+
+        if isinstance(func, types.FunctionType):
+
+            namespace[name] = wrapMethod(name, func)
+
+    instrumented = types.new_class(cls.__name__, (cls,), exec_body=lambda ns: ns.update(namespace))
+    __instrumented__[cls] = instrumented
+
+    return instrumented
+
+
+def uninstrument(cls):
+    """
+    Returns the function set class that the supplied instrumented class was derived from.
+    Classes that were never instrumented are returned as is.
+
+    :type cls: type
+    :rtype: type
+    """
+
+    for (original, instrumented) in __instrumented__.items():
+
+        if instrumented is cls:
+
+            return original
+
+    return cls
+
+
+def getTotals():
+    """
+    Returns the accumulated call counters grouped by operation.
+
+    :rtype: Dict[str, Dict[str, int]]
+    """
+
+    return {operation: dict(calls) for (operation, calls) in __totals__.items()}
+
+
+def resetTotals():
+    """
+    Resets the accumulated call counters.
+
+    :rtype: None
+    """
+
+    __totals__.clear()
+
+
+def getBudget(operation):
+    """
+    Returns the default call budget for the specified operation.
+    Each budget maps a method name onto a per-node allowance and a constant allowance.
+    Operations that sweep time can also supply a per-frame allowance and a per-node per-frame allowance.
+    Hierarchy walks pass at most `hierarchyutils.__depth__` unselected parents per node, hence the larger `parent` allowance.
+
+    :type operation: str
+    :rtype: Dict[str, Tuple[int, ...]]
+    """
+
+    return dict(__budgets__.get(operation, {}))
+
+
+def getAllowance(allowances, nodeCount, frameCount=0):
+    """
+    Returns the number of calls permitted by the supplied budget allowances.
+
+    :type allowances: Tuple[int, ...]
+    :type nodeCount: int
+    :type frameCount: int
+    :rtype: int
+    """
+
+    perNode, constant, perFrame, perNodeFrame = tuple(allowances) + (0,) * (4 - len(allowances))
+    return (perNode * nodeCount) + constant + (perFrame * frameCount) + (perNodeFrame * nodeCount * frameCount)
+
+
+def getOverruns(counter, nodeCount, budget=None, frameCount=0):
+    """
+    Returns the calls that exceed the supplied budget.
+    Methods without a budget are not checked!
+
+    :type counter: CallCounter
+    :type nodeCount: int
+    :type budget: Union[Dict[str, Tuple[int, ...]], None]
+    :type frameCount: int
+    :rtype: Dict[str, Tuple[int, int]]
+    """
+
+    budget = getBudget(counter.operation) if budget is None else budget
+    overruns = {}
+
+    for (name, allowances) in budget.items():
+
+        allowance = getAllowance(allowances, nodeCount, frameCount=frameCount)
+        calls = counter[name]
+
+        if calls > allowance:
+
+            overruns[name] = (calls, allowance)
+
+    return overruns
+
+
+def assertBudget(counter, nodeCount, budget=None, frameCount=0):
+    """
+    Raises a budget error if the supplied counter exceeds its call budget.
+    Intended to be used by tests to stop redundant scene calls from creeping back in.
+
+    :type counter: CallCounter
+    :type nodeCount: int
+    :type budget: Union[Dict[str, Tuple[int, ...]], None]
+    :type frameCount: int
+    :rtype: None
+    """
+
+    overruns = getOverruns(counter, nodeCount, budget=budget, frameCount=frameCount)
+
+    if len(overruns) > 0:
+
+        details = ', '.join(f'{name}: {calls} > {allowance}' for (name, (calls, allowance)) in overruns.items())
+        raise BudgetError(f'{counter.operation} exceeded its scene call budget for {nodeCount} node(s) over {frameCount} frame(s) ({details})!')
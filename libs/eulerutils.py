@@ -0,0 +1,361 @@
+import numpy
+
+from enum import IntEnum
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+class RotationOrder(IntEnum):
+    """
+    Enum class of all available rotation orders.
+    Angles are always stored as XYZ regardless of the order they are applied in!
+    """
+
+    XYZ = 0
+    YZX = 1
+    ZXY = 2
+    XZY = 3
+    YXZ = 4
+    ZYX = 5
+
+
+__axes__ = {
+    RotationOrder.XYZ: (0, 1, 2),
+    RotationOrder.YZX: (1, 2, 0),
+    RotationOrder.ZXY: (2, 0, 1),
+    RotationOrder.XZY: (0, 2, 1),
+    RotationOrder.YXZ: (1, 0, 2),
+    RotationOrder.ZYX: (2, 1, 0)
+}
+
+
+def getAxes(rotationOrder):
+    """
+    Returns the axis indices, in the order they are applied, along with the parity sign of the supplied rotation order.
+
+    :type rotationOrder: RotationOrder
+    :rtype: Tuple[Tuple[int, int, int], float]
+    """
+
+    axes = __axes__[RotationOrder(rotationOrder)]
+    sign = 1.0 if axes in ((0, 1, 2), (1, 2, 0), (2, 0, 1)) else -1.0
+
+    return axes, sign
+
+
+def asOrders(rotationOrders, count):
+    """
+    Returns an array of rotation orders from the supplied order or sequence of per-node orders.
+
+    :type rotationOrders: Union[int, Sequence[int]]
+    :type count: int
+    :rtype: numpy.ndarray
+    """
+
+    if isinstance(rotationOrders, (int, numpy.integer)):
+
+        return numpy.full(count, int(rotationOrders), dtype=numpy.int64)
+
+    else:
+
+        return numpy.asarray(rotationOrders, dtype=numpy.int64).reshape(count)
+
+
+def wrapAngles(angles):
+    """
+    Returns the supplied angles wrapped into the range [-pi, pi).
+
+    :type angles: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    return numpy.mod(angles + numpy.pi, 2.0 * numpy.pi) - numpy.pi
+
+
+def getRotations(matrices):
+    """
+    Returns the ...x3x3 rotation matrices from the supplied ...x4x4 matrices with their scale removed.
+
+    :type matrices: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    rotations = numpy.asarray(matrices, dtype=numpy.float64)[..., :3, :3]
+    scale = numpy.linalg.norm(rotations, axis=-1, keepdims=True)
+
+    return rotations / numpy.where(scale > 0.0, scale, 1.0)
+
+
+def composeEulers(angles, rotationOrder=RotationOrder.XYZ):
+    """
+    Returns the ...x3x3 rotation matrices from the supplied ...x3 euler angles in radians.
+
+    :type angles: numpy.ndarray
+    :type rotationOrder: RotationOrder
+    :rtype: numpy.ndarray
+    """
+
+    angles = numpy.asarray(angles, dtype=numpy.float64)
+    cosines, sines = numpy.cos(angles), numpy.sin(angles)
+
+    # Compose axis rotations in order
+    #
+    axes, sign = getAxes(rotationOrder)
+    rotation = None
+
+    for axis in axes:
+
+        i, j = (axis + 1) % 3, (axis + 2) % 3
+        c, s = cosines[..., axis], sines[..., axis]
+
+        matrix = numpy.zeros(angles.shape[:-1] + (3, 3))
+        matrix[..., axis, axis] = 1.0
+        matrix[..., i, i] = c
+        matrix[..., i, j] = s
+        matrix[..., j, i] = -s
+        matrix[..., j, j] = c
+
+        rotation = matrix if rotation is None else rotation @ matrix
+
+    return rotation
+
+
+def decomposeEulers(rotations, rotationOrder=RotationOrder.XYZ):
+    """
+    Returns the ...x3 euler angles, in radians, from the supplied ...x3x3 rotation matrices.
+    The middle angle is always kept within [-pi/2, pi/2] while gimbal locked rotations zero out the last angle.
+
+    :type rotations: numpy.ndarray
+    :type rotationOrder: RotationOrder
+    :rtype: numpy.ndarray
+    """
+
+    rotations = numpy.asarray(rotations, dtype=numpy.float64)
+
+    # Permute matrices into an XYZ order
+    # Odd permutations flip the handedness so their angles are negated!
+    #
+    axes, sign = getAxes(rotationOrder)
+    a, b, c = axes
+
+    m = rotations[..., axes, :][..., :, axes]
+
+    cosine = numpy.hypot(m[..., 0, 0], m[..., 0, 1])
+    isLocked = cosine < 1e-9
+
+    first = numpy.where(isLocked, numpy.arctan2(-m[..., 2, 1], m[..., 1, 1]), numpy.arctan2(m[..., 1, 2], m[..., 2, 2]))
+    second = numpy.arctan2(-m[..., 0, 2], cosine)
+    third = numpy.where(isLocked, 0.0, numpy.arctan2(m[..., 0, 1], m[..., 0, 0]))
+
+    angles = numpy.empty(rotations.shape[:-2] + (3,))
+    angles[..., a] = first * sign
+    angles[..., b] = second * sign
+    angles[..., c] = third * sign
+
+    return angles
+
+
+def getAlternateEulers(angles, rotationOrder=RotationOrder.XYZ):
+    """
+    Returns the alternate ...x3 euler angles that produce the same rotation as the supplied angles.
+
+    :type angles: numpy.ndarray
+    :type rotationOrder: RotationOrder
+    :rtype: numpy.ndarray
+    """
+
+    (a, b, c), sign = getAxes(rotationOrder)
+
+    alternate = numpy.array(angles, dtype=numpy.float64, copy=True)
+    alternate[..., a] += numpy.pi
+    alternate[..., b] = numpy.pi - alternate[..., b]
+    alternate[..., c] += numpy.pi
+
+    return alternate
+
+
+def getSolutions(angles, rotationOrders):
+    """
+    Returns both euler solutions for the supplied NxFx3 angles as an NxFx2x3 array.
+
+    :type angles: numpy.ndarray
+    :type rotationOrders: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    solutions = numpy.stack([angles, angles], axis=-2)
+
+    for rotationOrder in numpy.unique(rotationOrders):
+
+        indices = numpy.flatnonzero(rotationOrders == rotationOrder)
+        solutions[indices, :, 1] = getAlternateEulers(angles[indices], rotationOrder=rotationOrder)
+
+    return solutions
+
+
+def getDistances(angles, otherAngles):
+    """
+    Returns the summed angular distance between the supplied euler angles, ignoring whole revolutions.
+
+    :type angles: numpy.ndarray
+    :type otherAngles: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    return numpy.abs(wrapAngles(angles - otherAngles)).sum(axis=-1)
+
+
+def unwrapEulers(angles, rotationOrders=RotationOrder.XYZ, previous=None):
+    """
+    Returns the supplied NxFx3 euler angles with the solution closest to the previous frame picked for each frame.
+    Whole revolutions are then added so that no channel jumps by more than pi between frames.
+    If previous angles are supplied then the first frame is also matched against them.
+
+    :type angles: numpy.ndarray
+    :type rotationOrders: Union[RotationOrder, Sequence[RotationOrder]]
+    :type previous: Union[numpy.ndarray, None]
+    :rtype: numpy.ndarray
+    """
+
+    angles = numpy.asarray(angles, dtype=numpy.float64)
+    nodeCount, frameCount = angles.shape[:2]
+
+    if nodeCount == 0 or frameCount == 0:
+
+        return angles.copy()
+
+    rotationOrders = asOrders(rotationOrders, nodeCount)
+    solutions = getSolutions(angles, rotationOrders)
+
+    # Pick the initial solution
+    #
+    nodeIndices = numpy.arange(nodeCount)
+
+    if previous is not None:
+
+        previous = numpy.asarray(previous, dtype=numpy.float64).reshape(nodeCount, 3)
+        initial = getDistances(solutions[:, 0], previous[:, None, :]).argmin(axis=-1)
+
+    else:
+
+        initial = numpy.zeros(nodeCount, dtype=numpy.int64)
+
+    # Evaluate the closest solution for both previous solutions
+    # Since whole revolutions are ignored, each choice only depends on the previous choice!
+    #
+    distances = getDistances(solutions[:, 1:, None, :, :], solutions[:, :-1, :, None, :])
+    transitions = numpy.empty((nodeCount, frameCount, 2), dtype=numpy.int64)
+    transitions[:, 0] = initial[:, None]
+    transitions[:, 1:] = distances.argmin(axis=-1)
+
+    # Compose transitions with a prefix scan
+    #
+    offset = 1
+
+    while offset < frameCount:
+
+        composed = numpy.take_along_axis(transitions[:, offset:], transitions[:, :-offset], axis=-1)
+        transitions[:, offset:] = composed
+
+        offset *= 2
+
+    choices = transitions[:, :, 0]
+    chosen = solutions[nodeIndices[:, None], numpy.arange(frameCount)[None, :], choices]
+
+    # Remove whole revolution jumps
+    #
+    if previous is not None:
+
+        chosen = numpy.unwrap(numpy.concatenate([previous[:, None, :], chosen], axis=1), axis=1)[:, 1:]
+
+    else:
+
+        chosen = numpy.unwrap(chosen, axis=1)
+
+    return chosen
+
+
+def getEulers(matrices, rotationOrders=RotationOrder.XYZ):
+    """
+    Returns the NxFx3 euler angles from the supplied NxFx4x4 matrices using each node's rotation order.
+
+    :type matrices: numpy.ndarray
+    :type rotationOrders: Union[RotationOrder, Sequence[RotationOrder]]
+    :rtype: numpy.ndarray
+    """
+
+    rotations = getRotations(matrices)
+    nodeCount = rotations.shape[0]
+
+    rotationOrders = asOrders(rotationOrders, nodeCount)
+    angles = numpy.empty(rotations.shape[:-2] + (3,))
+
+    for rotationOrder in numpy.unique(rotationOrders):
+
+        indices = numpy.flatnonzero(rotationOrders == rotationOrder)
+        angles[indices] = decomposeEulers(rotations[indices], rotationOrder=rotationOrder)
+
+    return angles
+
+
+def readEulers(nodes):
+    """
+    Returns the rotation orders and current euler channels, in radians, from the supplied transforms.
+    If any function set cannot report its rotation order or euler channels then none is returned!
+
+    :type nodes: List[fntransform.FnTransform]
+    :rtype: Union[Tuple[numpy.ndarray, numpy.ndarray], None]
+    """
+
+    rotationOrderFuncs = [getattr(node, 'rotationOrder', None) for node in nodes]
+    eulerRotationFuncs = [getattr(node, 'eulerRotation', None) for node in nodes]
+
+    if not all(callable(func) for func in rotationOrderFuncs + eulerRotationFuncs):
+
+        return None
+
+    rotationOrders = numpy.array([int(func()) for func in rotationOrderFuncs], dtype=numpy.int64)
+    eulerRotations = numpy.array([numpy.asarray(func(), dtype=numpy.float64).reshape(3) for func in eulerRotationFuncs]).reshape(-1, 3)
+
+    return rotationOrders, eulerRotations
+
+
+def canWriteEulers(nodes):
+    """
+    Evaluates if the supplied transforms can read and write their euler channels.
+
+    :type nodes: List[fntransform.FnTransform]
+    :rtype: bool
+    """
+
+    return all(callable(getattr(node, name, None)) for node in nodes for name in ('rotationOrder', 'eulerRotation', 'setEulerRotation'))
+
+
+def writeEulers(nodes, eulerRotations):
+    """
+    Updates the euler channels, in radians, of the supplied transforms.
+    This should be called after `setMatrix` so each node keeps the supplied solution rather than the one decomposed from its matrix.
+
+    :type nodes: List[fntransform.FnTransform]
+    :type eulerRotations: numpy.ndarray
+    :rtype: None
+    """
+
+    for (node, eulerRotation) in zip(nodes, eulerRotations):
+
+        node.setEulerRotation(eulerRotation)
+
+
+def isRotateSkipped(**kwargs):
+    """
+    Evaluates if the supplied `setMatrix` keywords skip any rotation axis.
+    Euler channels cannot be written once an axis is skipped since the remaining axes depend on it!
+
+    :key skipRotate: bool
+    :rtype: bool
+    """
+
+    return any(kwargs.get(f'skipRotate{axis}', False) for axis in ('', 'X', 'Y', 'Z'))
@@ -0,0 +1,327 @@
+from contextlib import contextmanager
+from collections import defaultdict
+from dcc import fnnode, fntransform, fnmesh, fnscene
+from . import callbudget
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+__classes__ = {
+    'FnNode': fnnode.FnNode,
+    'FnTransform': fntransform.FnTransform,
+    'FnMesh': fnmesh.FnMesh,
+    'FnScene': fnscene.FnScene
+}
+
+
+class FnPool(object):
+    """
+    Reusable pool of function sets.
+    Released function sets are rebound on the next acquire rather than re-allocated.
+    The pooled classes can be overridden in order to substitute alternate scene backends.
+    Function sets are only instrumented while an operation is being counted, so regular applies call straight into the pooled classes.
+    """
+
+    # region Dunderscores
+    __slots__ = ('_classes', '_free', '_allocations', '_reuses')
+
+    def __init__(self, **classes):
+        """
+        Private method called after a new instance has been created.
+
+        :key FnNode: Callable
+        :key FnTransform: Callable
+        :key FnMesh: Callable
+        :key FnScene: Callable
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(FnPool, self).__init__()
+
+        # Declare private variables
+        #
+        self._classes = dict(__classes__, **classes)
+        self._free = defaultdict(list)
+        self._allocations = 0
+        self._reuses = 0
+
+    def __len__(self):
+        """
+        Private method that evaluates the number of released function sets.
+
+        :rtype: int
+        """
+
+        return sum(map(len, self._free.values()))
+    # endregion
+
+    # region Properties
+    @property
+    def allocations(self):
+        """
+        Getter method that returns the number of function sets created by this pool.
+
+        :rtype: int
+        """
+
+        return self._allocations
+
+    @property
+    def reuses(self):
+        """
+        Getter method that returns the number of function sets rebound by this pool.
+
+        :rtype: int
+        """
+
+        return self._reuses
+    # endregion
+
+    # region Methods
+    def getClass(self, typeName):
+        """
+        Returns the function set class associated with the supplied type name.
+        If an operation is being counted then the instrumented class is returned instead.
+
+        :type typeName: str
+        :rtype: Callable
+        """
+
+        cls = self._classes.get(typeName, None)
+
+        if cls is None:
+
+            raise TypeError(f'getClass() expects a valid type name ({typeName} given)!')
+
+        if callbudget.isCounting():
+
+            return callbudget.instrument(cls)
+
+        else:
+
+            return cls
+
+    def setClass(self, typeName, cls):
+        """
+        Updates the function set class associated with the supplied type name.
+        Any released function sets of the previous class are discarded!
+
+        :type typeName: str
+        :type cls: Callable
+        :rtype: None
+        """
+
+        previous = self._classes.get(typeName, None)
+        self._classes[typeName] = cls
+
+        if previous in self._classes.values():
+
+            return
+
+        for key in [key for key in self._free.keys() if callbudget.uninstrument(key) is previous]:
+
+            self._free.pop(key)
+
+    def acquire(self, typeName, obj=None):
+        """
+        Returns a function set of the specified type bound to the supplied object.
+        Function sets acquired without an object may still be bound to a previous object and must be rebound before use!
+
+        :type typeName: str
+        :type obj: Any
+        :rtype: fnnode.FnNode
+        """
+
+        # Check if a released function set is available
+        #
+        cls = self.getClass(typeName)
+        free = self._free[cls]
+
+        if len(free) > 0:
+
+            fnBase = free.pop()
+            self._reuses += 1
+
+        else:
+
+            fnBase = cls()
+            self._allocations += 1
+
+        # Check if an object was supplied
+        # Function sets that fail to rebind are replaced so they do not leak their previous object!
+        #
+        if obj is None:
+
+            return fnBase
+
+        success = fnBase.trySetObject(obj)
+
+        if not success and fnBase.isValid():
+
+            fnBase = cls()
+            self._allocations += 1
+
+        return fnBase
+
+    def acquireMany(self, typeName, objects):
+        """
+        Returns a list of function sets of the specified type bound to the supplied objects.
+
+        :type typeName: str
+        :type objects: List[Any]
+        :rtype: List[fnnode.FnNode]
+        """
+
+        return [self.acquire(typeName, obj=obj) for obj in objects]
+
+    def release(self, *fnBases):
+        """
+        Returns the supplied function sets to this pool.
+        Function sets that were not created from one of the pooled classes are ignored.
+        Instrumented function sets are kept apart so they are only reused while counting.
+
+        :type fnBases: Union[fnnode.FnNode, List[fnnode.FnNode]]
+        :rtype: None
+        """
+
+        classes = set(self._classes.values())
+
+        for fnBase in fnBases:
+
+            cls = type(fnBase)
+
+            if callbudget.uninstrument(cls) in classes:
+
+                self._free[cls].append(fnBase)
+
+    @contextmanager
+    def borrow(self, typeName, *objects):
+        """
+        Returns a context manager that yields function sets bound to the supplied objects.
+        The function sets are returned to this pool on exit.
+
+        :type typeName: str
+        :type objects: Union[Any, List[Any]]
+        :rtype: Iterator[List[fnnode.FnNode]]
+        """
+
+        fnBases = self.acquireMany(typeName, objects)
+
+        try:
+
+            yield fnBases
+
+        finally:
+
+            self.release(*fnBases)
+
+    def clear(self):
+        """
+        Discards all released function sets.
+
+        :rtype: None
+        """
+
+        self._free.clear()
+
+    def stats(self):
+        """
+        Returns the allocation and reuse counters as a dictionary.
+
+        :rtype: Dict[str, int]
+        """
+
+        return {'allocations': self._allocations, 'reuses': self._reuses, 'free': len(self)}
+    # endregion
+
+
+__pool__ = FnPool()
+
+
+def getPool():
+    """
+    Returns the shared function set pool.
+
+    :rtype: FnPool
+    """
+
+    return __pool__
+
+
+def setClasses(**classes):
+    """
+    Updates the function set classes used by the shared pool.
+
+    :key FnNode: Callable
+    :key FnTransform: Callable
+    :key FnMesh: Callable
+    :key FnScene: Callable
+    :rtype: None
+    """
+
+    for (typeName, cls) in classes.items():
+
+        __pool__.setClass(typeName, cls)
+
+
+def createScene():
+    """
+    Returns a new scene function set from the shared pool's scene class.
+    Scene function sets are not bound to an object so they are created rather than pooled.
+
+    :rtype: fnscene.FnScene
+    """
+
+    return __pool__.getClass('FnScene')()
+
+
+def acquire(typeName, obj=None):
+    """
+    Returns a function set from the shared pool.
+
+    :type typeName: str
+    :type obj: Any
+    :rtype: fnnode.FnNode
+    """
+
+    return __pool__.acquire(typeName, obj=obj)
+
+
+def acquireMany(typeName, objects):
+    """
+    Returns a list of function sets from the shared pool.
+
+    :type typeName: str
+    :type objects: List[Any]
+    :rtype: List[fnnode.FnNode]
+    """
+
+    return __pool__.acquireMany(typeName, objects)
+
+
+def release(*fnBases):
+    """
+    Returns the supplied function sets to the shared pool.
+
+    :type fnBases: Union[fnnode.FnNode, List[fnnode.FnNode]]
+    :rtype: None
+    """
+
+    __pool__.release(*fnBases)
+
+
+def borrow(typeName, *objects):
+    """
+    Returns a context manager that yields function sets from the shared pool.
+
+    :type typeName: str
+    :type objects: Union[Any, List[Any]]
+    :rtype: Iterator[List[fnnode.FnNode]]
+    """
+
+    return __pool__.borrow(typeName, *objects)
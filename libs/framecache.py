@@ -0,0 +1,385 @@
+import numpy
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+from . import querycache
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+@dataclass
+class FrameEntry(object):
+    """
+    Data class that stores the sampled matrices of a single query across time.
+    Frames are kept sorted so that the matrices remain a contiguous frames x 4 x 4 array.
+    """
+
+    frames: numpy.ndarray
+    matrices: numpy.ndarray
+    version: Any = None
+
+    @property
+    def nbytes(self):
+        """
+        Getter method that returns the number of bytes used by this entry.
+
+        :rtype: int
+        """
+
+        return self.frames.nbytes + self.matrices.nbytes
+
+    def lookup(self, frames):
+        """
+        Returns the indices of the supplied frames inside this entry along with a mask of the frames that were found.
+
+        :type frames: numpy.ndarray
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+
+        indices = numpy.clip(numpy.searchsorted(self.frames, frames), 0, max(len(self.frames) - 1, 0))
+        found = (self.frames[indices] == frames) if len(self.frames) > 0 else numpy.zeros(len(frames), dtype=bool)
+
+        return indices, found
+
+    def merge(self, frames, matrices):
+        """
+        Inserts the supplied frames into this entry.
+        Existing frames are overwritten by the new matrices.
+
+        :type frames: numpy.ndarray
+        :type matrices: numpy.ndarray
+        :rtype: None
+        """
+
+        keep = ~numpy.isin(self.frames, frames)
+
+        frames = numpy.concatenate([self.frames[keep], frames])
+        matrices = numpy.concatenate([self.matrices[keep], matrices])
+        order = numpy.argsort(frames, kind='stable')
+
+        self.frames = numpy.ascontiguousarray(frames[order])
+        self.matrices = numpy.ascontiguousarray(matrices[order])
+
+
+class FrameCache(object):
+    """
+    Session scoped cache of per-frame matrix queries.
+    Entries are keyed by node handle and query type and hold every sampled frame in a contiguous array.
+    The least recently used entries are evicted once the memory budget is exceeded.
+    Function sets that implement `animationVersion` are validated on lookup, otherwise entries must be invalidated whenever the tool keys a node.
+    Since edits made outside of this tool go unnoticed without `animationVersion`, the shared cache is opt-in and can be cleared by the user!
+    """
+
+    # region Dunderscores
+    __slots__ = ('_entries', '_budget', '_size', '_hits', '_misses')
+    __budget__ = 256 * 1024 * 1024
+
+    def __init__(self, budget=None):
+        """
+        Private method called after a new instance has been created.
+
+        :type budget: Union[int, None]
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(FrameCache, self).__init__()
+
+        # Declare private variables
+        #
+        self._entries = OrderedDict()
+        self._budget = self.__budget__ if budget is None else int(budget)
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        """
+        Private method that evaluates the number of cached entries.
+
+        :rtype: int
+        """
+
+        return len(self._entries)
+
+    def __repr__(self):
+        """
+        Private method that returns a string representation of this instance.
+
+        :rtype: str
+        """
+
+        return f'{self.__class__.__name__}(hits={self.hits}, misses={self.misses}, size={self.size})'
+    # endregion
+
+    # region Properties
+    @property
+    def hits(self):
+        """
+        Getter method that returns the number of frames answered from the cache.
+
+        :rtype: int
+        """
+
+        return self._hits
+
+    @property
+    def misses(self):
+        """
+        Getter method that returns the number of frames that had to be sampled.
+
+        :rtype: int
+        """
+
+        return self._misses
+
+    @property
+    def size(self):
+        """
+        Getter method that returns the number of bytes used by the cached entries.
+
+        :rtype: int
+        """
+
+        return self._size
+
+    @property
+    def budget(self):
+        """
+        Getter method that returns the memory budget in bytes.
+
+        :rtype: int
+        """
+
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget):
+        """
+        Setter method that updates the memory budget in bytes.
+
+        :type budget: int
+        :rtype: None
+        """
+
+        self._budget = int(budget)
+        self.evict()
+    # endregion
+
+    # region Methods
+    def version(self, node):
+        """
+        Returns the animation version of the supplied node.
+        If the function set cannot report changes then none is returned.
+
+        :type node: fntransform.FnTransform
+        :rtype: Any
+        """
+
+        func = getattr(node, 'animationVersion', None)
+
+        if callable(func):
+
+            return func()
+
+        else:
+
+            return None
+
+    def get(self, node, name, frames, version=None):
+        """
+        Returns the cached matrices for the supplied node and query at the specified frames along with a mask of the frames that were found.
+        Frames that were not found are left as identity matrices!
+
+        :type node: fntransform.FnTransform
+        :type name: str
+        :type frames: numpy.ndarray
+        :type version: Any
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+
+        frameCount = len(frames)
+        matrices = numpy.tile(numpy.eye(4), (frameCount, 1, 1))
+        found = numpy.zeros(frameCount, dtype=bool)
+
+        # Check if entry is still valid
+        #
+        key = (node.handle(), name)
+        entry = self._entries.get(key, None)
+
+        if entry is not None and entry.version != version:
+
+            self.discard(key)
+            entry = None
+
+        if entry is None:
+
+            self._misses += frameCount
+            return matrices, found
+
+        # Copy cached frames
+        #
+        indices, found = entry.lookup(frames)
+        matrices[found] = entry.matrices[indices[found]]
+
+        hits = int(found.sum())
+        self._hits += hits
+        self._misses += frameCount - hits
+
+        self._entries.move_to_end(key)
+
+        return matrices, found
+
+    def put(self, node, name, frames, matrices, version=None):
+        """
+        Stores the supplied matrices for the node and query at the specified frames.
+
+        :type node: fntransform.FnTransform
+        :type name: str
+        :type frames: numpy.ndarray
+        :type matrices: numpy.ndarray
+        :type version: Any
+        :rtype: None
+        """
+
+        if len(frames) == 0:
+
+            return
+
+        frames = numpy.asarray(frames, dtype=numpy.float64).reshape(-1)
+        matrices = numpy.asarray(matrices, dtype=numpy.float64).reshape(-1, 4, 4)
+
+        key = (node.handle(), name)
+        entry = self._entries.get(key, None)
+
+        if entry is None or entry.version != version:
+
+            self.discard(key)
+
+            order = numpy.argsort(frames, kind='stable')
+            entry = FrameEntry(frames=numpy.ascontiguousarray(frames[order]), matrices=numpy.ascontiguousarray(matrices[order]), version=version)
+
+            self._entries[key] = entry
+            self._size += entry.nbytes
+
+        else:
+
+            self._size -= entry.nbytes
+            entry.merge(frames, matrices)
+            self._size += entry.nbytes
+
+            self._entries.move_to_end(key)
+
+        self.evict()
+
+    def discard(self, key):
+        """
+        Removes the entry with the supplied key.
+
+        :type key: Tuple[int, str]
+        :rtype: None
+        """
+
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+
+            self._size -= entry.nbytes
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache fits inside its memory budget.
+
+        :rtype: None
+        """
+
+        while self._size > self._budget and len(self._entries) > 0:
+
+            key, entry = self._entries.popitem(last=False)
+            self._size -= entry.nbytes
+
+    def invalidate(self, node, descendants=True):
+        """
+        Removes all cached entries for the supplied node.
+        Since world-space values depend on the parent, descendants are invalidated by default.
+
+        :type node: fntransform.FnTransform
+        :type descendants: bool
+        :rtype: None
+        """
+
+        # Collect affected handles
+        # No need to walk the descendants if this node owns every cached entry!
+        #
+        handle = node.handle()
+        handles = {handle}
+
+        if descendants and any(key[0] != handle for key in self._entries.keys()):
+
+            handles.update(fnDescendant.handle() for fnDescendant in querycache.iterDescendants(node))
+
+        # Remove cached entries
+        #
+        for key in [key for key in self._entries.keys() if key[0] in handles]:
+
+            self.discard(key)
+
+    def clear(self):
+        """
+        Removes all cached entries.
+        Hit and miss counters are left untouched.
+
+        :rtype: None
+        """
+
+        self._entries.clear()
+        self._size = 0
+
+    def resetCounters(self):
+        """
+        Resets the hit and miss counters.
+
+        :rtype: None
+        """
+
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self):
+        """
+        Returns the hit and miss counters as a dictionary.
+
+        :rtype: Dict[str, int]
+        """
+
+        return {'hits': self._hits, 'misses': self._misses, 'entries': len(self._entries), 'size': self._size}
+    # endregion
+
+
+__cache__ = FrameCache()
+
+
+def getCache():
+    """
+    Returns the shared frame cache.
+    Bakes only reuse this cache when it is explicitly supplied.
+
+    :rtype: FrameCache
+    """
+
+    return __cache__
+
+
+def clearCache():
+    """
+    Discards all cached frames.
+
+    :rtype: None
+    """
+
+    __cache__.clear()
@@ -0,0 +1,133 @@
+from . import fnpool
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+__depth__ = 16
+
+
+def getSelectedHierarchy(nodes, maxDepth=None):
+    """
+    Returns the hierarchical relationships between the supplied nodes.
+    The first list contains the index of each node's parent, or -1 if the parent is not in the supplied list.
+    The second list contains the indices of each node's ancestors that are in the supplied list, ordered from nearest to furthest.
+    Each node's parents are only walked until a supplied node is found, or until more than `maxDepth` unsupplied parents have been passed.
+    Nodes nested further than that below a supplied ancestor are treated as unrelated!
+
+    :type nodes: List[fnnode.FnNode]
+    :type maxDepth: Union[int, None]
+    :rtype: Tuple[List[int], List[List[int]]]
+    """
+
+    # Map handles to indices
+    #
+    indices = {node.handle(): index for (index, node) in enumerate(nodes) if node.isValid()}
+
+    parents = [-1] * len(nodes)
+    ancestors = [[] for _ in range(len(nodes))]
+
+    if len(indices) < 2:
+
+        return parents, ancestors
+
+    # Walk up each node's parents until a supplied node is found
+    # Unsupplied parents are remembered so that shared branches are only walked once!
+    #
+    maxDepth = __depth__ if maxDepth is None else maxDepth
+
+    nearest = [-1] * len(nodes)
+    visited = {}
+
+    fnParent = fnpool.acquire('FnNode')
+
+    try:
+
+        for (index, node) in enumerate(nodes):
+
+            if not node.isValid():
+
+                continue
+
+            parent = node.parent()
+            path = []
+
+            isTruncated = False
+
+            while parent is not None and fnParent.trySetObject(parent):
+
+                handle = fnParent.handle()
+                parentIndex = indices.get(handle, visited.get(handle, None))
+
+                if parentIndex is not None:
+
+                    nearest[index] = parentIndex
+                    parents[index] = parentIndex if (len(path) == 0 and handle in indices) else -1
+
+                    break
+
+                path.append(handle)
+                isTruncated = len(path) > maxDepth
+
+                if isTruncated:
+
+                    break
+
+                parent = fnParent.parent()
+
+            # Remember the walked parents unless the walk was cut short
+            #
+            if not isTruncated:
+
+                visited.update(dict.fromkeys(path, nearest[index]))
+
+    finally:
+
+        fnpool.release(fnParent)
+
+    # Resolve ancestors from the nearest supplied ancestor
+    #
+    isResolved = [False] * len(nodes)
+
+    for index in range(len(nodes)):
+
+        stack = []
+        current = index
+
+        while current != -1 and not isResolved[current]:
+
+            stack.append(current)
+            current = nearest[current]
+
+        for current in reversed(stack):
+
+            nearestIndex = nearest[current]
+
+            if nearestIndex != -1:
+
+                ancestors[current] = [nearestIndex] + ancestors[nearestIndex]
+
+            isResolved[current] = True
+
+    return parents, ancestors
+
+
+def getSelectedDescendants(ancestors):
+    """
+    Inverts the supplied ancestor indices into descendant indices.
+
+    :type ancestors: List[List[int]]
+    :rtype: List[List[int]]
+    """
+
+    descendants = [[] for _ in range(len(ancestors))]
+
+    for (index, indices) in enumerate(ancestors):
+
+        for ancestorIndex in indices:
+
+            descendants[ancestorIndex].append(index)
+
+    return descendants
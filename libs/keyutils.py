@@ -0,0 +1,170 @@
+import numpy
+
+from . import profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+def getChannels(matrices):
+    """
+    Returns the 12 animatable channels from the supplied ...x4x4 matrices.
+    Each row contributes its first 3 columns, so axis channels deviate by roughly radians and position channels by scene units.
+
+    :type matrices: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    matrices = numpy.asarray(matrices, dtype=numpy.float64)
+    return matrices[..., :, :3].reshape(matrices.shape[:-2] + (12,))
+
+
+def getTangents(frames, values):
+    """
+    Returns the slopes of the supplied NxFxC values with respect to the specified frames.
+    Interior slopes use central differences while the end frames use one-sided differences.
+
+    :type frames: numpy.ndarray
+    :type values: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    if len(frames) < 2:
+
+        return numpy.zeros_like(values)
+
+    return numpy.gradient(values, frames, axis=-2)
+
+
+def getKeyIndices(mask):
+    """
+    Returns the previous and next key index for every frame from the supplied NxF key mask.
+    Frames that are keys are their own previous key!
+
+    :type mask: numpy.ndarray
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+
+    frameCount = mask.shape[-1]
+    indices = numpy.broadcast_to(numpy.arange(frameCount), mask.shape)
+
+    previous = numpy.maximum.accumulate(numpy.where(mask, indices, 0), axis=-1)
+    following = numpy.flip(numpy.minimum.accumulate(numpy.flip(numpy.where(mask, indices, frameCount - 1), axis=-1), axis=-1), axis=-1)
+
+    # Frames that are keys still interpolate towards the next key
+    #
+    shifted = numpy.concatenate([following[..., 1:], numpy.full(mask.shape[:-1] + (1,), frameCount - 1)], axis=-1)
+    following = numpy.where(mask, shifted, following)
+
+    return previous, following
+
+
+def evaluateKeys(frames, values, tangents, mask):
+    """
+    Returns the NxFxC values interpolated from the keyed frames in the supplied NxF mask.
+    Keys are interpolated using cubic hermite splines, or linearly if no tangents are supplied.
+
+    :type frames: numpy.ndarray
+    :type values: numpy.ndarray
+    :type tangents: Union[numpy.ndarray, None]
+    :type mask: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    previous, following = getKeyIndices(mask)
+
+    # Evaluate normalized segment time
+    #
+    startFrames, endFrames = frames[previous], frames[following]
+    spans = endFrames - startFrames
+
+    safeSpans = numpy.where(spans > 0.0, spans, 1.0)
+    s = numpy.where(spans > 0.0, (frames - startFrames) / safeSpans, 0.0)[..., None]
+
+    startValues = numpy.take_along_axis(values, previous[..., None], axis=-2)
+    endValues = numpy.take_along_axis(values, following[..., None], axis=-2)
+
+    if tangents is None:
+
+        return startValues + ((endValues - startValues) * s)
+
+    # Evaluate hermite basis
+    #
+    startTangents = numpy.take_along_axis(tangents, previous[..., None], axis=-2)
+    endTangents = numpy.take_along_axis(tangents, following[..., None], axis=-2)
+
+    s2, s3 = s * s, s * s * s
+    h00 = (2.0 * s3) - (3.0 * s2) + 1.0
+    h10 = s3 - (2.0 * s2) + s
+    h01 = (-2.0 * s3) + (3.0 * s2)
+    h11 = s3 - s2
+
+    spans = spans[..., None]
+
+    return (h00 * startValues) + (h10 * spans * startTangents) + (h01 * endValues) + (h11 * spans * endTangents)
+
+
+def reduceKeys(frames, values, tolerance=1e-3, tangents=None):
+    """
+    Returns an NxF mask of the keys required to reproduce the supplied NxFxC values within the specified tolerance.
+    Starting from the end frames, every segment that exceeds the tolerance is split at its worst frame until all channels fit.
+    Each pass evaluates every node, frame and channel at once.
+
+    :type frames: numpy.ndarray
+    :type values: numpy.ndarray
+    :type tolerance: float
+    :type tangents: Union[numpy.ndarray, None]
+    :rtype: numpy.ndarray
+    """
+
+    frames = numpy.asarray(frames, dtype=numpy.float64)
+    values = numpy.asarray(values, dtype=numpy.float64)
+
+    nodeCount, frameCount = values.shape[:2]
+
+    mask = numpy.zeros((nodeCount, frameCount), dtype=bool)
+
+    if frameCount == 0:
+
+        return mask
+
+    mask[:, 0] = True
+    mask[:, -1] = True
+
+    # Split segments until every frame fits
+    #
+    iterations = 0
+
+    with profiler.phase('reduceKeys'):
+
+        while True:
+
+            iterations += 1
+
+            errors = numpy.abs(evaluateKeys(frames, values, tangents, mask) - values).max(axis=-1)
+            errors[mask] = 0.0
+
+            if not (errors > tolerance).any():
+
+                break
+
+            # Insert the worst frame from each failing segment
+            #
+            previous, _ = getKeyIndices(mask)
+            segments = (numpy.arange(nodeCount)[:, None] * frameCount + previous).reshape(-1)
+
+            flatErrors = errors.reshape(-1)
+            order = numpy.lexsort((flatErrors, segments))
+
+            isLast = numpy.append(segments[order][1:] != segments[order][:-1], True)
+            worst = order[isLast]
+            worst = worst[flatErrors[worst] > tolerance]
+
+            mask.reshape(-1)[worst] = True
+
+    profiler.count('keys', int(mask.sum()))
+    log.debug(f'Reduced {mask.size} key(s) to {mask.sum()} key(s) in {iterations} pass(es).')
+
+    return mask
@@ -0,0 +1,475 @@
+import numpy
+
+from dcc.dataclasses import vector, transformationmatrix
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+__converters__ = {}
+
+
+class MatrixArray(object):
+    """
+    Array-backed container of N row-major 4x4 transformation matrices.
+    Follows the same row-vector convention as `TransformationMatrix` so matrices are composed from left to right.
+    """
+
+    # region Dunderscores
+    __slots__ = ('_array',)
+
+    def __init__(self, *args):
+        """
+        Private method called after a new instance has been created.
+
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(MatrixArray, self).__init__()
+
+        # Declare private variables
+        #
+        self._array = numpy.zeros((0, 4, 4), dtype=numpy.float64)
+
+        # Check if any arguments were supplied
+        #
+        numArgs = len(args)
+
+        if numArgs == 0:
+
+            pass
+
+        elif numArgs == 1 and isinstance(args[0], int):
+
+            self._array = numpy.tile(numpy.identity(4), (args[0], 1, 1))
+
+        elif numArgs == 1:
+
+            array = numpy.array(args[0], dtype=numpy.float64)
+
+            if array.ndim == 2:
+
+                array = array.reshape(1, 4, 4)
+
+            if array.shape[1:] != (4, 4):
+
+                raise TypeError(f'__init__() expects an Nx4x4 array ({array.shape} given)!')
+
+            self._array = array
+
+        else:
+
+            raise TypeError(f'__init__() expects at most 1 argument ({numArgs} given)!')
+
+    def __len__(self):
+        """
+        Private method that evaluates the number of matrices.
+
+        :rtype: int
+        """
+
+        return self._array.shape[0]
+
+    def __getitem__(self, index):
+        """
+        Private method that returns an indexed matrix.
+
+        :type index: Union[int, slice, numpy.ndarray]
+        :rtype: Union[transformationmatrix.TransformationMatrix, MatrixArray]
+        """
+
+        if isinstance(index, (int, numpy.integer)):
+
+            return toMatrix(self._array[index])
+
+        else:
+
+            return MatrixArray(self._array[index])
+
+    def __iter__(self):
+        """
+        Private method that returns a generator that yields transformation matrices.
+
+        :rtype: Iterator[transformationmatrix.TransformationMatrix]
+        """
+
+        for array in self._array:
+
+            yield toMatrix(array)
+
+    def __mul__(self, other):
+        """
+        Private method that multiplies this matrix array by the supplied matrices.
+        Single matrices are broadcast against every matrix in this array.
+
+        :type other: Union[MatrixArray, transformationmatrix.TransformationMatrix, numpy.ndarray]
+        :rtype: MatrixArray
+        """
+
+        return MatrixArray(numpy.matmul(self._array, asArray(other)))
+
+    def __rmul__(self, other):
+        """
+        Private method that multiplies the supplied matrices by this matrix array.
+
+        :type other: Union[MatrixArray, transformationmatrix.TransformationMatrix, numpy.ndarray]
+        :rtype: MatrixArray
+        """
+
+        return MatrixArray(numpy.matmul(asArray(other), self._array))
+
+    def __imul__(self, other):
+        """
+        Private method that multiplies this matrix array in place.
+
+        :type other: Union[MatrixArray, transformationmatrix.TransformationMatrix, numpy.ndarray]
+        :rtype: MatrixArray
+        """
+
+        self._array = numpy.matmul(self._array, asArray(other))
+        return self
+
+    def __repr__(self):
+        """
+        Private method that returns a string representation of this instance.
+
+        :rtype: str
+        """
+
+        return f'{self.__class__.__name__}({len(self)})'
+    # endregion
+
+    # region Properties
+    @property
+    def array(self):
+        """
+        Getter method that returns the internal Nx4x4 array.
+
+        :rtype: numpy.ndarray
+        """
+
+        return self._array
+    # endregion
+
+    # region Methods
+    @classmethod
+    def fromMatrices(cls, matrices):
+        """
+        Returns a matrix array from the supplied transformation matrices.
+
+        :type matrices: List[transformationmatrix.TransformationMatrix]
+        :rtype: MatrixArray
+        """
+
+        return cls(numpy.array([toArray(matrix) for matrix in matrices], dtype=numpy.float64).reshape(-1, 4, 4))
+
+    @classmethod
+    def fromTranslations(cls, points):
+        """
+        Returns a matrix array from the supplied Nx3 points.
+
+        :type points: Union[numpy.ndarray, List[vector.Vector]]
+        :rtype: MatrixArray
+        """
+
+        points = numpy.array(points, dtype=numpy.float64).reshape(-1, 3)
+
+        matrices = cls(points.shape[0])
+        matrices.array[:, 3, :3] = points
+
+        return matrices
+
+    def copy(self):
+        """
+        Returns a copy of this matrix array.
+
+        :rtype: MatrixArray
+        """
+
+        return MatrixArray(self._array.copy())
+
+    def toMatrices(self):
+        """
+        Returns a list of transformation matrices from this array.
+
+        :rtype: List[transformationmatrix.TransformationMatrix]
+        """
+
+        return list(iter(self))
+
+    def inverse(self):
+        """
+        Returns the inverse of every matrix in this array.
+
+        :rtype: MatrixArray
+        """
+
+        return MatrixArray(numpy.linalg.inv(self._array))
+
+    def translation(self):
+        """
+        Returns the Nx3 translation components from this array.
+
+        :rtype: numpy.ndarray
+        """
+
+        return self._array[:, 3, :3].copy()
+
+    def translationPart(self):
+        """
+        Returns a matrix array containing only the translation components.
+
+        :rtype: MatrixArray
+        """
+
+        return MatrixArray.fromTranslations(self.translation())
+
+    def axes(self, normalize=False):
+        """
+        Returns the Nx3 x-axis, y-axis, z-axis and position rows from this array.
+        Unlike a translate, rotate and scale decomposition, the axes keep any scale and shear.
+
+        :type normalize: bool
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        """
+
+        xAxis, yAxis, zAxis = (self._array[:, i, :3].copy() for i in range(3))
+        position = self.translation()
+
+        if normalize:
+
+            xAxis, yAxis, zAxis = normalizeVectors(xAxis), normalizeVectors(yAxis), normalizeVectors(zAxis)
+
+        return xAxis, yAxis, zAxis, position
+
+    def lookAt(self, forwardVector=(1.0, 0.0, 0.0), forwardAxis=0, forwardAxisSign=1.0, upVector=(0.0, 1.0, 0.0), upAxis=1, upAxisSign=1.0):
+        """
+        Orients every matrix towards the supplied forward vectors while preserving translation.
+        Both vectors can either be a single vector or an Nx3 array of vectors.
+
+        :type forwardVector: Union[vector.Vector, numpy.ndarray]
+        :type forwardAxis: int
+        :type forwardAxisSign: float
+        :type upVector: Union[vector.Vector, numpy.ndarray]
+        :type upAxis: int
+        :type upAxisSign: float
+        :rtype: MatrixArray
+        """
+
+        # Redundancy check
+        #
+        if forwardAxis == upAxis:
+
+            raise TypeError('lookAt() expects unique forward and up axes!')
+
+        # Normalize vectors
+        #
+        count = len(self)
+
+        forwardVectors = numpy.broadcast_to(asVectors(forwardVector), (count, 3))
+        upVectors = numpy.broadcast_to(asVectors(upVector), (count, 3))
+
+        forwardVectors = normalizeVectors(forwardVectors) * forwardAxisSign
+        upVectors = normalizeVectors(upVectors) * upAxisSign
+
+        # Orthogonalize axes based on handedness
+        #
+        remainingAxis = 3 - (forwardAxis + upAxis)
+        isCyclic = (forwardAxis + 1) % 3 == upAxis
+
+        if isCyclic:
+
+            remainingVectors = normalizeVectors(numpy.cross(forwardVectors, upVectors))
+            upVectors = normalizeVectors(numpy.cross(remainingVectors, forwardVectors))
+
+        else:
+
+            remainingVectors = normalizeVectors(numpy.cross(upVectors, forwardVectors))
+            upVectors = normalizeVectors(numpy.cross(forwardVectors, remainingVectors))
+
+        # Update rotation rows
+        #
+        self._array[:, forwardAxis, :3] = forwardVectors
+        self._array[:, upAxis, :3] = upVectors
+        self._array[:, remainingAxis, :3] = remainingVectors
+        self._array[:, :3, 3] = 0.0
+
+        return self
+    # endregion
+
+
+def indexArray(matrix):
+    """
+    Returns a 4x4 array from the supplied transformation matrix by indexing each element.
+    This is the slowest conversion but only relies on `__getitem__`.
+
+    :type matrix: transformationmatrix.TransformationMatrix
+    :rtype: numpy.ndarray
+    """
+
+    return numpy.array([[matrix[row][column] for column in range(4)] for row in range(4)], dtype=numpy.float64)
+
+
+def sequenceArray(matrix):
+    """
+    Returns a 4x4 array from the supplied transformation matrix using the array or sequence protocol.
+
+    :type matrix: transformationmatrix.TransformationMatrix
+    :rtype: numpy.ndarray
+    """
+
+    return numpy.array(matrix, dtype=numpy.float64)
+
+
+def listArray(matrix):
+    """
+    Returns a 4x4 array from the supplied transformation matrix's nested list.
+
+    :type matrix: transformationmatrix.TransformationMatrix
+    :rtype: numpy.ndarray
+    """
+
+    return numpy.array(matrix.toList(), dtype=numpy.float64)
+
+
+def getConverter(matrix):
+    """
+    Returns the fastest function that converts the supplied matrix's type into a 4x4 array.
+    Each candidate must reproduce the indexed elements, since rows that drop their last column cannot be converted in bulk.
+    Converters are cached per type so this check only runs once.
+
+    :type matrix: transformationmatrix.TransformationMatrix
+    :rtype: Callable
+    """
+
+    cls = type(matrix)
+    converter = __converters__.get(cls, None)
+
+    if converter is not None:
+
+        return converter
+
+    # Find first converter that matches the indexed elements
+    #
+    expected = indexArray(matrix)
+    converter = indexArray
+
+    for candidate in (sequenceArray, listArray):
+
+        try:
+
+            array = candidate(matrix)
+
+        except (AttributeError, TypeError, ValueError):
+
+            continue
+
+        if array.shape == (4, 4) and numpy.array_equal(array, expected):
+
+            converter = candidate
+            break
+
+    __converters__[cls] = converter
+    return converter
+
+
+def toArray(matrix):
+    """
+    Returns a 4x4 array from the supplied transformation matrix.
+
+    :type matrix: transformationmatrix.TransformationMatrix
+    :rtype: numpy.ndarray
+    """
+
+    if isinstance(matrix, numpy.ndarray):
+
+        return numpy.array(matrix, dtype=numpy.float64).reshape(4, 4)
+
+    else:
+
+        return getConverter(matrix)(matrix)
+
+
+def toMatrix(array):
+    """
+    Returns a transformation matrix from the supplied 4x4 array.
+
+    :type array: numpy.ndarray
+    :rtype: transformationmatrix.TransformationMatrix
+    """
+
+    row1, row2, row3, row4 = numpy.asarray(array, dtype=numpy.float64).reshape(4, 4).tolist()
+    return transformationmatrix.TransformationMatrix(row1=row1, row2=row2, row3=row3, row4=row4)
+
+
+def toVector(array):
+    """
+    Returns a vector from the supplied 3D array.
+
+    :type array: numpy.ndarray
+    :rtype: vector.Vector
+    """
+
+    x, y, z = numpy.asarray(array, dtype=numpy.float64).reshape(3).tolist()
+    return vector.Vector(x, y, z)
+
+
+def asArray(matrices):
+    """
+    Returns the supplied matrices as an array suitable for batched multiplication.
+
+    :type matrices: Union[MatrixArray, transformationmatrix.TransformationMatrix, numpy.ndarray]
+    :rtype: numpy.ndarray
+    """
+
+    if isinstance(matrices, MatrixArray):
+
+        return matrices.array
+
+    elif isinstance(matrices, numpy.ndarray):
+
+        return matrices
+
+    else:
+
+        return toArray(matrices)
+
+
+def asVectors(vectors):
+    """
+    Returns the supplied vectors as an Nx3 array.
+
+    :type vectors: Union[vector.Vector, List[vector.Vector], numpy.ndarray]
+    :rtype: numpy.ndarray
+    """
+
+    if isinstance(vectors, vector.Vector):
+
+        return numpy.array([vectors.toList()], dtype=numpy.float64)
+
+    elif isinstance(vectors, numpy.ndarray):
+
+        return vectors.reshape(-1, 3).astype(numpy.float64, copy=False)
+
+    else:
+
+        return numpy.array([x.toList() if isinstance(x, vector.Vector) else x for x in vectors], dtype=numpy.float64).reshape(-1, 3)
+
+
+def normalizeVectors(vectors):
+    """
+    Returns a normalized copy of the supplied Nx3 vectors.
+    Zero length vectors are left untouched.
+
+    :type vectors: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    lengths = numpy.linalg.norm(vectors, axis=-1, keepdims=True)
+    lengths[lengths == 0.0] = 1.0
+
+    return vectors / lengths
@@ -0,0 +1,301 @@
+import numpy
+
+from dcc.dataclasses import vector, transformationmatrix
+from . import matrixarray, querycache, writequeue, hierarchyutils, meshutils, meshbvh, fnpool, profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+def isValidAxes(forwardAxis, upAxis):
+    """
+    Evaluates if the supplied axes can be used to compose a matrix.
+
+    :type forwardAxis: int
+    :type upAxis: int
+    :rtype: bool
+    """
+
+    return (0 <= forwardAxis < 3) and (0 <= upAxis < 3) and forwardAxis != upAxis
+
+
+def composeMatrix(origin, forwardVector, upVector, forwardAxis=0, upAxis=1):
+    """
+    Returns a transformation matrix from the supplied origin, forward and up vectors.
+
+    :type origin: vector.Vector
+    :type forwardVector: vector.Vector
+    :type upVector: vector.Vector
+    :type forwardAxis: int
+    :type upAxis: int
+    :rtype: transformationmatrix.TransformationMatrix
+    """
+
+    matrices = matrixarray.MatrixArray.fromTranslations(matrixarray.asVectors(origin))
+    matrices.lookAt(
+        forwardVector=matrixarray.asVectors(forwardVector), forwardAxis=forwardAxis,
+        upVector=matrixarray.asVectors(upVector), upAxis=upAxis
+    )
+
+    return matrices[0]
+
+
+def getAxisVector(node, axis=0, cache=None):
+    """
+    Returns the normalized axis vector from the supplied node.
+
+    :type node: Any
+    :type axis: int
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: vector.Vector
+    """
+
+    cache = querycache.QueryCache() if cache is None else cache
+
+    with fnpool.borrow('FnTransform', node) as (fnTransform,):
+
+        worldMatrix = cache.worldMatrix(fnTransform)
+        row = worldMatrix[axis]
+
+    return vector.Vector(row[0], row[1], row[2]).normalize()
+
+
+def getCenterPosition(nodes, cache=None):
+    """
+    Returns the center position of the supplied nodes.
+    Support for shapes is currently limited to meshes at this time.
+
+    :type nodes: List[Any]
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: vector.Vector
+    """
+
+    # Iterate through nodes and expand bounds
+    #
+    cache = querycache.QueryCache() if cache is None else cache
+
+    pool = fnpool.getPool()
+
+    node = pool.acquire('FnNode')
+    transform = pool.acquire('FnTransform')
+    mesh = pool.acquire('FnMesh')
+
+    minPoint = numpy.full(3, numpy.inf)
+    maxPoint = numpy.full(3, -numpy.inf)
+
+    try:
+
+        for obj in nodes:
+
+            # Check if node is a mesh component
+            #
+            node.setObject(obj)
+
+            if node.isMesh():
+
+                mesh.setObject(obj)
+
+                with profiler.phase('readVertices'):
+
+                    points = meshutils.getVertexPoints(mesh, worldSpace=True)
+
+                if len(points) == 0:
+
+                    continue
+
+                numpy.minimum(minPoint, points.min(axis=0), out=minPoint)
+                numpy.maximum(maxPoint, points.max(axis=0), out=maxPoint)
+
+            elif node.isTransform():
+
+                transform.setObject(obj)
+                translation = numpy.array(cache.translation(transform, worldSpace=True).toList(), dtype=numpy.float64)
+
+                numpy.minimum(minPoint, translation, out=minPoint)
+                numpy.maximum(maxPoint, translation, out=maxPoint)
+
+            else:
+
+                continue
+
+    finally:
+
+        pool.release(node, transform, mesh)
+
+    # Check if any points were found
+    #
+    if not numpy.isfinite(minPoint).all():
+
+        return vector.Vector(0.0, 0.0, 0.0)
+
+    return vector.Vector(*((minPoint + maxPoint) * 0.5))
+
+
+def getAveragedNormal(mesh, weighting=meshutils.NormalWeighting.VERTEX, componentType=None):
+    """
+    Returns the averaged normal from the selected components on the supplied mesh.
+    If the supplied node is not a mesh then the x-axis is returned instead.
+
+    :type mesh: Any
+    :type weighting: meshutils.NormalWeighting
+    :type componentType: Union[meshutils.ComponentType, None]
+    :rtype: vector.Vector
+    """
+
+    with fnpool.borrow('FnMesh', mesh) as (fnMesh,):
+
+        if not fnMesh.isValid():
+
+            return vector.Vector(1.0, 0.0, 0.0)
+
+        return meshutils.getAveragedNormal(fnMesh, weighting=weighting, componentType=componentType, worldSpace=True)
+
+
+def getSurfacePoint(nodes, point, direction=None, cache=None):
+    """
+    Returns the closest surface position and normal on the supplied meshes.
+    If a direction is supplied then the nearest ray intersection from the point is returned instead.
+    Queries are evaluated in object-space against each mesh's cached hierarchy, so closest points are only exact for uniformly scaled meshes.
+
+    :type nodes: List[Any]
+    :type point: vector.Vector
+    :type direction: Union[vector.Vector, None]
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: Union[Tuple[vector.Vector, vector.Vector], None]
+    """
+
+    cache = querycache.QueryCache() if cache is None else cache
+
+    origin = matrixarray.asVectors(point)[0]
+    direction = matrixarray.asVectors(direction)[0] if direction is not None else None
+
+    closest, closestDistance = None, numpy.inf
+
+    with fnpool.borrow('FnMesh', *nodes) as fnMeshes, fnpool.borrow('FnTransform', *nodes) as fnTransforms:
+
+        for (fnMesh, fnTransform) in zip(fnMeshes, fnTransforms):
+
+            # Check if node is a mesh
+            #
+            if not (fnMesh.isValid() and fnTransform.isValid()):
+
+                continue
+
+            bvh = meshbvh.getMeshBVH(fnMesh)
+
+            # Query hierarchy in object-space
+            #
+            worldMatrix = matrixarray.toArray(cache.worldMatrix(fnTransform))
+            inverseMatrix = numpy.linalg.inv(worldMatrix)
+
+            localOrigin = (origin @ inverseMatrix[:3, :3]) + inverseMatrix[3, :3]
+
+            with profiler.phase('query'):
+
+                if direction is None:
+
+                    result = bvh.closestPoint(localOrigin)
+
+                else:
+
+                    result = bvh.raycast(localOrigin, direction @ inverseMatrix[:3, :3])
+
+            if result is None:
+
+                continue
+
+            # Convert result back to world-space
+            #
+            localPoint, localNormal = result[0], result[1]
+
+            worldPoint = (localPoint @ worldMatrix[:3, :3]) + worldMatrix[3, :3]
+            worldNormal = matrixarray.normalizeVectors(localNormal @ inverseMatrix[:3, :3].T)
+            distance = numpy.linalg.norm(worldPoint - origin)
+
+            if distance < closestDistance:
+
+                closest, closestDistance = (vector.Vector(*worldPoint), vector.Vector(*worldNormal)), distance
+
+    return closest
+
+
+def applyMatrix(nodes, worldMatrix, maintainOffset=False, preserveChildren=False, freezeTransform=False, cache=None):
+    """
+    Applies the supplied world matrix to the specified nodes.
+    If maintain offset is enabled then each node keeps its offset from the first node, which lands on the supplied matrix.
+    Nodes nested under other supplied nodes are composed against their ancestor's new world matrix.
+    Scale is always skipped to avoid zeroing out the nodes!
+    Rotations are written using the euler solution closest to each node's current channels, so they never flip at 180 degrees.
+
+    :type nodes: List[Any]
+    :type worldMatrix: transformationmatrix.TransformationMatrix
+    :type maintainOffset: bool
+    :type preserveChildren: bool
+    :type freezeTransform: bool
+    :type cache: Union[querycache.QueryCache, None]
+    :rtype: None
+    """
+
+    # Attach nodes to function sets
+    #
+    with fnpool.borrow('FnTransform', *nodes) as fnTransforms:
+
+        if not all(fnTransform.isValid() for fnTransform in fnTransforms):
+
+            raise TypeError('applyMatrix() expects a transform node!')
+
+        # Evaluate selected hierarchy
+        #
+        cache = querycache.QueryCache() if cache is None else cache
+        nodeCount = len(fnTransforms)
+        profiler.count('nodes', nodeCount)
+
+        with profiler.phase('hierarchy'):
+
+            parents, ancestors = hierarchyutils.getSelectedHierarchy(fnTransforms)
+            nested = [index for index in range(nodeCount) if len(ancestors[index]) > 0 and (not preserveChildren or parents[index] != -1)]
+
+        # Read matrices in one pass
+        # World matrices are only required for offsets and nested ancestors!
+        #
+        with profiler.phase('readMatrices'):
+
+            parentInverseArray = matrixarray.MatrixArray.fromMatrices([cache.parentInverseMatrix(fnTransform) for fnTransform in fnTransforms]).array.copy()
+
+            worldIndices = range(nodeCount) if maintainOffset else sorted({ancestors[index][0] for index in nested})
+            worldArray = numpy.empty((nodeCount, 4, 4), dtype=numpy.float64)
+
+            if len(worldIndices) > 0:
+
+                worldArray[worldIndices] = matrixarray.MatrixArray.fromMatrices([cache.worldMatrix(fnTransforms[index]) for index in worldIndices]).array
+
+        # Compose target matrices
+        #
+        with profiler.phase('math'):
+
+            matrix = matrixarray.toArray(worldMatrix)
+
+            if maintainOffset:
+
+                targetArray = (worldArray @ numpy.linalg.inv(worldArray[0])) @ matrix
+
+            else:
+
+                targetArray = numpy.broadcast_to(matrix, (nodeCount, 4, 4))
+
+            # Move nested parent spaces along with their ancestors
+            #
+            if len(nested) > 0:
+
+                nearest = [ancestors[index][0] for index in nested]
+                parentInverseArray[nested] = numpy.linalg.inv(targetArray[nearest]) @ worldArray[nearest] @ parentInverseArray[nested]
+
+            matrices = matrixarray.MatrixArray(targetArray @ parentInverseArray)
+
+        # Write matrices to nodes
+        #
+        queue = writequeue.WriteQueue(cache=cache, unwrapEulers=True)
+        queue.pushMany(fnTransforms, matrices, depths=list(map(len, ancestors)), preserveChildren=preserveChildren, freezeTransform=freezeTransform, skipScale=True)
+        queue.flush()
@@ -0,0 +1,532 @@
+import heapq
+import numpy
+
+from collections import OrderedDict
+from . import meshutils, profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+__cache__ = OrderedDict()
+__cache_size__ = 8
+
+
+class MeshBVH(object):
+    """
+    Bounding volume hierarchy used to query the closest point, closest normal and ray intersections on a triangle mesh.
+    Triangles are sorted along a morton curve and grouped into fixed size leaves.
+    The tree is stored as an implicit binary tree with one bounds array per level, so the hierarchy is built without any python recursion.
+    """
+
+    # region Dunderscores
+    __slots__ = ('_triangles', '_faceIndices', '_normals', '_leafSize', '_levels')
+    __batch_size__ = 32
+
+    def __init__(self, points, triangles, faceIndices=None, leafSize=8):
+        """
+        Private method called after a new instance has been created.
+
+        :type points: numpy.ndarray
+        :type triangles: numpy.ndarray
+        :type faceIndices: Union[numpy.ndarray, None]
+        :type leafSize: int
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(MeshBVH, self).__init__()
+
+        # Declare private variables
+        #
+        points = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 3)
+        triangles = numpy.asarray(triangles, dtype=numpy.int64).reshape(-1, 3)
+        faceIndices = numpy.arange(len(triangles)) if faceIndices is None else numpy.asarray(faceIndices, dtype=numpy.int64)
+
+        self._leafSize = max(int(leafSize), 1)
+        self._triangles = numpy.zeros((0, 3, 3), dtype=numpy.float64)
+        self._faceIndices = numpy.zeros(0, dtype=numpy.int64)
+        self._normals = numpy.zeros((0, 3), dtype=numpy.float64)
+        self._levels = []
+
+        # Build hierarchy
+        #
+        self.build(points[triangles], faceIndices)
+
+    def __len__(self):
+        """
+        Private method that evaluates the number of triangles inside this hierarchy.
+
+        :rtype: int
+        """
+
+        return len(self._triangles)
+    # endregion
+
+    # region Properties
+    @property
+    def leafSize(self):
+        """
+        Getter method that returns the maximum number of triangles per leaf.
+
+        :rtype: int
+        """
+
+        return self._leafSize
+
+    @property
+    def depth(self):
+        """
+        Getter method that returns the number of levels below the root.
+
+        :rtype: int
+        """
+
+        return max(len(self._levels) - 1, 0)
+    # endregion
+
+    # region Methods
+    @staticmethod
+    def mortonCodes(centroids):
+        """
+        Returns the 30-bit morton codes for the supplied centroids.
+
+        :type centroids: numpy.ndarray
+        :rtype: numpy.ndarray
+        """
+
+        minPoint, maxPoint = centroids.min(axis=0), centroids.max(axis=0)
+        extents = numpy.maximum(maxPoint - minPoint, 1e-12)
+
+        cells = numpy.clip(((centroids - minPoint) / extents) * 1023.0, 0.0, 1023.0).astype(numpy.uint64)
+
+        cells = (cells | (cells << numpy.uint64(16))) & numpy.uint64(0x030000FF)
+        cells = (cells | (cells << numpy.uint64(8))) & numpy.uint64(0x0300F00F)
+        cells = (cells | (cells << numpy.uint64(4))) & numpy.uint64(0x030C30C3)
+        cells = (cells | (cells << numpy.uint64(2))) & numpy.uint64(0x09249249)
+
+        return (cells[:, 0] << numpy.uint64(2)) | (cells[:, 1] << numpy.uint64(1)) | cells[:, 2]
+
+    def build(self, trianglePoints, faceIndices):
+        """
+        Builds the hierarchy from the supplied Mx3x3 triangle points.
+
+        :type trianglePoints: numpy.ndarray
+        :type faceIndices: numpy.ndarray
+        :rtype: None
+        """
+
+        numTriangles = len(trianglePoints)
+
+        if numTriangles == 0:
+
+            self._levels = []
+            return
+
+        # Sort triangles along morton curve
+        #
+        minPoints, maxPoints = trianglePoints.min(axis=1), trianglePoints.max(axis=1)
+        order = numpy.argsort(self.mortonCodes((minPoints + maxPoints) * 0.5), kind='stable')
+
+        self._triangles = numpy.ascontiguousarray(trianglePoints[order])
+        self._faceIndices = faceIndices[order]
+
+        crossProducts = numpy.cross(self._triangles[:, 1] - self._triangles[:, 0], self._triangles[:, 2] - self._triangles[:, 0])
+        lengths = numpy.linalg.norm(crossProducts, axis=1)
+
+        self._normals = numpy.zeros_like(crossProducts)
+        numpy.divide(crossProducts, lengths[:, None], out=self._normals, where=lengths[:, None] > 0.0)
+
+        # Reduce leaf bounds
+        # Leaves are padded to a power of two so every node has exactly two children!
+        #
+        numLeaves = -(-numTriangles // self._leafSize)
+        numPadded = 1 << int(numpy.ceil(numpy.log2(numLeaves))) if numLeaves > 1 else 1
+        starts = numpy.arange(numLeaves) * self._leafSize
+
+        leafMin = numpy.full((numPadded, 3), numpy.inf)
+        leafMax = numpy.full((numPadded, 3), -numpy.inf)
+        leafMin[:numLeaves] = numpy.minimum.reduceat(minPoints[order], starts, axis=0)
+        leafMax[:numLeaves] = numpy.maximum.reduceat(maxPoints[order], starts, axis=0)
+
+        # Reduce parent bounds level by level
+        #
+        levels = [(leafMin, leafMax)]
+
+        while len(levels[0][0]) > 1:
+
+            childMin, childMax = levels[0]
+            levels.insert(0, (numpy.minimum(childMin[0::2], childMin[1::2]), numpy.maximum(childMax[0::2], childMax[1::2])))
+
+        self._levels = levels
+
+    def leafTriangles(self, leaves):
+        """
+        Returns the triangle indices for the specified leaves.
+
+        :type leaves: List[int]
+        :rtype: numpy.ndarray
+        """
+
+        indices = ((numpy.asarray(leaves, dtype=numpy.int64) * self._leafSize)[:, None] + numpy.arange(self._leafSize)).ravel()
+        return indices[indices < len(self._triangles)]
+
+    def popLeaves(self, heap, leaf, level, threshold):
+        """
+        Pops any queued leaves below the supplied threshold so they can be tested in a single batch.
+
+        :type heap: List[Tuple[float, int, int]]
+        :type leaf: int
+        :type level: int
+        :type threshold: float
+        :rtype: numpy.ndarray
+        """
+
+        leaves = [leaf]
+
+        while len(heap) > 0 and len(leaves) < self.__batch_size__ and heap[0][1] == level and heap[0][0] < threshold:
+
+            leaves.append(heapq.heappop(heap)[2])
+
+        return self.leafTriangles(leaves)
+
+    def closestPoint(self, point):
+        """
+        Returns the closest point, triangle normal, face index and distance to the supplied point.
+        If the hierarchy is empty then none is returned instead!
+
+        :type point: numpy.ndarray
+        :rtype: Union[Tuple[numpy.ndarray, numpy.ndarray, int, float], None]
+        """
+
+        if len(self._levels) == 0:
+
+            return None
+
+        point = numpy.asarray(point, dtype=numpy.float64)
+
+        bestDistance = numpy.inf
+        bestPoint, bestIndex = None, -1
+
+        # Visit nodes in order of their distance to the point
+        #
+        depth = self.depth
+        heap = [(0.0, 0, 0)]
+
+        while len(heap) > 0:
+
+            distance, level, index = heapq.heappop(heap)
+
+            if distance >= bestDistance:
+
+                break
+
+            if level == depth:
+
+                indices = self.popLeaves(heap, index, level, bestDistance)
+                points, distances = closestPointsOnTriangles(point, self._triangles[indices])
+
+                closest = int(numpy.argmin(distances))
+
+                if distances[closest] < bestDistance:
+
+                    bestDistance = float(distances[closest])
+                    bestPoint, bestIndex = points[closest], int(indices[closest])
+
+                continue
+
+            childMin, childMax = self._levels[level + 1]
+            children = slice(index * 2, index * 2 + 2)
+
+            offsets = numpy.maximum(numpy.maximum(childMin[children] - point, point - childMax[children]), 0.0)
+            distances = numpy.einsum('ij,ij->i', offsets, offsets)
+
+            for (child, childDistance) in enumerate(distances.tolist(), start=index * 2):
+
+                if childDistance < bestDistance:
+
+                    heapq.heappush(heap, (childDistance, level + 1, child))
+
+        return bestPoint, self._normals[bestIndex], int(self._faceIndices[bestIndex]), float(numpy.sqrt(bestDistance))
+
+    def closestNormal(self, point):
+        """
+        Returns the normal of the triangle closest to the supplied point.
+        If the hierarchy is empty then none is returned instead!
+
+        :type point: numpy.ndarray
+        :rtype: Union[numpy.ndarray, None]
+        """
+
+        result = self.closestPoint(point)
+        return result[1] if result is not None else None
+
+    def raycast(self, origin, direction, maxDistance=numpy.inf):
+        """
+        Returns the nearest intersection point, triangle normal, face index and distance along the supplied ray.
+        If the ray does not intersect the mesh then none is returned instead!
+
+        :type origin: numpy.ndarray
+        :type direction: numpy.ndarray
+        :type maxDistance: float
+        :rtype: Union[Tuple[numpy.ndarray, numpy.ndarray, int, float], None]
+        """
+
+        if len(self._levels) == 0:
+
+            return None
+
+        origin = numpy.asarray(origin, dtype=numpy.float64)
+        direction = numpy.asarray(direction, dtype=numpy.float64)
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+
+            inverseDirection = 1.0 / direction
+
+        bestDistance = float(maxDistance)
+        bestIndex = -1
+
+        # Visit nodes in order of their entry distance along the ray
+        #
+        depth = self.depth
+        heap = [(0.0, 0, 0)]
+
+        while len(heap) > 0:
+
+            distance, level, index = heapq.heappop(heap)
+
+            if distance > bestDistance:
+
+                break
+
+            if level == depth:
+
+                indices = self.popLeaves(heap, index, level, bestDistance)
+                distances = intersectTriangles(origin, direction, self._triangles[indices])
+
+                closest = int(numpy.argmin(distances))
+
+                if distances[closest] < bestDistance:
+
+                    bestDistance, bestIndex = float(distances[closest]), int(indices[closest])
+
+                continue
+
+            childMin, childMax = self._levels[level + 1]
+            children = slice(index * 2, index * 2 + 2)
+
+            entries, exits = intersectBoxes(origin, inverseDirection, childMin[children], childMax[children])
+
+            for (child, (entry, exit)) in enumerate(zip(entries.tolist(), exits.tolist()), start=index * 2):
+
+                if entry <= exit and exit >= 0.0 and entry <= bestDistance:
+
+                    heapq.heappush(heap, (max(entry, 0.0), level + 1, child))
+
+        if bestIndex < 0:
+
+            return None
+
+        return origin + (direction * bestDistance), self._normals[bestIndex], int(self._faceIndices[bestIndex]), bestDistance
+    # endregion
+
+
+def closestPointsOnTriangles(point, triangles):
+    """
+    Returns the closest points on the supplied Mx3x3 triangles along with their squared distances.
+
+    :type point: numpy.ndarray
+    :type triangles: numpy.ndarray
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+
+    # Evaluate barycentric coordinates of the point projected onto the triangle planes
+    #
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    edge1, edge2, offsets = b - a, c - a, point - a
+
+    d00 = numpy.einsum('ij,ij->i', edge1, edge1)
+    d01 = numpy.einsum('ij,ij->i', edge1, edge2)
+    d11 = numpy.einsum('ij,ij->i', edge2, edge2)
+    d20 = numpy.einsum('ij,ij->i', offsets, edge1)
+    d21 = numpy.einsum('ij,ij->i', offsets, edge2)
+    denominators = (d00 * d11) - (d01 * d01)
+
+    valid = denominators > 1e-24
+    u, v = numpy.zeros(len(triangles)), numpy.zeros(len(triangles))
+    numpy.divide((d11 * d20) - (d01 * d21), denominators, out=u, where=valid)
+    numpy.divide((d00 * d21) - (d01 * d20), denominators, out=v, where=valid)
+
+    # Check if projections are inside their triangles
+    #
+    inside = valid & (u >= 0.0) & (v >= 0.0) & ((u + v) <= 1.0)
+    projections = a + (u[:, None] * edge1) + (v[:, None] * edge2)
+
+    candidates = [numpy.where(inside[:, None], projections, numpy.inf)]
+
+    # Evaluate closest points along edges
+    #
+    for (start, end) in ((a, b), (b, c), (c, a)):
+
+        edges = end - start
+        edgeLengths = numpy.einsum('ij,ij->i', edges, edges)
+
+        parameters = numpy.zeros(len(triangles))
+        numpy.divide(numpy.einsum('ij,ij->i', point - start, edges), edgeLengths, out=parameters, where=edgeLengths > 0.0)
+
+        candidates.append(start + (numpy.clip(parameters, 0.0, 1.0)[:, None] * edges))
+
+    # Pick the nearest candidate per triangle
+    #
+    candidates = numpy.stack(candidates, axis=1)
+    offsets = candidates - point
+
+    with numpy.errstate(invalid='ignore'):
+
+        distances = numpy.einsum('ijk,ijk->ij', offsets, offsets)
+
+    distances[~numpy.isfinite(distances)] = numpy.inf
+    nearest = numpy.argmin(distances, axis=1)
+    rows = numpy.arange(len(triangles))
+
+    return candidates[rows, nearest], distances[rows, nearest]
+
+
+def cross(a, b):
+    """
+    Returns the row-wise cross products of the supplied arrays.
+    Components are evaluated explicitly since `numpy.cross` carries a large overhead on small arrays.
+
+    :type a: numpy.ndarray
+    :type b: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    a, b = numpy.broadcast_arrays(a, b)
+
+    return numpy.stack(
+        [
+            (a[..., 1] * b[..., 2]) - (a[..., 2] * b[..., 1]),
+            (a[..., 2] * b[..., 0]) - (a[..., 0] * b[..., 2]),
+            (a[..., 0] * b[..., 1]) - (a[..., 1] * b[..., 0])
+        ],
+        axis=-1
+    )
+
+
+def intersectTriangles(origin, direction, triangles):
+    """
+    Returns the distances along the supplied ray to each of the Mx3x3 triangles.
+    Triangles that are missed return infinity.
+
+    :type origin: numpy.ndarray
+    :type direction: numpy.ndarray
+    :type triangles: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    a = triangles[:, 0]
+    edge1, edge2 = triangles[:, 1] - a, triangles[:, 2] - a
+
+    p = cross(direction, edge2)
+    determinants = numpy.einsum('ij,ij->i', edge1, p)
+    valid = numpy.abs(determinants) > 1e-12
+
+    inverseDeterminants = numpy.zeros(len(triangles))
+    numpy.divide(1.0, determinants, out=inverseDeterminants, where=valid)
+
+    t = origin - a
+    u = numpy.einsum('ij,ij->i', t, p) * inverseDeterminants
+
+    q = cross(t, edge1)
+    v = (q @ direction) * inverseDeterminants
+    distances = numpy.einsum('ij,ij->i', edge2, q) * inverseDeterminants
+
+    hit = valid & (u >= 0.0) & (v >= 0.0) & ((u + v) <= 1.0) & (distances >= 0.0)
+
+    return numpy.where(hit, distances, numpy.inf)
+
+
+def intersectBoxes(origin, inverseDirection, minPoints, maxPoints):
+    """
+    Returns the entry and exit distances along the supplied ray for each of the Nx3 boxes.
+    Empty boxes, and boxes missed by axis-parallel rays, return an entry greater than their exit.
+
+    :type origin: numpy.ndarray
+    :type inverseDirection: numpy.ndarray
+    :type minPoints: numpy.ndarray
+    :type maxPoints: numpy.ndarray
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+
+    with numpy.errstate(invalid='ignore'):
+
+        near = (minPoints - origin) * inverseDirection
+        far = (maxPoints - origin) * inverseDirection
+
+    near, far = numpy.fmin(near, far), numpy.fmax(near, far)
+    entries, exits = numpy.nanmax(near, axis=1), numpy.nanmin(far, axis=1)
+
+    misses = (minPoints > maxPoints).any(axis=1) | ~numpy.isfinite(entries)
+    entries[misses], exits[misses] = numpy.inf, -numpy.inf
+
+    return entries, exits
+
+
+def getMeshBVH(mesh):
+    """
+    Returns the object-space hierarchy for the supplied mesh.
+    Hierarchies are cached by `meshutils.getMeshKey`, so the points and topology are only read when the hierarchy is rebuilt.
+
+    :type mesh: fnmesh.FnMesh
+    :rtype: MeshBVH
+    """
+
+    # Check if hierarchy has already been built
+    #
+    key = meshutils.getMeshKey(mesh)
+    bvh = __cache__.get(key, None)
+
+    if bvh is not None:
+
+        __cache__.move_to_end(key)
+        return bvh
+
+    # Read point buffer and topology
+    #
+    with profiler.phase('readVertices'):
+
+        points = meshutils.getVertexPoints(mesh, numpy.arange(key[1]), worldSpace=False)
+
+    with profiler.phase('readTopology'):
+
+        topology = meshutils.getTopology(mesh)
+
+    # Build hierarchy and evict the least recently used
+    #
+    with profiler.phase('buildBVH'):
+
+        triangles, faceIndices = meshutils.triangulate(topology.faceVertexCounts, topology.faceVertexIndices)
+        bvh = MeshBVH(points, triangles, faceIndices=faceIndices)
+
+    __cache__[key] = bvh
+
+    while len(__cache__) > __cache_size__:
+
+        __cache__.popitem(last=False)
+
+    log.debug(f'Built hierarchy for {len(bvh)} triangle(s).')
+    return bvh
+
+
+def clearCache():
+    """
+    Discards all cached hierarchies.
+
+    :rtype: None
+    """
+
+    __cache__.clear()
@@ -0,0 +1,711 @@
+import numpy
+
+from enum import IntEnum
+from itertools import chain, permutations
+from collections import OrderedDict
+from dataclasses import dataclass
+from dcc.dataclasses import vector
+from . import profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+class NormalWeighting(IntEnum):
+    """
+    Enum class of all available normal weighting schemes.
+    """
+
+    UNIFORM = 0
+    AREA = 1
+    ANGLE = 2
+    VERTEX = 3
+
+
+class ComponentType(IntEnum):
+    """
+    Enum class of all available mesh component types.
+    """
+
+    VERTEX = 0
+    EDGE = 1
+    FACE = 2
+
+
+@dataclass
+class MeshTopology(object):
+    """
+    Data class that stores the face-vertex indices of a mesh along with the faces connected to each vertex.
+    """
+
+    faceVertexCounts: numpy.ndarray
+    faceVertexIndices: numpy.ndarray
+    faceOffsets: numpy.ndarray
+    vertexFaceOffsets: numpy.ndarray
+    vertexFaces: numpy.ndarray
+
+    @classmethod
+    def create(cls, faceVertexCounts, faceVertexIndices, numVertices=0):
+        """
+        Returns a new topology from the supplied face-vertex counts and flattened face-vertex indices.
+
+        :type faceVertexCounts: numpy.ndarray
+        :type faceVertexIndices: numpy.ndarray
+        :type numVertices: int
+        :rtype: MeshTopology
+        """
+
+        faceVertexCounts = numpy.asarray(faceVertexCounts, dtype=numpy.int64)
+        faceVertexIndices = numpy.asarray(faceVertexIndices, dtype=numpy.int64)
+
+        faceOffsets = numpy.concatenate([[0], numpy.cumsum(faceVertexCounts)]).astype(numpy.int64)
+        faceIndices = numpy.repeat(numpy.arange(len(faceVertexCounts)), faceVertexCounts)
+
+        vertexCounts = numpy.bincount(faceVertexIndices, minlength=numVertices)
+        vertexFaceOffsets = numpy.concatenate([[0], numpy.cumsum(vertexCounts)]).astype(numpy.int64)
+        vertexFaces = faceIndices[numpy.argsort(faceVertexIndices, kind='stable')]
+
+        return cls(
+            faceVertexCounts=faceVertexCounts,
+            faceVertexIndices=faceVertexIndices,
+            faceOffsets=faceOffsets,
+            vertexFaceOffsets=vertexFaceOffsets,
+            vertexFaces=vertexFaces
+        )
+
+    def getConnectedFaces(self, vertexIndices):
+        """
+        Returns the sorted indices of every face connected to the supplied vertices.
+
+        :type vertexIndices: numpy.ndarray
+        :rtype: numpy.ndarray
+        """
+
+        vertexIndices = numpy.asarray(vertexIndices, dtype=numpy.int64).ravel()
+        vertexIndices = vertexIndices[vertexIndices < len(self.vertexFaceOffsets) - 1]
+
+        starts, ends = self.vertexFaceOffsets[vertexIndices], self.vertexFaceOffsets[vertexIndices + 1]
+        counts = ends - starts
+
+        positions = numpy.repeat(starts - (numpy.cumsum(counts) - counts), counts) + numpy.arange(counts.sum())
+
+        return numpy.unique(self.vertexFaces[positions])
+
+    def getFaces(self, faceIndices):
+        """
+        Returns the face-vertex counts and flattened face-vertex indices for the supplied faces.
+
+        :type faceIndices: numpy.ndarray
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+
+        faceIndices = numpy.asarray(faceIndices, dtype=numpy.int64).ravel()
+
+        faceVertexCounts = self.faceVertexCounts[faceIndices]
+        starts = self.faceOffsets[faceIndices]
+
+        positions = numpy.repeat(starts - (numpy.cumsum(faceVertexCounts) - faceVertexCounts), faceVertexCounts) + numpy.arange(faceVertexCounts.sum())
+
+        return faceVertexCounts, self.faceVertexIndices[positions]
+
+
+__chunk_size__ = 65536
+__bounds_cache__ = OrderedDict()
+__bounds_cache_size__ = 64
+__topology_cache__ = OrderedDict()
+__topology_cache_size__ = 8
+__probe_size__ = 16
+__selected_components__ = {
+    ComponentType.FACE: 'selectedFaces',
+    ComponentType.EDGE: 'selectedEdges',
+    ComponentType.VERTEX: 'selectedVertices'
+}
+
+
+def getSelectedComponents(mesh, componentType=None):
+    """
+    Returns the selected component indices from the supplied mesh.
+    If no component type is supplied then the first selected type is used in order of faces, edges and vertices.
+
+    :type mesh: fnmesh.FnMesh
+    :type componentType: Union[ComponentType, None]
+    :rtype: Tuple[ComponentType, numpy.ndarray]
+    """
+
+    componentTypes = list(__selected_components__.keys()) if componentType is None else [ComponentType(componentType)]
+
+    for componentType in componentTypes:
+
+        # Check if function set supports component type
+        #
+        func = getattr(mesh, __selected_components__[componentType], None)
+
+        if not callable(func):
+
+            continue
+
+        # Check if any components are selected
+        #
+        indices = numpy.asarray(func(), dtype=numpy.int64).ravel()
+
+        if len(indices) > 0:
+
+            return componentType, indices
+
+    return componentTypes[-1], numpy.zeros(0, dtype=numpy.int64)
+
+
+def hasTopology(mesh):
+    """
+    Evaluates if the face-vertex indices can be read from the supplied mesh.
+
+    :type mesh: fnmesh.FnMesh
+    :rtype: bool
+    """
+
+    return callable(getattr(mesh, 'getFaceVertexArrays', None)) or callable(getattr(mesh, 'iterFaceVertexIndices', None))
+
+
+def getFaceVertexIndices(mesh, indices=None):
+    """
+    Returns the face-vertex counts and flattened face-vertex indices from the supplied mesh.
+    If no indices are supplied then every face is returned.
+    Function sets that expose `getFaceVertexArrays` are read directly when every face is requested, otherwise the faces are streamed into arrays.
+
+    :type mesh: fnmesh.FnMesh
+    :type indices: Union[List[int], numpy.ndarray, None]
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+
+    # Check if function set supports buffers
+    #
+    getFaceVertexArrays = getattr(mesh, 'getFaceVertexArrays', None)
+
+    if indices is None and callable(getFaceVertexArrays):
+
+        faceVertexCounts, faceVertexIndices = getFaceVertexArrays()
+
+        return numpy.asarray(faceVertexCounts, dtype=numpy.int64), numpy.asarray(faceVertexIndices, dtype=numpy.int64)
+
+    # Stream faces into buffers
+    #
+    indices = range(mesh.numFaces()) if indices is None else numpy.asarray(indices, dtype=numpy.int64).ravel().tolist()
+    faces = [tuple(faceVertexIndices) for faceVertexIndices in mesh.iterFaceVertexIndices(*indices)]
+
+    faceVertexCounts = numpy.fromiter(map(len, faces), dtype=numpy.int64, count=len(faces))
+    faceVertexIndices = numpy.fromiter(chain.from_iterable(faces), dtype=numpy.int64, count=int(faceVertexCounts.sum()))
+
+    return faceVertexCounts, faceVertexIndices
+
+
+def getEdgeVertexIndices(mesh, indices):
+    """
+    Returns the Ex2 vertex indices for the specified edges on the supplied mesh.
+
+    :type mesh: fnmesh.FnMesh
+    :type indices: Union[List[int], numpy.ndarray]
+    :rtype: numpy.ndarray
+    """
+
+    indices = numpy.asarray(indices, dtype=numpy.int64).ravel()
+
+    if len(indices) == 0:
+
+        return numpy.zeros((0, 2), dtype=numpy.int64)
+
+    # Check if function set supports buffers
+    #
+    getEdgeVertexArray = getattr(mesh, 'getEdgeVertexArray', None)
+
+    if callable(getEdgeVertexArray):
+
+        return numpy.asarray(getEdgeVertexArray(indices), dtype=numpy.int64).reshape(-1, 2)
+
+    # Stream edges into buffer
+    #
+    edges = mesh.iterEdgeVertexIndices(*indices.tolist())
+
+    return numpy.fromiter(chain.from_iterable(edges), dtype=numpy.int64, count=len(indices) * 2).reshape(-1, 2)
+
+
+def getTopologyKey(mesh):
+    """
+    Returns a cheap key that identifies the topology of the supplied mesh from its handle and component counts.
+    The key does not read any buffers, so edits that keep the vertex and face counts are not detected!
+
+    :type mesh: fnmesh.FnMesh
+    :rtype: Tuple[int, int, int]
+    """
+
+    return mesh.handle(), int(mesh.numVertices()), int(mesh.numFaces())
+
+
+def getMeshKey(mesh):
+    """
+    Returns a cheap key that identifies the current shape of the supplied mesh.
+    The topology key is combined with a handful of evenly spaced points, so the full point buffer is never read.
+    Deformations that keep every probed point in place are not detected, call `clearCache` after editing a mesh in place!
+
+    :type mesh: fnmesh.FnMesh
+    :rtype: Tuple[int, int, int, bytes]
+    """
+
+    handle, numVertices, numFaces = getTopologyKey(mesh)
+
+    probes = numpy.unique(numpy.linspace(0, max(numVertices - 1, 0), num=min(numVertices, __probe_size__)).astype(numpy.int64))
+    points = getVertexPoints(mesh, probes, worldSpace=False)
+
+    return handle, numVertices, numFaces, points.tobytes()
+
+
+def getTopology(mesh):
+    """
+    Returns the topology for the supplied mesh.
+    Topologies are cached by `getTopologyKey`, so the face-vertex indices are only read the first time a mesh is queried.
+
+    :type mesh: fnmesh.FnMesh
+    :rtype: MeshTopology
+    """
+
+    # Check if topology has already been read
+    #
+    key = getTopologyKey(mesh)
+    topology = __topology_cache__.get(key, None)
+
+    if topology is not None:
+
+        __topology_cache__.move_to_end(key)
+        return topology
+
+    # Read topology and evict the least recently used
+    #
+    faceVertexCounts, faceVertexIndices = getFaceVertexIndices(mesh)
+    topology = MeshTopology.create(faceVertexCounts, faceVertexIndices, numVertices=key[1])
+
+    __topology_cache__[key] = topology
+
+    while len(__topology_cache__) > __topology_cache_size__:
+
+        __topology_cache__.popitem(last=False)
+
+    return topology
+
+
+def triangulate(faceVertexCounts, faceVertexIndices):
+    """
+    Returns the Mx3 triangle fan indices along with the face index for each triangle.
+
+    :type faceVertexCounts: numpy.ndarray
+    :type faceVertexIndices: numpy.ndarray
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+
+    faceVertexCounts = numpy.asarray(faceVertexCounts, dtype=numpy.int64)
+    faceVertexIndices = numpy.asarray(faceVertexIndices, dtype=numpy.int64)
+    faceOffsets = numpy.concatenate([[0], numpy.cumsum(faceVertexCounts)[:-1]]).astype(numpy.int64)
+
+    triangleCounts = numpy.maximum(faceVertexCounts - 2, 0)
+    faceIndices = numpy.repeat(numpy.arange(len(triangleCounts)), triangleCounts)
+
+    starts = faceOffsets[faceIndices]
+    corners = numpy.arange(len(faceIndices)) - numpy.repeat(numpy.cumsum(triangleCounts) - triangleCounts, triangleCounts)
+
+    triangles = numpy.stack(
+        [
+            faceVertexIndices[starts],
+            faceVertexIndices[starts + corners + 1],
+            faceVertexIndices[starts + corners + 2]
+        ],
+        axis=1
+    )
+
+    return triangles.reshape(-1, 3), faceIndices
+
+
+def getCornerWeights(points, weighting=NormalWeighting.ANGLE):
+    """
+    Returns the unit normals and Mx3 corner weights for the supplied Mx3x3 triangle points.
+    Degenerate triangles are given a zero normal.
+
+    :type points: numpy.ndarray
+    :type weighting: NormalWeighting
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+
+    # Evaluate triangle normals
+    #
+    edges = numpy.roll(points, -1, axis=1) - points
+    crossProducts = numpy.cross(edges[:, 0], -edges[:, 2])
+    doubleAreas = numpy.linalg.norm(crossProducts, axis=1)
+
+    normals = numpy.zeros_like(crossProducts)
+    numpy.divide(crossProducts, doubleAreas[:, None], out=normals, where=doubleAreas[:, None] > 0.0)
+
+    # Evaluate corner weights
+    #
+    weighting = NormalWeighting(weighting)
+
+    if weighting == NormalWeighting.AREA:
+
+        weights = numpy.repeat(doubleAreas[:, None] * 0.5, 3, axis=1)
+
+    elif weighting == NormalWeighting.ANGLE:
+
+        # The cross product of any two triangle edges has the same length so each sine is shared
+        #
+        cosines = -numpy.einsum('ijk,ijk->ij', edges, numpy.roll(edges, 1, axis=1))
+        weights = numpy.arctan2(numpy.repeat(doubleAreas[:, None], 3, axis=1), cosines)
+
+    else:
+
+        weights = numpy.ones(crossProducts.shape, dtype=numpy.float64)
+
+    return normals, weights
+
+
+def reduceNormals(points, triangles, cornerMask, weighting=NormalWeighting.ANGLE, triangleScales=None):
+    """
+    Returns the weighted sum of the triangle normals at the masked corners.
+    Only triangles with at least one masked corner are evaluated, in chunks to bound the size of the temporary arrays.
+
+    :type points: numpy.ndarray
+    :type triangles: numpy.ndarray
+    :type cornerMask: numpy.ndarray
+    :type weighting: NormalWeighting
+    :type triangleScales: Union[numpy.ndarray, None]
+    :rtype: numpy.ndarray
+    """
+
+    rows = numpy.flatnonzero(cornerMask.any(axis=1))
+    normal = numpy.zeros(3, dtype=numpy.float64)
+
+    for start in range(0, len(rows), __chunk_size__):
+
+        chunk = rows[start:start + __chunk_size__]
+
+        normals, weights = getCornerWeights(points[triangles[chunk]], weighting=weighting)
+        triangleWeights = (weights * cornerMask[chunk]).sum(axis=1)
+
+        if triangleScales is not None:
+
+            triangleWeights *= triangleScales[chunk]
+
+        normal += triangleWeights @ normals
+
+    return normal
+
+
+def getAveragedNormal(mesh, weighting=NormalWeighting.VERTEX, componentType=None, worldSpace=True):
+    """
+    Returns the averaged normal from the selected components on the supplied mesh.
+    By default, the DCC's vertex normals are averaged uniformly, which respects any hard edges or locked normals.
+    Otherwise, the normals of the faces adjacent to the selection are reduced using the supplied weighting.
+    Only the adjacent faces are read for face selections, while vertex and edge selections look up their faces from the cached topology.
+    Meshes that do not expose their topology always fall back on the vertex normals.
+
+    :type mesh: fnmesh.FnMesh
+    :type weighting: NormalWeighting
+    :type componentType: Union[ComponentType, None]
+    :type worldSpace: bool
+    :rtype: vector.Vector
+    """
+
+    # Check if vertex normals should be used
+    #
+    weighting = NormalWeighting(weighting)
+
+    if weighting == NormalWeighting.VERTEX or not hasTopology(mesh):
+
+        return getUniformVertexNormal(mesh, componentType=componentType, worldSpace=worldSpace)
+
+    # Evaluate selected components
+    #
+    componentType, indices = getSelectedComponents(mesh, componentType=componentType)
+
+    if len(indices) == 0:
+
+        log.warning('No components found on mesh!')
+        return vector.Vector(1.0, 0.0, 0.0)
+
+    # Read the adjacent faces
+    #
+    with profiler.phase('readTopology'):
+
+        if componentType == ComponentType.FACE:
+
+            faceVertexCounts, faceVertexIndices = getFaceVertexIndices(mesh, indices)
+
+        else:
+
+            if componentType == ComponentType.EDGE:
+
+                indices = numpy.unique(getEdgeVertexIndices(mesh, indices))
+                componentType = ComponentType.VERTEX
+
+            topology = getTopology(mesh)
+            faceVertexCounts, faceVertexIndices = topology.getFaces(topology.getConnectedFaces(indices))
+
+    # Mask the selected corners
+    #
+    with profiler.phase('math'):
+
+        triangles, faceIndices = triangulate(faceVertexCounts, faceVertexIndices)
+        triangleScales = None
+
+        if componentType == ComponentType.FACE:
+
+            cornerMask = numpy.ones(triangles.shape, dtype=bool)
+
+            if weighting == NormalWeighting.UNIFORM:
+
+                triangleScales = 1.0 / numpy.maximum(faceVertexCounts - 2, 1)[faceIndices]
+
+        else:
+
+            vertexMask = numpy.zeros(int(max(faceVertexIndices.max(initial=0), indices.max())) + 1, dtype=bool)
+            vertexMask[indices] = True
+
+            cornerMask = vertexMask[triangles]
+
+        # Remap the contributing triangles onto their points
+        #
+        usedMask = numpy.zeros(int(triangles.max(initial=0)) + 1, dtype=bool)
+        usedMask[triangles] = True
+
+        vertexIndices = numpy.flatnonzero(usedMask)
+        remap = numpy.cumsum(usedMask) - 1
+
+    with profiler.phase('readVertices'):
+
+        points = getVertexPoints(mesh, vertexIndices, worldSpace=worldSpace)
+
+    with profiler.phase('math'):
+
+        normal = reduceNormals(points, remap[triangles], cornerMask, weighting=weighting, triangleScales=triangleScales)
+
+    return toNormal(normal)
+
+
+def getUniformVertexNormal(mesh, componentType=None, worldSpace=True):
+    """
+    Returns the uniform average of the vertex normals from the selected components on the supplied mesh.
+    Face and edge selections average the normals of their vertices.
+
+    :type mesh: fnmesh.FnMesh
+    :type componentType: Union[ComponentType, None]
+    :type worldSpace: bool
+    :rtype: vector.Vector
+    """
+
+    # Evaluate selected vertices
+    #
+    componentType, indices = getSelectedComponents(mesh, componentType=componentType)
+
+    if componentType == ComponentType.FACE:
+
+        indices = numpy.unique(getFaceVertexIndices(mesh, indices)[1])
+
+    elif componentType == ComponentType.EDGE:
+
+        indices = numpy.unique(getEdgeVertexIndices(mesh, indices))
+
+    if len(indices) == 0:
+
+        log.warning('No vertices found on mesh!')
+        return vector.Vector(1.0, 0.0, 0.0)
+
+    # Stream normals into buffer
+    #
+    normals = mesh.iterVertexNormals(*indices.tolist(), worldSpace=worldSpace)
+    buffer = numpy.fromiter(chain.from_iterable(normals), dtype=numpy.float64, count=len(indices) * 3)
+
+    return toNormal(buffer.reshape(-1, 3).sum(axis=0))
+
+
+def getVertexPoints(mesh, indices=None, worldSpace=True):
+    """
+    Returns the vertex positions from the supplied mesh as a contiguous Nx3 array.
+    If no indices are supplied then the selected vertices are used instead.
+    Function sets that expose `getVertexArray` are read directly, otherwise the vertices are streamed into a preallocated array in chunks.
+
+    :type mesh: fnmesh.FnMesh
+    :type indices: Union[List[int], numpy.ndarray, None]
+    :type worldSpace: bool
+    :rtype: numpy.ndarray
+    """
+
+    # Evaluate vertex indices
+    #
+    if indices is None:
+
+        indices = mesh.selectedVertices()
+
+    indices = numpy.asarray(indices, dtype=numpy.int64).ravel()
+    numIndices = len(indices)
+
+    if numIndices == 0:
+
+        return numpy.zeros((0, 3), dtype=numpy.float64)
+
+    # Check if function set supports buffers
+    #
+    getVertexArray = getattr(mesh, 'getVertexArray', None)
+
+    if callable(getVertexArray):
+
+        return numpy.asarray(getVertexArray(indices, worldSpace=worldSpace), dtype=numpy.float64).reshape(-1, 3)
+
+    # Stream vertices into buffer
+    # Indices are passed in chunks so neither the argument tuples nor any returned lists outgrow the chunk size!
+    #
+    iterVertices = getattr(mesh, 'iterVertices', None)
+    iterVertices = iterVertices if callable(iterVertices) else mesh.getVertices
+
+    points = numpy.empty((numIndices, 3), dtype=numpy.float64)
+    buffer = points.reshape(-1)
+
+    for start in range(0, numIndices, __chunk_size__):
+
+        chunk = indices[start:start + __chunk_size__]
+        vertices = iterVertices(*chunk.tolist(), worldSpace=worldSpace)
+
+        buffer[start * 3:(start + len(chunk)) * 3] = numpy.fromiter(chain.from_iterable(vertices), dtype=numpy.float64, count=len(chunk) * 3)
+
+    return points
+
+
+def toNormal(normal):
+    """
+    Returns the supplied array as a unit vector.
+    Zero length arrays return the x-axis instead.
+
+    :type normal: numpy.ndarray
+    :rtype: vector.Vector
+    """
+
+    length = numpy.linalg.norm(normal)
+
+    if length <= 1e-12:
+
+        log.warning('Unable to average opposing normals!')
+        return vector.Vector(1.0, 0.0, 0.0)
+
+    return vector.Vector(*(normal / length))
+
+
+def getOrientedBounds(points):
+    """
+    Returns the frame and extents of the oriented bounding box that fits the supplied points.
+    The frame's axes are the principal components of the points, permuted and flipped to best match the x, y and z axes, with the mean as its origin.
+    The extents are the minimum and maximum points expressed in that frame.
+
+    :type points: numpy.ndarray
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+    """
+
+    points = numpy.asarray(points, dtype=numpy.float64).reshape(-1, 3)
+
+    if len(points) == 0:
+
+        return numpy.identity(4), numpy.zeros(3), numpy.zeros(3)
+
+    # Evaluate principal axes from the covariance matrix
+    #
+    mean = points.mean(axis=0)
+    centered = points - mean
+
+    covariance = (centered.T @ centered) / len(points)
+    eigenvalues, eigenvectors = numpy.linalg.eigh(covariance)
+
+    axes = eigenvectors.T
+
+    # Match axes to the closest world axes so minimum and maximum stay predictable
+    #
+    magnitudes = numpy.abs(axes)
+    order = max(permutations(range(3)), key=lambda permutation: sum(magnitudes[axis, column] for (column, axis) in enumerate(permutation)))
+
+    axes = axes[list(order)]
+    signs = numpy.where(numpy.diag(axes) < 0.0, -1.0, 1.0)
+    axes *= signs[:, None]
+
+    if numpy.linalg.det(axes) < 0.0:
+
+        weakest = int(numpy.argmin(numpy.abs(numpy.diag(axes))))
+        axes[weakest] *= -1.0
+
+    # Project points onto axes
+    #
+    localPoints = centered @ axes.T
+
+    frame = numpy.identity(4)
+    frame[:3, :3] = axes
+    frame[3, :3] = mean
+
+    return frame, localPoints.min(axis=0), localPoints.max(axis=0)
+
+
+def getMeshOrientedBounds(mesh):
+    """
+    Returns the object-space oriented bounds for the supplied mesh.
+    Bounds are cached by `getMeshKey`, so the point buffer is only read when the bounds are recomputed.
+
+    :type mesh: fnmesh.FnMesh
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+    """
+
+    # Check if bounds have already been computed
+    #
+    key = getMeshKey(mesh)
+    bounds = __bounds_cache__.get(key, None)
+
+    if bounds is not None:
+
+        __bounds_cache__.move_to_end(key)
+        return bounds
+
+    # Read point buffer, compute bounds and evict the least recently used
+    #
+    points = getVertexPoints(mesh, numpy.arange(key[1]), worldSpace=False)
+    bounds = getOrientedBounds(points)
+    __bounds_cache__[key] = bounds
+
+    while len(__bounds_cache__) > __bounds_cache_size__:
+
+        __bounds_cache__.popitem(last=False)
+
+    return bounds
+
+
+def getOrientedBoundsPoints(frame, minPoint, maxPoint, worldMatrix=None):
+    """
+    Returns the minimum, center and maximum points of the supplied oriented bounds as a 3x3 array.
+    If a world matrix is supplied then the points are transformed into world-space.
+
+    :type frame: numpy.ndarray
+    :type minPoint: numpy.ndarray
+    :type maxPoint: numpy.ndarray
+    :type worldMatrix: Union[numpy.ndarray, None]
+    :rtype: numpy.ndarray
+    """
+
+    points = numpy.array([minPoint, (minPoint + maxPoint) * 0.5, maxPoint], dtype=numpy.float64)
+    points = (points @ frame[:3, :3]) + frame[3, :3]
+
+    if worldMatrix is not None:
+
+        points = (points @ worldMatrix[:3, :3]) + worldMatrix[3, :3]
+
+    return points
+
+
+def clearCache():
+    """
+    Discards all cached topologies and oriented bounds.
+
+    :rtype: None
+    """
+
+    __topology_cache__.clear()
+    __bounds_cache__.clear()
@@ -0,0 +1,2096 @@
+import numpy
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+from . import matrixarray, meshutils, meshbvh, framecache, eulerutils, fnpool
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+__current__ = None
+
+
+@dataclass
+class MockBoundingBox(object):
+    """
+    Data class that stores the world bounding box returned by the mock function sets.
+    """
+
+    min: Any
+    max: Any
+
+    def center(self):
+        """
+        Returns the center of this bounding box.
+
+        :rtype: vector.Vector
+        """
+
+        return matrixarray.toVector((matrixarray.asVectors(self.min) + matrixarray.asVectors(self.max)) * 0.5)
+
+
+class MockMesh(object):
+    """
+    NumPy backed mesh data stored by the mock scene.
+    Points are stored in object-space and normals are evaluated on demand.
+    """
+
+    # region Dunderscores
+    __slots__ = ('_points', '_faceVertexCounts', '_faceVertexIndices', '_faceOffsets', '_edges', '_normals', '_selection', '_edgeSelection', '_faceSelection')
+
+    def __init__(self, points, faceVertexCounts=None, faceVertexIndices=None):
+        """
+        Private method called after a new instance has been created.
+
+        :type points: numpy.ndarray
+        :type faceVertexCounts: Union[numpy.ndarray, None]
+        :type faceVertexIndices: Union[numpy.ndarray, None]
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(MockMesh, self).__init__()
+
+        # Declare private variables
+        #
+        self._points = numpy.array(points, dtype=numpy.float64).reshape(-1, 3)
+        self._faceVertexCounts = numpy.zeros(0, dtype=numpy.int64) if faceVertexCounts is None else numpy.array(faceVertexCounts, dtype=numpy.int64)
+        self._faceVertexIndices = numpy.zeros(0, dtype=numpy.int64) if faceVertexIndices is None else numpy.array(faceVertexIndices, dtype=numpy.int64)
+        self._faceOffsets = numpy.concatenate([[0], numpy.cumsum(self._faceVertexCounts)])
+        self._edges = None
+        self._normals = None
+        self._selection = numpy.zeros(0, dtype=numpy.int64)
+        self._edgeSelection = numpy.zeros(0, dtype=numpy.int64)
+        self._faceSelection = numpy.zeros(0, dtype=numpy.int64)
+    # endregion
+
+    # region Properties
+    @property
+    def points(self):
+        """
+        Getter method that returns the Nx3 object-space points.
+
+        :rtype: numpy.ndarray
+        """
+
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        """
+        Setter method that updates the object-space points.
+
+        :type points: numpy.ndarray
+        :rtype: None
+        """
+
+        self._points = numpy.array(points, dtype=numpy.float64).reshape(-1, 3)
+        self._normals = None
+
+    @property
+    def faceVertexCounts(self):
+        """
+        Getter method that returns the number of vertices per face.
+
+        :rtype: numpy.ndarray
+        """
+
+        return self._faceVertexCounts
+
+    @property
+    def faceVertexIndices(self):
+        """
+        Getter method that returns the flattened face-vertex indices.
+
+        :rtype: numpy.ndarray
+        """
+
+        return self._faceVertexIndices
+
+    @property
+    def selection(self):
+        """
+        Getter method that returns the selected vertex indices.
+
+        :rtype: numpy.ndarray
+        """
+
+        return self._selection
+
+    @selection.setter
+    def selection(self, selection):
+        """
+        Setter method that updates the selected vertex indices.
+
+        :type selection: numpy.ndarray
+        :rtype: None
+        """
+
+        self._selection = numpy.unique(numpy.asarray(selection, dtype=numpy.int64))
+
+    @property
+    def edgeSelection(self):
+        """
+        Getter method that returns the selected edge indices.
+
+        :rtype: numpy.ndarray
+        """
+
+        return self._edgeSelection
+
+    @edgeSelection.setter
+    def edgeSelection(self, edgeSelection):
+        """
+        Setter method that updates the selected edge indices.
+
+        :type edgeSelection: numpy.ndarray
+        :rtype: None
+        """
+
+        self._edgeSelection = numpy.unique(numpy.asarray(edgeSelection, dtype=numpy.int64))
+
+    @property
+    def faceSelection(self):
+        """
+        Getter method that returns the selected face indices.
+
+        :rtype: numpy.ndarray
+        """
+
+        return self._faceSelection
+
+    @faceSelection.setter
+    def faceSelection(self, faceSelection):
+        """
+        Setter method that updates the selected face indices.
+
+        :type faceSelection: numpy.ndarray
+        :rtype: None
+        """
+
+        self._faceSelection = numpy.unique(numpy.asarray(faceSelection, dtype=numpy.int64))
+    # endregion
+
+    # region Methods
+    def numVertices(self):
+        """
+        Evaluates the number of vertices.
+
+        :rtype: int
+        """
+
+        return len(self._points)
+
+    def numEdges(self):
+        """
+        Evaluates the number of edges.
+
+        :rtype: int
+        """
+
+        return len(self.edges())
+
+    def numFaces(self):
+        """
+        Evaluates the number of faces.
+
+        :rtype: int
+        """
+
+        return len(self._faceVertexCounts)
+
+    def edges(self):
+        """
+        Returns the Ex2 vertex indices for each unique edge.
+        Edges are evaluated on demand in order of their lowest vertex index.
+
+        :rtype: numpy.ndarray
+        """
+
+        if self._edges is not None:
+
+            return self._edges
+
+        # Pair each face-vertex with the next vertex around its face
+        #
+        faceIndices = numpy.repeat(numpy.arange(len(self._faceVertexCounts)), self._faceVertexCounts)
+        positions = numpy.arange(len(self._faceVertexIndices))
+        nextPositions = numpy.where(positions + 1 == self._faceOffsets[faceIndices + 1], self._faceOffsets[faceIndices], positions + 1)
+
+        pairs = numpy.sort(numpy.stack([self._faceVertexIndices, self._faceVertexIndices[nextPositions]], axis=1), axis=1)
+        self._edges = numpy.unique(pairs, axis=0).reshape(-1, 2)
+
+        return self._edges
+
+    def faceVertexIndicesAt(self, face):
+        """
+        Returns the vertex indices for the specified face.
+
+        :type face: int
+        :rtype: numpy.ndarray
+        """
+
+        return self._faceVertexIndices[self._faceOffsets[face]:self._faceOffsets[face + 1]]
+
+    def triangulate(self):
+        """
+        Returns the Mx3 triangle fan indices along with the face index for each triangle.
+
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+
+        return meshutils.triangulate(self._faceVertexCounts, self._faceVertexIndices)
+
+    def normals(self):
+        """
+        Returns the Nx3 object-space vertex normals.
+        Normals are area weighted and only re-evaluated after the points change.
+
+        :rtype: numpy.ndarray
+        """
+
+        if self._normals is not None:
+
+            return self._normals
+
+        triangles, faceIndices = self.triangulate()
+        points = self._points[triangles]
+
+        crossProducts = numpy.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+
+        normals = numpy.zeros_like(self._points)
+        numpy.add.at(normals, triangles[:, 0], crossProducts)
+        numpy.add.at(normals, triangles[:, 1], crossProducts)
+        numpy.add.at(normals, triangles[:, 2], crossProducts)
+
+        self._normals = matrixarray.normalizeVectors(normals)
+
+        return self._normals
+    # endregion
+
+
+class MockScene(object):
+    """
+    In-memory stand-in for a DCC scene graph.
+    Transforms are stored as contiguous local matrices and world matrices are cached until a node or its ancestors change.
+    Every function set call is tallied inside `calls` so scene traffic can be measured headlessly.
+    """
+
+    # region Dunderscores
+    __slots__ = (
+        '_names',
+        '_matrices',
+        '_offsets',
+        '_parents',
+        '_children',
+        '_meshes',
+        '_worldMatrices',
+        '_isDirty',
+        '_selection',
+        '_upAxis',
+        '_time',
+        '_startTime',
+        '_endTime',
+        '_animations',
+        '_rotationOrders',
+        '_eulers',
+        '_eulerKeys',
+        '_versions',
+        '_stamp',
+        '_calls',
+        '_extensions'
+    )
+
+    def __init__(self, upAxis='y', extensions=False):
+        """
+        Private method called after a new instance has been created.
+        Extensions expose the optional buffer and bulk key methods that no shipped DCC implements, so the fallbacks are used by default.
+
+        :type upAxis: str
+        :type extensions: bool
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(MockScene, self).__init__()
+
+        # Declare private variables
+        # Handles start at 1 so that no valid node evaluates as false!
+        #
+        self._names = [None]
+        self._matrices = numpy.eye(4)[None, :, :].copy()
+        self._offsets = self._matrices.copy()
+        self._parents = numpy.zeros(1, dtype=numpy.int64)
+        self._children = {0: []}
+        self._meshes = {}
+        self._worldMatrices = self._matrices.copy()
+        self._isDirty = numpy.zeros(1, dtype=bool)
+        self._selection = []
+        self._upAxis = upAxis
+        self._time = 0.0
+        self._startTime = 0.0
+        self._endTime = 100.0
+        self._animations = {}
+        self._rotationOrders = {}
+        self._eulers = {}
+        self._eulerKeys = {}
+        self._versions = numpy.zeros(1, dtype=numpy.int64)
+        self._stamp = 0
+        self._calls = Counter()
+        self._extensions = extensions
+
+    def __len__(self):
+        """
+        Private method that evaluates the number of nodes in this scene.
+
+        :rtype: int
+        """
+
+        return len(self._names) - 1
+
+    def __contains__(self, handle):
+        """
+        Private method that evaluates if the supplied handle exists in this scene.
+
+        :type handle: Any
+        :rtype: bool
+        """
+
+        return isinstance(handle, (int, numpy.integer)) and not isinstance(handle, bool) and 0 < handle < len(self._names)
+    # endregion
+
+    # region Properties
+    @property
+    def calls(self):
+        """
+        Getter method that returns the function set calls made against this scene.
+
+        :rtype: collections.Counter
+        """
+
+        return self._calls
+
+    @property
+    def extensions(self):
+        """
+        Getter method that evaluates if the function sets expose the optional buffer and bulk key methods.
+
+        :rtype: bool
+        """
+
+        return self._extensions
+    # endregion
+
+    # region Methods
+    def reserve(self, count):
+        """
+        Grows the internal buffers so that the specified number of nodes can be added without reallocating.
+
+        :type count: int
+        :rtype: None
+        """
+
+        capacity = len(self._matrices)
+        required = len(self._names) + count
+
+        if required <= capacity:
+
+            return
+
+        capacity = max(required, capacity * 2)
+        size = len(self._matrices)
+
+        self._matrices = numpy.concatenate([self._matrices, numpy.tile(numpy.eye(4), (capacity - size, 1, 1))])
+        self._offsets = numpy.concatenate([self._offsets, numpy.tile(numpy.eye(4), (capacity - size, 1, 1))])
+        self._worldMatrices = numpy.concatenate([self._worldMatrices, numpy.tile(numpy.eye(4), (capacity - size, 1, 1))])
+        self._parents = numpy.concatenate([self._parents, numpy.zeros(capacity - size, dtype=numpy.int64)])
+        self._isDirty = numpy.concatenate([self._isDirty, numpy.ones(capacity - size, dtype=bool)])
+        self._versions = numpy.concatenate([self._versions, numpy.zeros(capacity - size, dtype=numpy.int64)])
+
+    def createNode(self, name, parent=None, matrix=None):
+        """
+        Creates a transform node and returns its handle.
+
+        :type name: str
+        :type parent: Union[int, None]
+        :type matrix: Union[numpy.ndarray, None]
+        :rtype: int
+        """
+
+        return self.createNodes([name], parents=None if parent is None else [parent], matrices=None if matrix is None else [matrix])[0]
+
+    def createNodes(self, names, parents=None, matrices=None):
+        """
+        Creates a batch of transform nodes and returns their handles.
+        Parents must either already exist or precede their children within the batch.
+
+        :type names: List[str]
+        :type parents: Union[List[Union[int, None]], None]
+        :type matrices: Union[numpy.ndarray, None]
+        :rtype: List[int]
+        """
+
+        count = len(names)
+        self.reserve(count)
+
+        start = len(self._names)
+        handles = list(range(start, start + count))
+
+        self._names.extend(names)
+
+        if matrices is not None:
+
+            self._matrices[start:start + count] = numpy.asarray(matrices, dtype=numpy.float64).reshape(-1, 4, 4)
+
+        parents = [None] * count if parents is None else parents
+
+        for (handle, parent) in zip(handles, parents):
+
+            parent = 0 if parent is None else int(parent)
+
+            self._parents[handle] = parent
+            self._children.setdefault(parent, []).append(handle)
+            self._children[handle] = []
+
+        self._isDirty[start:start + count] = True
+
+        return handles
+
+    def createMesh(self, name, points, faceVertexCounts=None, faceVertexIndices=None, parent=None, matrix=None):
+        """
+        Creates a mesh node and returns its handle.
+
+        :type name: str
+        :type points: numpy.ndarray
+        :type faceVertexCounts: Union[numpy.ndarray, None]
+        :type faceVertexIndices: Union[numpy.ndarray, None]
+        :type parent: Union[int, None]
+        :type matrix: Union[numpy.ndarray, None]
+        :rtype: int
+        """
+
+        handle = self.createNode(name, parent=parent, matrix=matrix)
+        self._meshes[handle] = MockMesh(points, faceVertexCounts=faceVertexCounts, faceVertexIndices=faceVertexIndices)
+
+        return handle
+
+    def createGrid(self, name, rows, columns, size=1.0, parent=None, matrix=None):
+        """
+        Creates a quad grid mesh on the XZ plane and returns its handle.
+
+        :type name: str
+        :type rows: int
+        :type columns: int
+        :type size: float
+        :type parent: Union[int, None]
+        :type matrix: Union[numpy.ndarray, None]
+        :rtype: int
+        """
+
+        xs, zs = numpy.meshgrid(numpy.linspace(-0.5, 0.5, columns + 1) * size, numpy.linspace(-0.5, 0.5, rows + 1) * size)
+        points = numpy.stack([xs.ravel(), numpy.zeros(xs.size), zs.ravel()], axis=1)
+
+        row, column = numpy.meshgrid(numpy.arange(rows), numpy.arange(columns), indexing='ij')
+        corner = (row * (columns + 1) + column).ravel()
+        faceVertexIndices = numpy.stack([corner, corner + columns + 1, corner + columns + 2, corner + 1], axis=1).ravel()
+        faceVertexCounts = numpy.full(rows * columns, 4, dtype=numpy.int64)
+
+        return self.createMesh(name, points, faceVertexCounts=faceVertexCounts, faceVertexIndices=faceVertexIndices, parent=parent, matrix=matrix)
+
+    def createChain(self, count, name='joint', spacing=1.0, parent=None):
+        """
+        Creates a parented chain of transform nodes spaced along the x-axis.
+
+        :type count: int
+        :type name: str
+        :type spacing: float
+        :type parent: Union[int, None]
+        :rtype: List[int]
+        """
+
+        matrices = numpy.tile(numpy.eye(4), (count, 1, 1))
+        matrices[1:, 3, 0] = spacing
+
+        names = [f'{name}{i + 1}' for i in range(count)]
+        handles = list(range(len(self._names), len(self._names) + count))
+        parents = [parent] + handles[:-1]
+
+        return self.createNodes(names, parents=parents, matrices=matrices)
+
+    def isMesh(self, handle):
+        """
+        Evaluates if the supplied node has mesh data.
+
+        :type handle: int
+        :rtype: bool
+        """
+
+        return handle in self._meshes
+
+    def mesh(self, handle):
+        """
+        Returns the mesh data for the supplied node.
+
+        :type handle: int
+        :rtype: Union[MockMesh, None]
+        """
+
+        return self._meshes.get(handle, None)
+
+    def meshPoints(self, handle, indices, worldSpace=False):
+        """
+        Returns the Nx3 vertex positions at the specified indices on the supplied mesh.
+
+        :type handle: int
+        :type indices: Union[List[int], numpy.ndarray]
+        :type worldSpace: bool
+        :rtype: numpy.ndarray
+        """
+
+        points = self._meshes[handle].points[numpy.asarray(indices, dtype=numpy.int64)]
+
+        if worldSpace:
+
+            worldMatrix = self.worldMatrix(handle)
+            points = (points @ worldMatrix[:3, :3]) + worldMatrix[3, :3]
+
+        return points
+
+    def meshNormals(self, handle, indices, worldSpace=False):
+        """
+        Returns the Nx3 vertex normals at the specified indices on the supplied mesh.
+
+        :type handle: int
+        :type indices: Union[List[int], numpy.ndarray]
+        :type worldSpace: bool
+        :rtype: numpy.ndarray
+        """
+
+        normals = self._meshes[handle].normals()[numpy.asarray(indices, dtype=numpy.int64)]
+
+        if worldSpace:
+
+            worldMatrix = self.worldMatrix(handle)
+            normals = matrixarray.normalizeVectors(normals @ numpy.linalg.inv(worldMatrix[:3, :3]).T)
+
+        return normals
+
+    def name(self, handle):
+        """
+        Returns the name of the supplied node.
+
+        :type handle: int
+        :rtype: str
+        """
+
+        return self._names[handle]
+
+    def parent(self, handle):
+        """
+        Returns the parent of the supplied node.
+
+        :type handle: int
+        :rtype: Union[int, None]
+        """
+
+        parent = int(self._parents[handle])
+        return parent if parent != 0 else None
+
+    def children(self, handle):
+        """
+        Returns the children of the supplied node.
+
+        :type handle: int
+        :rtype: List[int]
+        """
+
+        return list(self._children.get(handle, []))
+
+    def iterDescendants(self, handle):
+        """
+        Returns a generator that yields the descendants of the supplied node.
+
+        :type handle: int
+        :rtype: Iterator[int]
+        """
+
+        queue = list(self._children.get(handle, []))
+
+        while len(queue) > 0:
+
+            child = queue.pop(0)
+            yield child
+
+            queue.extend(self._children.get(child, []))
+
+    def dirty(self, handle):
+        """
+        Marks the supplied node and its descendants as requiring re-evaluation.
+        Descendants of a dirty node are always dirty so there is no need to walk them again!
+
+        :type handle: int
+        :rtype: None
+        """
+
+        if self._isDirty[handle]:
+
+            return
+
+        self._isDirty[handle] = True
+
+        for descendant in self.iterDescendants(handle):
+
+            self._isDirty[descendant] = True
+
+    def touch(self, handle):
+        """
+        Marks the supplied node as dirty and stamps it with a new animation version.
+        Changing the time does not touch nodes since their animation remains the same!
+
+        :type handle: int
+        :rtype: None
+        """
+
+        self._stamp += 1
+        self._versions[handle] = self._stamp
+
+        self.dirty(handle)
+
+    def animationVersion(self, handle):
+        """
+        Returns the animation version for the supplied node.
+        Since world matrices depend on the parent, the latest stamp from the node and its ancestors is returned.
+
+        :type handle: int
+        :rtype: int
+        """
+
+        version = 0
+        current = handle
+
+        while current != 0:
+
+            version = max(version, int(self._versions[current]))
+            current = int(self._parents[current])
+
+        return version
+
+    def matrix(self, handle):
+        """
+        Returns the local matrix for the supplied node.
+
+        :type handle: int
+        :rtype: numpy.ndarray
+        """
+
+        return self._matrices[handle].copy()
+
+    def setLocalMatrix(self, handle, matrix, eulerRotation=None):
+        """
+        Updates the local matrix for the supplied node.
+        If no euler rotation is supplied then the node's euler channels are decomposed from the matrix instead.
+
+        :type handle: int
+        :type matrix: numpy.ndarray
+        :type eulerRotation: Union[numpy.ndarray, None]
+        :rtype: None
+        """
+
+        self._matrices[handle] = matrix
+        self.setEulerRotation(handle, eulerRotation)
+
+        self.touch(handle)
+
+    def rotationOrder(self, handle):
+        """
+        Returns the rotation order for the supplied node.
+
+        :type handle: int
+        :rtype: int
+        """
+
+        return self._rotationOrders.get(handle, eulerutils.RotationOrder.XYZ)
+
+    def setRotationOrder(self, handle, rotationOrder):
+        """
+        Updates the rotation order for the supplied node.
+        Any stored euler channels are discarded since they no longer match the matrix!
+
+        :type handle: int
+        :type rotationOrder: int
+        :rtype: None
+        """
+
+        self._rotationOrders[handle] = eulerutils.RotationOrder(rotationOrder)
+        self._eulers.pop(handle, None)
+        self._eulerKeys.pop(handle, None)
+
+    def eulerRotation(self, handle):
+        """
+        Returns the euler channels, in radians, for the supplied node.
+
+        :type handle: int
+        :rtype: numpy.ndarray
+        """
+
+        eulerRotation = self._eulers.get(handle, None)
+
+        if eulerRotation is not None:
+
+            return eulerRotation.copy()
+
+        else:
+
+            return eulerutils.decomposeEulers(eulerutils.getRotations(self._matrices[handle]), rotationOrder=self.rotationOrder(handle))
+
+    def setEulerRotation(self, handle, eulerRotation):
+        """
+        Updates the euler channels, in radians, for the supplied node without changing its matrix.
+        Supplying none reverts the channels to those decomposed from the matrix.
+
+        :type handle: int
+        :type eulerRotation: Union[numpy.ndarray, None]
+        :rtype: None
+        """
+
+        if eulerRotation is not None:
+
+            self._eulers[handle] = numpy.array(eulerRotation, dtype=numpy.float64).reshape(3)
+
+        else:
+
+            self._eulers.pop(handle, None)
+
+    def offsetParentMatrix(self, handle):
+        """
+        Returns the offset parent matrix for the supplied node.
+
+        :type handle: int
+        :rtype: numpy.ndarray
+        """
+
+        return self._offsets[handle].copy()
+
+    def setOffsetParentMatrix(self, handle, matrix):
+        """
+        Updates the offset parent matrix for the supplied node.
+
+        :type handle: int
+        :type matrix: numpy.ndarray
+        :rtype: None
+        """
+
+        self._offsets[handle] = matrix
+        self.touch(handle)
+
+    def worldMatrix(self, handle):
+        """
+        Returns the world matrix for the supplied node.
+
+        :type handle: int
+        :rtype: numpy.ndarray
+        """
+
+        # Collect dirty ancestors
+        #
+        stack = []
+        current = handle
+
+        while current != 0 and self._isDirty[current]:
+
+            stack.append(current)
+            current = int(self._parents[current])
+
+        # Re-evaluate from the top down
+        #
+        for node in reversed(stack):
+
+            parent = int(self._parents[node])
+            self._worldMatrices[node] = self._matrices[node] @ self._offsets[node] @ self._worldMatrices[parent]
+            self._isDirty[node] = False
+
+        return self._worldMatrices[handle].copy()
+
+    def worldMatrices(self, handles):
+        """
+        Returns the world matrices for the supplied nodes.
+
+        :type handles: List[int]
+        :rtype: numpy.ndarray
+        """
+
+        return numpy.array([self.worldMatrix(handle) for handle in handles]).reshape(-1, 4, 4)
+
+    def parentMatrix(self, handle):
+        """
+        Returns the parent world matrix for the supplied node.
+
+        :type handle: int
+        :rtype: numpy.ndarray
+        """
+
+        parent = int(self._parents[handle])
+
+        if parent == 0:
+
+            return self._offsets[handle].copy()
+
+        else:
+
+            return self._offsets[handle] @ self.worldMatrix(parent)
+
+    def setWorldMatrix(self, handle, matrix):
+        """
+        Updates the world matrix for the supplied node.
+
+        :type handle: int
+        :type matrix: numpy.ndarray
+        :rtype: None
+        """
+
+        self.setLocalMatrix(handle, matrix @ numpy.linalg.inv(self.parentMatrix(handle)))
+
+    def getActiveSelection(self):
+        """
+        Returns the active selection.
+
+        :rtype: List[int]
+        """
+
+        return list(self._selection)
+
+    def setActiveSelection(self, selection, replace=True):
+        """
+        Updates the active selection.
+
+        :type selection: List[int]
+        :type replace: bool
+        :rtype: None
+        """
+
+        if replace:
+
+            self._selection = list(selection)
+
+        else:
+
+            self._selection.extend(selection)
+
+    def selectVertices(self, handle, indices):
+        """
+        Updates the selected vertices on the supplied mesh and adds it to the active selection.
+
+        :type handle: int
+        :type indices: Union[List[int], numpy.ndarray]
+        :rtype: None
+        """
+
+        self._meshes[handle].selection = indices
+
+        if handle not in self._selection:
+
+            self._selection.append(handle)
+
+    def selectEdges(self, handle, indices):
+        """
+        Updates the selected edges on the supplied mesh and adds it to the active selection.
+
+        :type handle: int
+        :type indices: Union[List[int], numpy.ndarray]
+        :rtype: None
+        """
+
+        self._meshes[handle].edgeSelection = indices
+
+        if handle not in self._selection:
+
+            self._selection.append(handle)
+
+    def selectFaces(self, handle, indices):
+        """
+        Updates the selected faces on the supplied mesh and adds it to the active selection.
+
+        :type handle: int
+        :type indices: Union[List[int], numpy.ndarray]
+        :rtype: None
+        """
+
+        self._meshes[handle].faceSelection = indices
+
+        if handle not in self._selection:
+
+            self._selection.append(handle)
+
+    def getUpAxis(self):
+        """
+        Returns the up axis for this scene.
+
+        :rtype: str
+        """
+
+        return self._upAxis
+
+    def setUpAxis(self, upAxis):
+        """
+        Updates the up axis for this scene.
+
+        :type upAxis: str
+        :rtype: None
+        """
+
+        self._upAxis = upAxis
+
+    def getTime(self):
+        """
+        Returns the current time.
+
+        :rtype: float
+        """
+
+        return self._time
+
+    def setTime(self, time):
+        """
+        Updates the current time.
+
+        :type time: float
+        :rtype: None
+        """
+
+        self._time = time
+
+        for handle in self._animations.keys():
+
+            self._matrices[handle] = self.evaluate(handle, time)
+            self.setEulerRotation(handle, self.evaluateEulers(handle, time))
+
+            self.dirty(handle)
+
+    def getStartTime(self):
+        """
+        Returns the start time.
+
+        :rtype: float
+        """
+
+        return self._startTime
+
+    def setStartTime(self, startTime):
+        """
+        Updates the start time.
+
+        :type startTime: float
+        :rtype: None
+        """
+
+        self._startTime = startTime
+
+    def getEndTime(self):
+        """
+        Returns the end time.
+
+        :rtype: float
+        """
+
+        return self._endTime
+
+    def setEndTime(self, endTime):
+        """
+        Updates the end time.
+
+        :type endTime: float
+        :rtype: None
+        """
+
+        self._endTime = endTime
+
+    def isAnimated(self, handle):
+        """
+        Evaluates if the supplied node has any keyed local matrices.
+
+        :type handle: int
+        :rtype: bool
+        """
+
+        return handle in self._animations
+
+    def keys(self, handle):
+        """
+        Returns the key times, local matrices and tangents for the supplied node.
+        Keys without tangents store NaN tangents.
+
+        :type handle: int
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        """
+
+        times, matrices, tangents = self._animations.get(handle, (numpy.empty(0), numpy.empty((0, 4, 4)), numpy.empty((0, 4, 4))))
+        return times.copy(), matrices.copy(), tangents.copy()
+
+    def eulerKeys(self, handle):
+        """
+        Returns the key times and euler channels for the supplied node.
+        Keys without euler channels store NaN angles.
+
+        :type handle: int
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+
+        times = self._animations[handle][0] if handle in self._animations else numpy.empty(0)
+        eulers = self._eulerKeys.get(handle, numpy.full((len(times), 3), numpy.nan))
+
+        return times.copy(), eulers.copy()
+
+    def setKeys(self, handle, times, matrices, tangents=None, eulers=None, replaceRange=False):
+        """
+        Keys the supplied local matrices at the specified times.
+        Any existing keys at the same times are replaced, or, if replace range is enabled, every key between the first and last time.
+        Keys without tangents are interpolated linearly.
+        Euler channels are keyed alongside the matrices, however, keys without them discard the node's euler keys.
+
+        :type handle: int
+        :type times: numpy.ndarray
+        :type matrices: numpy.ndarray
+        :type tangents: Union[numpy.ndarray, None]
+        :type eulers: Union[numpy.ndarray, None]
+        :type replaceRange: bool
+        :rtype: None
+        """
+
+        times = numpy.asarray(times, dtype=numpy.float64).reshape(-1)
+        matrices = numpy.asarray(matrices, dtype=numpy.float64).reshape(-1, 4, 4)
+        tangents = numpy.full_like(matrices, numpy.nan) if tangents is None else numpy.asarray(tangents, dtype=numpy.float64).reshape(-1, 4, 4)
+        eulers = numpy.full((len(times), 3), numpy.nan) if eulers is None else numpy.asarray(eulers, dtype=numpy.float64).reshape(-1, 3)
+
+        currentTimes, currentMatrices, currentTangents = self.keys(handle)
+        currentEulers = self.eulerKeys(handle)[1]
+
+        if replaceRange and len(times) > 0:
+
+            keep = (currentTimes < times.min()) | (currentTimes > times.max())
+
+        else:
+
+            keep = ~numpy.isin(currentTimes, times)
+
+        times = numpy.concatenate([currentTimes[keep], times])
+        matrices = numpy.concatenate([currentMatrices[keep], matrices])
+        tangents = numpy.concatenate([currentTangents[keep], tangents])
+        eulers = numpy.concatenate([currentEulers[keep], eulers])
+        order = numpy.argsort(times, kind='stable')
+
+        self._animations[handle] = (times[order], matrices[order], tangents[order])
+        self._eulerKeys[handle] = eulers[order]
+
+        self._matrices[handle] = self.evaluate(handle, self._time)
+        self.setEulerRotation(handle, self.evaluateEulers(handle, self._time))
+
+        self.touch(handle)
+
+    def evaluate(self, handle, time):
+        """
+        Returns the local matrix for the supplied node at the specified time.
+        Keyed matrices are interpolated using hermite splines when both keys have tangents, otherwise linearly, and are held beyond the first and last keys.
+
+        :type handle: int
+        :type time: float
+        :rtype: numpy.ndarray
+        """
+
+        animation = self._animations.get(handle, None)
+
+        if animation is None:
+
+            return self._matrices[handle].copy()
+
+        times, matrices, tangents = animation
+        index = int(numpy.searchsorted(times, time, side='right'))
+
+        if index == 0:
+
+            return matrices[0].copy()
+
+        elif index == len(times):
+
+            return matrices[-1].copy()
+
+        span = times[index] - times[index - 1]
+        weight = (time - times[index - 1]) / span
+
+        startTangent, endTangent = tangents[index - 1], tangents[index]
+
+        if numpy.isfinite(startTangent).all() and numpy.isfinite(endTangent).all():
+
+            w2, w3 = weight * weight, weight * weight * weight
+
+            return (((2.0 * w3) - (3.0 * w2) + 1.0) * matrices[index - 1]) + ((w3 - (2.0 * w2) + weight) * span * startTangent) + (((-2.0 * w3) + (3.0 * w2)) * matrices[index]) + ((w3 - w2) * span * endTangent)
+
+        else:
+
+            return (matrices[index - 1] * (1.0 - weight)) + (matrices[index] * weight)
+
+    def evaluateEulers(self, handle, time):
+        """
+        Returns the euler channels for the supplied node at the specified time.
+        Euler channels are interpolated linearly and none is returned if either key is missing its channels.
+
+        :type handle: int
+        :type time: float
+        :rtype: Union[numpy.ndarray, None]
+        """
+
+        eulers = self._eulerKeys.get(handle, None)
+
+        if eulers is None or len(eulers) == 0:
+
+            return None
+
+        times = self._animations[handle][0]
+
+        index = int(numpy.searchsorted(times, time, side='right'))
+        startIndex, endIndex = max(index - 1, 0), min(index, len(times) - 1)
+
+        if not (numpy.isfinite(eulers[startIndex]).all() and numpy.isfinite(eulers[endIndex]).all()):
+
+            return None
+
+        elif startIndex == endIndex:
+
+            return eulers[startIndex]
+
+        weight = (time - times[startIndex]) / (times[endIndex] - times[startIndex])
+        return (eulers[startIndex] * (1.0 - weight)) + (eulers[endIndex] * weight)
+
+    def resetCalls(self):
+        """
+        Resets the function set call counters.
+
+        :rtype: None
+        """
+
+        self._calls.clear()
+    # endregion
+
+
+class FnMockNode(object):
+    """
+    Function set used to interface with nodes inside the current mock scene.
+    """
+
+    # region Dunderscores
+    __slots__ = ('_scene', '_handle')
+
+    def __init__(self, *args, **kwargs):
+        """
+        Private method called after a new instance has been created.
+
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(FnMockNode, self).__init__()
+
+        # Declare private variables
+        #
+        self._scene = None
+        self._handle = 0
+
+        # Check if an object was supplied
+        #
+        numArgs = len(args)
+
+        if numArgs == 1:
+
+            self.setObject(args[0])
+    # endregion
+
+    # region Properties
+    @property
+    def scene(self):
+        """
+        Getter method that returns the scene this function set is bound to.
+
+        :rtype: MockScene
+        """
+
+        return self._scene
+    # endregion
+
+    # region Methods
+    def tally(self, name):
+        """
+        Increments the call counter for the supplied method name.
+
+        :type name: str
+        :rtype: None
+        """
+
+        if self._scene is not None:
+
+            self._scene.calls[name] += 1
+
+    @classmethod
+    def acceptsObject(cls, scene, obj):
+        """
+        Evaluates if the supplied object can be bound to this function set.
+
+        :type scene: MockScene
+        :type obj: Any
+        :rtype: bool
+        """
+
+        return obj in scene
+
+    def object(self):
+        """
+        Returns the object bound to this function set.
+
+        :rtype: Union[int, None]
+        """
+
+        return self._handle if self._handle != 0 else None
+
+    def setObject(self, obj):
+        """
+        Updates the object bound to this function set.
+
+        :type obj: Any
+        :rtype: None
+        """
+
+        # Unwrap any function sets
+        #
+        if isinstance(obj, FnMockNode):
+
+            obj = obj.object()
+
+        # Check if object is compatible
+        #
+        scene = getCurrentScene()
+
+        if scene is None or not self.acceptsObject(scene, obj):
+
+            raise TypeError(f'setObject() expects a valid object ({obj} given)!')
+
+        self._scene = scene
+        self._handle = int(obj)
+
+    def trySetObject(self, obj):
+        """
+        Attempts to update the object bound to this function set.
+
+        :type obj: Any
+        :rtype: bool
+        """
+
+        try:
+
+            self.setObject(obj)
+            return True
+
+        except TypeError:
+
+            return False
+
+    def resetObject(self):
+        """
+        Resets the object bound to this function set.
+
+        :rtype: None
+        """
+
+        self._scene = None
+        self._handle = 0
+
+    def isValid(self):
+        """
+        Evaluates if this function set is bound to a valid object.
+
+        :rtype: bool
+        """
+
+        return self._scene is not None and self._handle in self._scene
+
+    def handle(self):
+        """
+        Returns the handle for the bound object.
+
+        :rtype: int
+        """
+
+        return self._handle
+
+    def name(self):
+        """
+        Returns the name of the bound object.
+
+        :rtype: str
+        """
+
+        self.tally('name')
+        return self._scene.name(self._handle)
+
+    def parent(self):
+        """
+        Returns the parent of the bound object.
+
+        :rtype: Union[int, None]
+        """
+
+        self.tally('parent')
+        return self._scene.parent(self._handle)
+
+    def children(self):
+        """
+        Returns the children of the bound object.
+
+        :rtype: List[int]
+        """
+
+        self.tally('children')
+        return self._scene.children(self._handle)
+
+    def iterDescendants(self):
+        """
+        Returns a generator that yields the descendants of the bound object.
+
+        :rtype: Iterator[int]
+        """
+
+        self.tally('iterDescendants')
+        return self._scene.iterDescendants(self._handle)
+
+    def isTransform(self):
+        """
+        Evaluates if the bound object is a transform.
+
+        :rtype: bool
+        """
+
+        return self.isValid()
+
+    def isMesh(self):
+        """
+        Evaluates if the bound object is a mesh.
+
+        :rtype: bool
+        """
+
+        return self.isValid() and self._scene.isMesh(self._handle)
+    # endregion
+
+
+class FnMockTransform(FnMockNode):
+    """
+    Overload of `FnMockNode` used to interface with transforms inside the current mock scene.
+    """
+
+    # region Dunderscores
+    __slots__ = ('_snapshot',)
+
+    def __init__(self, *args, **kwargs):
+        """
+        Private method called after a new instance has been created.
+
+        :rtype: None
+        """
+
+        # Declare private variables
+        #
+        self._snapshot = {}
+
+        # Call parent method
+        #
+        super(FnMockTransform, self).__init__(*args, **kwargs)
+    # endregion
+
+    # region Methods
+    def translation(self, worldSpace=False):
+        """
+        Returns the translation of the bound transform.
+
+        :type worldSpace: bool
+        :rtype: vector.Vector
+        """
+
+        self.tally('translation')
+
+        matrix = self._scene.worldMatrix(self._handle) if worldSpace else self._scene.matrix(self._handle)
+        return matrixarray.toVector(matrix[3, :3])
+
+    def matrix(self):
+        """
+        Returns the local matrix of the bound transform.
+
+        :rtype: transformationmatrix.TransformationMatrix
+        """
+
+        self.tally('matrix')
+        return matrixarray.toMatrix(self._scene.matrix(self._handle))
+
+    def worldMatrix(self):
+        """
+        Returns the world matrix of the bound transform.
+
+        :rtype: transformationmatrix.TransformationMatrix
+        """
+
+        self.tally('worldMatrix')
+        return matrixarray.toMatrix(self._scene.worldMatrix(self._handle))
+
+    def parentMatrix(self):
+        """
+        Returns the parent matrix of the bound transform.
+
+        :rtype: transformationmatrix.TransformationMatrix
+        """
+
+        self.tally('parentMatrix')
+        return matrixarray.toMatrix(self._scene.parentMatrix(self._handle))
+
+    def parentInverseMatrix(self):
+        """
+        Returns the parent inverse matrix of the bound transform.
+
+        :rtype: transformationmatrix.TransformationMatrix
+        """
+
+        self.tally('parentInverseMatrix')
+        return matrixarray.toMatrix(numpy.linalg.inv(self._scene.parentMatrix(self._handle)))
+
+    def boundingBox(self):
+        """
+        Returns the world bounding box of the bound transform.
+        Transforms without mesh data are collapsed onto their pivot.
+
+        :rtype: MockBoundingBox
+        """
+
+        self.tally('boundingBox')
+
+        worldMatrix = self._scene.worldMatrix(self._handle)
+        mesh = self._scene.mesh(self._handle)
+
+        if mesh is not None and mesh.numVertices() > 0:
+
+            points = (mesh.points @ worldMatrix[:3, :3]) + worldMatrix[3, :3]
+
+        else:
+
+            points = worldMatrix[3, :3].reshape(1, 3)
+
+        return MockBoundingBox(min=matrixarray.toVector(points.min(axis=0)), max=matrixarray.toVector(points.max(axis=0)))
+
+    def rotationOrder(self):
+        """
+        Returns the rotation order of the bound transform.
+
+        :rtype: int
+        """
+
+        self.tally('rotationOrder')
+        return self._scene.rotationOrder(self._handle)
+
+    def eulerRotation(self):
+        """
+        Returns the euler channels, in radians, of the bound transform.
+
+        :rtype: numpy.ndarray
+        """
+
+        self.tally('eulerRotation')
+        return self._scene.eulerRotation(self._handle)
+
+    def setEulerRotation(self, eulerRotation):
+        """
+        Updates the euler channels, in radians, of the bound transform.
+        The local matrix is rotated by the difference between the current and new channels, keeping its scale, shear and translation.
+
+        :type eulerRotation: numpy.ndarray
+        :rtype: None
+        """
+
+        self.tally('setEulerRotation')
+
+        eulerRotation = numpy.array(eulerRotation, dtype=numpy.float64).reshape(3)
+        rotationOrder = self._scene.rotationOrder(self._handle)
+
+        currentRotation = eulerutils.composeEulers(self._scene.eulerRotation(self._handle), rotationOrder=rotationOrder)
+        rotation = eulerutils.composeEulers(eulerRotation, rotationOrder=rotationOrder)
+
+        matrix = self._scene.matrix(self._handle).copy()
+        matrix[:3, :3] = matrix[:3, :3] @ currentRotation.T @ rotation
+
+        self._scene.setLocalMatrix(self._handle, matrix, eulerRotation=eulerRotation)
+
+    def setMatrix(self, matrix, **kwargs):
+        """
+        Updates the local matrix of the bound transform.
+        Individual components can be skipped using the `skipTranslate`, `skipRotate` and `skipScale` keywords and their per-axis variants.
+
+        :type matrix: transformationmatrix.TransformationMatrix
+        :key skipTranslate: bool
+        :key skipRotate: bool
+        :key skipScale: bool
+        :rtype: None
+        """
+
+        self.tally('setMatrix')
+
+        current = self._scene.matrix(self._handle)
+        matrix = mergeMatrices(current, matrixarray.toArray(matrix), **kwargs)
+
+        self._scene.setLocalMatrix(self._handle, matrix)
+
+    def freezeTransform(self):
+        """
+        Moves the local matrix of the bound transform into its offset parent matrix.
+
+        :rtype: None
+        """
+
+        self.tally('freezeTransform')
+
+        matrix = self._scene.matrix(self._handle)
+        offsetParentMatrix = self._scene.offsetParentMatrix(self._handle)
+
+        self._scene.setOffsetParentMatrix(self._handle, matrix @ offsetParentMatrix)
+        self._scene.setLocalMatrix(self._handle, numpy.eye(4))
+
+    def snapshot(self):
+        """
+        Stores the world matrices of the bound transform's children.
+
+        :rtype: None
+        """
+
+        self.tally('snapshot')
+        self._snapshot = {child: self._scene.worldMatrix(child) for child in self._scene.children(self._handle)}
+
+    def assumeSnapshot(self):
+        """
+        Restores the world matrices of the bound transform's children.
+
+        :rtype: None
+        """
+
+        self.tally('assumeSnapshot')
+
+        for (child, worldMatrix) in self._snapshot.items():
+
+            self._scene.setWorldMatrix(child, worldMatrix)
+
+        self._snapshot = {}
+
+    def animationVersion(self):
+        """
+        Returns the animation version of the bound transform.
+        The version changes whenever the transform, or any of its ancestors, is edited or keyed.
+
+        :rtype: int
+        """
+
+        self.tally('animationVersion')
+        return self._scene.animationVersion(self._handle)
+
+    def keyTransform(self):
+        """
+        Keys the current local matrix of the bound transform at the current time.
+
+        :rtype: None
+        """
+
+        self.tally('keyTransform')
+        self._scene.setKeys(self._handle, [self._scene.getTime()], [self._scene.matrix(self._handle)], eulers=[self._scene.eulerRotation(self._handle)])
+    # endregion
+
+
+class FnMockMesh(FnMockTransform):
+    """
+    Overload of `FnMockTransform` used to interface with meshes inside the current mock scene.
+    """
+
+    # region Dunderscores
+    __slots__ = ()
+    # endregion
+
+    # region Methods
+    @classmethod
+    def acceptsObject(cls, scene, obj):
+        """
+        Evaluates if the supplied object can be bound to this function set.
+
+        :type scene: MockScene
+        :type obj: Any
+        :rtype: bool
+        """
+
+        return obj in scene and scene.isMesh(int(obj))
+
+    def data(self):
+        """
+        Returns the mesh data for the bound object.
+
+        :rtype: MockMesh
+        """
+
+        return self._scene.mesh(self._handle)
+
+    def numVertices(self):
+        """
+        Evaluates the number of vertices on the bound mesh.
+
+        :rtype: int
+        """
+
+        return self.data().numVertices()
+
+    def selectedVertices(self):
+        """
+        Returns the selected vertex indices on the bound mesh.
+
+        :rtype: List[int]
+        """
+
+        self.tally('selectedVertices')
+        return self.data().selection.tolist()
+
+    def numEdges(self):
+        """
+        Evaluates the number of edges on the bound mesh.
+
+        :rtype: int
+        """
+
+        return self.data().numEdges()
+
+    def selectedEdges(self):
+        """
+        Returns the selected edge indices on the bound mesh.
+
+        :rtype: List[int]
+        """
+
+        self.tally('selectedEdges')
+        return self.data().edgeSelection.tolist()
+
+    def numFaces(self):
+        """
+        Evaluates the number of faces on the bound mesh.
+
+        :rtype: int
+        """
+
+        return self.data().numFaces()
+
+    def selectedFaces(self):
+        """
+        Returns the selected face indices on the bound mesh.
+
+        :rtype: List[int]
+        """
+
+        self.tally('selectedFaces')
+        return self.data().faceSelection.tolist()
+
+    def iterFaceVertexIndices(self, *indices):
+        """
+        Returns a generator that yields the vertex indices for the specified faces.
+
+        :type indices: Union[int, List[int]]
+        :rtype: Iterator[List[int]]
+        """
+
+        self.tally('iterFaceVertexIndices')
+
+        data = self.data()
+
+        for index in indices:
+
+            yield data.faceVertexIndicesAt(index).tolist()
+
+    def iterEdgeVertexIndices(self, *indices):
+        """
+        Returns a generator that yields the vertex indices for the specified edges.
+
+        :type indices: Union[int, List[int]]
+        :rtype: Iterator[List[int]]
+        """
+
+        self.tally('iterEdgeVertexIndices')
+
+        edges = self.data().edges()
+
+        for index in indices:
+
+            yield edges[index].tolist()
+
+    def getVertices(self, *indices, worldSpace=False):
+        """
+        Returns the vertex positions at the specified indices.
+
+        :type indices: Union[int, List[int]]
+        :type worldSpace: bool
+        :rtype: List[vector.Vector]
+        """
+
+        self.tally('getVertices')
+
+        points = self._scene.meshPoints(self._handle, indices, worldSpace=worldSpace)
+        return [matrixarray.toVector(point) for point in points]
+
+    def iterVertices(self, *indices, worldSpace=False):
+        """
+        Returns a generator that yields the vertex positions at the specified indices.
+
+        :type indices: Union[int, List[int]]
+        :type worldSpace: bool
+        :rtype: Iterator[vector.Vector]
+        """
+
+        self.tally('iterVertices')
+
+        for point in self._scene.meshPoints(self._handle, indices, worldSpace=worldSpace):
+
+            yield matrixarray.toVector(point)
+
+    def iterVertexNormals(self, *indices, worldSpace=False):
+        """
+        Returns a generator that yields the vertex normals at the specified indices.
+
+        :type indices: Union[int, List[int]]
+        :type worldSpace: bool
+        :rtype: Iterator[vector.Vector]
+        """
+
+        self.tally('iterVertexNormals')
+
+        for normal in self._scene.meshNormals(self._handle, indices, worldSpace=worldSpace):
+
+            yield matrixarray.toVector(normal)
+    # endregion
+
+
+class FnMockExtendedTransform(FnMockTransform):
+    """
+    Overload of `FnMockTransform` that exposes the optional bulk key method.
+    """
+
+    # region Dunderscores
+    __slots__ = ()
+    # endregion
+
+    # region Methods
+    def setMatrixKeys(self, times, matrices, tangents=None, eulerRotations=None, **kwargs):
+        """
+        Keys the supplied local matrices onto the bound transform in a single call.
+        Any existing keys between the first and last time are replaced.
+        Skipped components are copied from the local matrix evaluated at each time.
+        If euler rotations are supplied then they are keyed as the euler channels in place of decomposing the matrices.
+
+        :type times: numpy.ndarray
+        :type matrices: numpy.ndarray
+        :type tangents: Union[numpy.ndarray, None]
+        :type eulerRotations: Union[numpy.ndarray, None]
+        :key skipTranslate: bool
+        :key skipRotate: bool
+        :key skipScale: bool
+        :rtype: None
+        """
+
+        self.tally('setMatrixKeys')
+
+        matrices = numpy.asarray(matrices, dtype=numpy.float64).reshape(-1, 4, 4)
+
+        if any(kwargs.values()):
+
+            matrices = numpy.array([mergeMatrices(self._scene.evaluate(self._handle, time), matrix, **kwargs) for (time, matrix) in zip(times, matrices)])
+
+        eulerRotations = None if eulerutils.isRotateSkipped(**kwargs) else eulerRotations
+        self._scene.setKeys(self._handle, times, matrices, tangents=tangents, eulers=eulerRotations, replaceRange=True)
+    # endregion
+
+
+class FnMockExtendedMesh(FnMockMesh, FnMockExtendedTransform):
+    """
+    Overload of `FnMockMesh` that exposes the optional buffer and bulk key methods.
+    """
+
+    # region Dunderscores
+    __slots__ = ()
+    # endregion
+
+    # region Methods
+    def getFaceVertexArrays(self):
+        """
+        Returns the face-vertex counts and flattened face-vertex indices for the bound mesh.
+
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+
+        self.tally('getFaceVertexArrays')
+
+        data = self.data()
+        return data.faceVertexCounts, data.faceVertexIndices
+
+    def getEdgeVertexArray(self, indices):
+        """
+        Returns the Ex2 vertex indices for the specified edges.
+
+        :type indices: Union[List[int], numpy.ndarray]
+        :rtype: numpy.ndarray
+        """
+
+        self.tally('getEdgeVertexArray')
+        return self.data().edges()[numpy.asarray(indices, dtype=numpy.int64)]
+
+    def getVertexArray(self, indices, worldSpace=False):
+        """
+        Returns the vertex positions at the specified indices as an Nx3 array.
+
+        :type indices: Union[List[int], numpy.ndarray]
+        :type worldSpace: bool
+        :rtype: numpy.ndarray
+        """
+
+        self.tally('getVertexArray')
+        return self._scene.meshPoints(self._handle, indices, worldSpace=worldSpace)
+    # endregion
+
+
+class FnMockScene(object):
+    """
+    Function set used to interface with the current mock scene.
+    """
+
+    # region Dunderscores
+    __slots__ = ()
+    # endregion
+
+    # region Properties
+    @property
+    def scene(self):
+        """
+        Getter method that returns the current mock scene.
+
+        :rtype: MockScene
+        """
+
+        return getCurrentScene()
+    # endregion
+
+    # region Methods
+    def getActiveSelection(self):
+        """
+        Returns the active selection.
+
+        :rtype: List[int]
+        """
+
+        scene = self.scene
+        scene.calls['getActiveSelection'] += 1
+
+        return scene.getActiveSelection()
+
+    def setActiveSelection(self, selection, replace=True):
+        """
+        Updates the active selection.
+
+        :type selection: List[int]
+        :type replace: bool
+        :rtype: None
+        """
+
+        self.scene.setActiveSelection(selection, replace=replace)
+
+    def getUpAxis(self):
+        """
+        Returns the up axis.
+
+        :rtype: str
+        """
+
+        return self.scene.getUpAxis()
+
+    def getTime(self):
+        """
+        Returns the current time.
+
+        :rtype: float
+        """
+
+        return self.scene.getTime()
+
+    def setTime(self, time):
+        """
+        Updates the current time.
+
+        :type time: float
+        :rtype: None
+        """
+
+        self.scene.calls['setTime'] += 1
+        self.scene.setTime(time)
+
+    def getStartTime(self):
+        """
+        Returns the start time.
+
+        :rtype: float
+        """
+
+        return self.scene.getStartTime()
+
+    def getEndTime(self):
+        """
+        Returns the end time.
+
+        :rtype: float
+        """
+
+        return self.scene.getEndTime()
+    # endregion
+
+
+def getCurrentScene():
+    """
+    Returns the current mock scene.
+
+    :rtype: Union[MockScene, None]
+    """
+
+    return __current__
+
+
+def install(scene=None):
+    """
+    Makes the supplied mock scene current and routes the shared function set pool through it.
+    Any cached frames, topologies and hierarchies are discarded since they belong to the previous scene!
+    The returned scene function set can be handed to the tabs and engine functions in place of `fnscene.FnScene`.
+
+    :type scene: Union[MockScene, None]
+    :rtype: FnMockScene
+    """
+
+    global __current__
+    __current__ = MockScene() if scene is None else scene
+
+    framecache.clearCache()
+    meshutils.clearCache()
+    meshbvh.clearCache()
+
+    if __current__.extensions:
+
+        fnpool.setClasses(FnNode=FnMockNode, FnTransform=FnMockExtendedTransform, FnMesh=FnMockExtendedMesh, FnScene=FnMockScene)
+
+    else:
+
+        fnpool.setClasses(FnNode=FnMockNode, FnTransform=FnMockTransform, FnMesh=FnMockMesh, FnScene=FnMockScene)
+
+    return fnpool.createScene()
+
+
+def uninstall():
+    """
+    Restores the default function set classes used by the shared pool.
+
+    :rtype: None
+    """
+
+    global __current__
+    __current__ = None
+
+    fnpool.setClasses(**fnpool.__classes__)
+
+
+def decomposeEulerXYZ(rotationMatrix):
+    """
+    Returns the XYZ euler angles, in radians, from the supplied 3x3 rotation matrix.
+
+    :type rotationMatrix: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    y = numpy.arcsin(numpy.clip(-rotationMatrix[0, 2], -1.0, 1.0))
+    x = numpy.arctan2(rotationMatrix[1, 2], rotationMatrix[2, 2])
+    z = numpy.arctan2(rotationMatrix[0, 1], rotationMatrix[0, 0])
+
+    return numpy.array([x, y, z])
+
+
+def composeEulerXYZ(angles):
+    """
+    Returns a 3x3 rotation matrix from the supplied XYZ euler angles in radians.
+
+    :type angles: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    (cx, cy, cz), (sx, sy, sz) = numpy.cos(angles), numpy.sin(angles)
+
+    rotateX = numpy.array([[1.0, 0.0, 0.0], [0.0, cx, sx], [0.0, -sx, cx]])
+    rotateY = numpy.array([[cy, 0.0, -sy], [0.0, 1.0, 0.0], [sy, 0.0, cy]])
+    rotateZ = numpy.array([[cz, sz, 0.0], [-sz, cz, 0.0], [0.0, 0.0, 1.0]])
+
+    return rotateX @ rotateY @ rotateZ
+
+
+def mergeMatrices(current, matrix, **kwargs):
+    """
+    Returns the supplied matrix with any skipped components copied from the current matrix.
+    Skipped rotation axes are resolved using XYZ euler angles.
+
+    :type current: numpy.ndarray
+    :type matrix: numpy.ndarray
+    :key skipTranslate: bool
+    :key skipRotate: bool
+    :key skipScale: bool
+    :rtype: numpy.ndarray
+    """
+
+    # Evaluate skipped axes
+    #
+    skips = {}
+
+    for component in ('Translate', 'Rotate', 'Scale'):
+
+        skipAll = kwargs.get(f'skip{component}', False)
+        skips[component] = numpy.array([skipAll or kwargs.get(f'skip{component}{axis}', False) for axis in 'XYZ'], dtype=bool)
+
+    # Decompose matrices
+    #
+    currentScale = numpy.linalg.norm(current[:3, :3], axis=1)
+    scale = numpy.linalg.norm(matrix[:3, :3], axis=1)
+
+    currentRotation = current[:3, :3] / numpy.where(currentScale > 0.0, currentScale, 1.0)[:, None]
+    rotation = matrix[:3, :3] / numpy.where(scale > 0.0, scale, 1.0)[:, None]
+
+    # Merge components
+    #
+    translation = numpy.where(skips['Translate'], current[3, :3], matrix[3, :3])
+    scale = numpy.where(skips['Scale'], currentScale, scale)
+
+    if skips['Rotate'].all():
+
+        rotation = currentRotation
+
+    elif skips['Rotate'].any():
+
+        angles = numpy.where(skips['Rotate'], decomposeEulerXYZ(currentRotation), decomposeEulerXYZ(rotation))
+        rotation = composeEulerXYZ(angles)
+
+    else:
+
+        pass
+
+    merged = numpy.eye(4)
+    merged[:3, :3] = rotation * scale[:, None]
+    merged[3, :3] = translation
+
+    return merged
@@ -0,0 +1,260 @@
+import time
+
+from contextlib import contextmanager, nullcontext
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+__enabled__ = False
+__active__ = []
+
+
+class Profiler(object):
+    """
+    Records the duration of named phases and the number of nodes processed during an operation.
+    Nested phases are measured inclusively.
+    """
+
+    # region Dunderscores
+    __slots__ = ('_name', '_durations', '_counts', '_startTime', '_endTime')
+
+    def __init__(self, name=''):
+        """
+        Private method called after a new instance has been created.
+
+        :type name: str
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(Profiler, self).__init__()
+
+        # Declare private variables
+        #
+        self._name = name
+        self._durations = {}
+        self._counts = {}
+        self._startTime = time.perf_counter()
+        self._endTime = None
+
+    def __repr__(self):
+        """
+        Private method that returns a string representation of this instance.
+
+        :rtype: str
+        """
+
+        return f'{self.__class__.__name__}({self.summary()})'
+    # endregion
+
+    # region Properties
+    @property
+    def name(self):
+        """
+        Getter method that returns the name of the profiled operation.
+
+        :rtype: str
+        """
+
+        return self._name
+    # endregion
+
+    # region Methods
+    @contextmanager
+    def phase(self, name):
+        """
+        Returns a context manager that adds its duration to the specified phase.
+
+        :type name: str
+        :rtype: Iterator[None]
+        """
+
+        startTime = time.perf_counter()
+
+        try:
+
+            yield
+
+        finally:
+
+            self._durations[name] = self._durations.get(name, 0.0) + (time.perf_counter() - startTime)
+
+    def count(self, name, amount=1):
+        """
+        Increments the specified counter.
+
+        :type name: str
+        :type amount: int
+        :rtype: None
+        """
+
+        self._counts[name] = self._counts.get(name, 0) + amount
+
+    def stop(self):
+        """
+        Stops the total timer.
+
+        :rtype: None
+        """
+
+        self._endTime = time.perf_counter()
+
+    def total(self):
+        """
+        Returns the total duration in seconds.
+
+        :rtype: float
+        """
+
+        endTime = self._endTime if self._endTime is not None else time.perf_counter()
+        return endTime - self._startTime
+
+    def durations(self):
+        """
+        Returns the phase durations in seconds, in the order they were first recorded.
+
+        :rtype: Dict[str, float]
+        """
+
+        return dict(self._durations)
+
+    def counts(self):
+        """
+        Returns the counters.
+
+        :rtype: Dict[str, int]
+        """
+
+        return dict(self._counts)
+
+    def toDict(self):
+        """
+        Returns a dictionary representation of this profile.
+
+        :rtype: Dict[str, Any]
+        """
+
+        return {'name': self._name, 'total': self.total(), 'durations': self.durations(), 'counts': self.counts()}
+
+    def summary(self):
+        """
+        Returns a compact one line summary of this profile.
+
+        :rtype: str
+        """
+
+        phases = ', '.join(f'{name} {duration * 1000.0:.1f}ms' for (name, duration) in self._durations.items())
+        counts = ', '.join(f'{count} {name}' for (name, count) in self._counts.items())
+
+        summary = f'{self._name} {self.total() * 1000.0:.1f}ms'
+
+        if len(phases) > 0:
+
+            summary += f' ({phases})'
+
+        if len(counts) > 0:
+
+            summary += f' [{counts}]'
+
+        return summary
+    # endregion
+
+
+def isEnabled():
+    """
+    Evaluates if profiling is enabled.
+
+    :rtype: bool
+    """
+
+    return __enabled__
+
+
+def setEnabled(enabled):
+    """
+    Updates whether profiling is enabled.
+
+    :type enabled: bool
+    :rtype: None
+    """
+
+    global __enabled__
+    __enabled__ = bool(enabled)
+
+
+def activeProfiler():
+    """
+    Returns the profiler for the operation in progress.
+
+    :rtype: Union[Profiler, None]
+    """
+
+    return __active__[-1] if len(__active__) > 0 else None
+
+
+@contextmanager
+def profile(name, force=False):
+    """
+    Returns a context manager that profiles the enclosed operation.
+    If profiling is disabled then none is yielded and no phases are recorded!
+
+    :type name: str
+    :type force: bool
+    :rtype: Iterator[Union[Profiler, None]]
+    """
+
+    if not (__enabled__ or force):
+
+        yield None
+        return
+
+    profiler = Profiler(name)
+    __active__.append(profiler)
+
+    try:
+
+        yield profiler
+
+    finally:
+
+        __active__.remove(profiler)
+        profiler.stop()
+
+
+def phase(name):
+    """
+    Returns a context manager that times the specified phase of the active operation.
+
+    :type name: str
+    :rtype: ContextManager
+    """
+
+    profiler = activeProfiler()
+
+    if profiler is not None:
+
+        return profiler.phase(name)
+
+    else:
+
+        return nullcontext()
+
+
+def count(name, amount=1):
+    """
+    Increments the specified counter on the active operation.
+
+    :type name: str
+    :type amount: int
+    :rtype: None
+    """
+
+    profiler = activeProfiler()
+
+    if profiler is not None:
+
+        profiler.count(name, amount=amount)
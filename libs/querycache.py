@@ -0,0 +1,240 @@
+from collections import defaultdict
+from . import fnpool
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+class QueryCache(object):
+    """
+    Operation scoped read-through cache for transform queries.
+    Entries are keyed by node handle and query type and must be invalidated whenever the tool writes to a node.
+    Cached values are shared so please treat them as read-only!
+    """
+
+    # region Dunderscores
+    __slots__ = ('_entries', '_keys', '_hits', '_misses')
+
+    def __init__(self):
+        """
+        Private method called after a new instance has been created.
+
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(QueryCache, self).__init__()
+
+        # Declare private variables
+        #
+        self._entries = {}
+        self._keys = defaultdict(set)
+        self._hits = 0
+        self._misses = 0
+
+    def __enter__(self):
+        """
+        Private method that is called when this instance is entered using a with statement.
+
+        :rtype: QueryCache
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Private method that is called when this instance is exited using a with statement.
+
+        :rtype: None
+        """
+
+        self.clear()
+
+    def __len__(self):
+        """
+        Private method that evaluates the number of cached entries.
+
+        :rtype: int
+        """
+
+        return len(self._entries)
+
+    def __repr__(self):
+        """
+        Private method that returns a string representation of this instance.
+
+        :rtype: str
+        """
+
+        return f'{self.__class__.__name__}(hits={self.hits}, misses={self.misses})'
+    # endregion
+
+    # region Properties
+    @property
+    def hits(self):
+        """
+        Getter method that returns the number of queries answered from the cache.
+
+        :rtype: int
+        """
+
+        return self._hits
+
+    @property
+    def misses(self):
+        """
+        Getter method that returns the number of queries forwarded to the scene.
+
+        :rtype: int
+        """
+
+        return self._misses
+    # endregion
+
+    # region Methods
+    def query(self, node, name, *args, **kwargs):
+        """
+        Returns the result of the named query on the supplied function set.
+        The scene is only queried if no cached entry exists for this node and query.
+
+        :type node: fnnode.FnNode
+        :type name: str
+        :rtype: Any
+        """
+
+        handle = node.handle()
+        key = (handle, name, args, tuple(sorted(kwargs.items())))
+
+        if key in self._entries:
+
+            self._hits += 1
+            return self._entries[key]
+
+        self._misses += 1
+
+        value = getattr(node, name)(*args, **kwargs)
+        self._entries[key] = value
+        self._keys[handle].add(key)
+
+        return value
+
+    def worldMatrix(self, node):
+        """
+        Returns the cached world matrix for the supplied node.
+
+        :type node: fntransform.FnTransform
+        :rtype: transformationmatrix.TransformationMatrix
+        """
+
+        return self.query(node, 'worldMatrix')
+
+    def parentInverseMatrix(self, node):
+        """
+        Returns the cached parent inverse matrix for the supplied node.
+
+        :type node: fntransform.FnTransform
+        :rtype: transformationmatrix.TransformationMatrix
+        """
+
+        return self.query(node, 'parentInverseMatrix')
+
+    def translation(self, node, worldSpace=False):
+        """
+        Returns the cached translation for the supplied node.
+
+        :type node: fntransform.FnTransform
+        :type worldSpace: bool
+        :rtype: vector.Vector
+        """
+
+        return self.query(node, 'translation', worldSpace=worldSpace)
+
+    def boundingBox(self, node):
+        """
+        Returns the cached world bounding box for the supplied node.
+
+        :type node: fntransform.FnTransform
+        :rtype: boundingbox.BoundingBox
+        """
+
+        return self.query(node, 'boundingBox')
+
+    def invalidate(self, node, descendants=True):
+        """
+        Removes all cached entries for the supplied node.
+        Since world-space values depend on the parent, descendants are invalidated by default.
+
+        :type node: fntransform.FnTransform
+        :type descendants: bool
+        :rtype: None
+        """
+
+        # Collect affected handles
+        # No need to walk the descendants if this node owns every cached entry!
+        #
+        handles = [node.handle()]
+
+        if descendants and len(self._entries) > len(self._keys[handles[0]]):
+
+            handles.extend(fnDescendant.handle() for fnDescendant in iterDescendants(node))
+
+        # Remove cached entries
+        #
+        for handle in handles:
+
+            for key in self._keys.pop(handle, ()):
+
+                del self._entries[key]
+
+    def clear(self):
+        """
+        Removes all cached entries.
+        Hit and miss counters are left untouched.
+
+        :rtype: None
+        """
+
+        self._entries.clear()
+        self._keys.clear()
+
+    def resetCounters(self):
+        """
+        Resets the hit and miss counters.
+
+        :rtype: None
+        """
+
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self):
+        """
+        Returns the hit and miss counters as a dictionary.
+
+        :rtype: Dict[str, int]
+        """
+
+        return {'hits': self._hits, 'misses': self._misses, 'entries': len(self._entries)}
+    # endregion
+
+
+def iterDescendants(node):
+    """
+    Returns a generator that yields descendant function sets from the supplied node.
+
+    :type node: fnnode.FnNode
+    :rtype: Iterator[fnnode.FnNode]
+    """
+
+    with fnpool.borrow('FnNode', None) as (fnDescendant,):
+
+        for descendant in node.iterDescendants():
+
+            success = fnDescendant.trySetObject(descendant)
+
+            if success:
+
+                yield fnDescendant
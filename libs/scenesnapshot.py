@@ -0,0 +1,264 @@
+import numpy
+
+from types import MappingProxyType
+from dataclasses import dataclass, field
+from typing import Any, Tuple, Union, Mapping
+from . import matrixarray, querycache, meshutils, fnpool, profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+@dataclass(frozen=True, eq=False)
+class TransformSnapshot(object):
+    """
+    Frozen record of the scene values read from a single transform node.
+    """
+
+    handle: int
+    node: Any
+    worldMatrix: Union[numpy.ndarray, None] = None
+    parentInverseMatrix: Union[numpy.ndarray, None] = None
+    boundingBox: Union[numpy.ndarray, None] = None
+    orientedBoundingBox: Union[numpy.ndarray, None] = None
+
+    def pivot(self):
+        """
+        Returns the world pivot point from the world matrix.
+
+        :rtype: numpy.ndarray
+        """
+
+        return self.worldMatrix[3, :3]
+
+
+@dataclass(frozen=True, eq=False)
+class SceneSnapshot(object):
+    """
+    Frozen record of the active selection and every transform read during an operation.
+    """
+
+    selection: Tuple[Any, ...] = ()
+    transforms: Mapping[int, TransformSnapshot] = field(default_factory=lambda: MappingProxyType({}))
+
+    def get(self, handles):
+        """
+        Returns the transform snapshots for the supplied handles.
+
+        :type handles: List[int]
+        :rtype: List[TransformSnapshot]
+        """
+
+        return [self.transforms[handle] for handle in handles]
+
+    def worldMatrices(self, handles):
+        """
+        Returns the world matrices for the supplied handles.
+
+        :type handles: List[int]
+        :rtype: matrixarray.MatrixArray
+        """
+
+        return matrixarray.MatrixArray(numpy.array([self.transforms[handle].worldMatrix for handle in handles]).reshape(-1, 4, 4))
+
+    def parentInverseMatrices(self, handles):
+        """
+        Returns the parent inverse matrices for the supplied handles.
+
+        :type handles: List[int]
+        :rtype: matrixarray.MatrixArray
+        """
+
+        return matrixarray.MatrixArray(numpy.array([self.transforms[handle].parentInverseMatrix for handle in handles]).reshape(-1, 4, 4))
+
+    def boundingBoxes(self, handles):
+        """
+        Returns the Nx2x3 world bounding boxes for the supplied handles.
+
+        :type handles: List[int]
+        :rtype: numpy.ndarray
+        """
+
+        return numpy.array([self.transforms[handle].boundingBox for handle in handles]).reshape(-1, 2, 3)
+
+
+class ReadTransaction(object):
+    """
+    Operation scoped reader that queries each scene value at most once.
+    Call `freeze` once all reads are complete to hand an immutable snapshot over to the math.
+    """
+
+    # region Dunderscores
+    __slots__ = ('_scene', '_cache', '_selection', '_records')
+
+    def __init__(self, scene=None, cache=None):
+        """
+        Private method called after a new instance has been created.
+
+        :type scene: Union[fnscene.FnScene, None]
+        :type cache: Union[querycache.QueryCache, None]
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(ReadTransaction, self).__init__()
+
+        # Declare private variables
+        #
+        self._scene = scene
+        self._cache = querycache.QueryCache() if cache is None else cache
+        self._selection = None
+        self._records = {}
+    # endregion
+
+    # region Properties
+    @property
+    def cache(self):
+        """
+        Getter method that returns the query cache used to read scene values.
+
+        :rtype: querycache.QueryCache
+        """
+
+        return self._cache
+    # endregion
+
+    # region Methods
+    def selection(self):
+        """
+        Returns the active selection.
+        The selection is only queried from the scene the first time this method is called!
+
+        :rtype: List[Any]
+        """
+
+        if self._selection is None:
+
+            with profiler.phase('selection'):
+
+                self._selection = tuple(self._scene.getActiveSelection())
+
+        return list(self._selection)
+
+    def read(self, node, worldMatrix=True, parentInverseMatrix=False, boundingBox=False, orientedBoundingBox=False):
+        """
+        Reads the requested values from the supplied transform function set.
+        Values that have already been read are not queried again.
+        Oriented bounding boxes are stored as the world minimum, center and maximum points.
+
+        :type node: fntransform.FnTransform
+        :type worldMatrix: bool
+        :type parentInverseMatrix: bool
+        :type boundingBox: bool
+        :type orientedBoundingBox: bool
+        :rtype: int
+        """
+
+        # Get existing record
+        #
+        handle = node.handle()
+        record = self._records.get(handle, None)
+
+        if record is None:
+
+            record = {'handle': handle, 'node': node}
+            self._records[handle] = record
+
+        # Read any missing values
+        #
+        if worldMatrix and 'worldMatrix' not in record:
+
+            with profiler.phase('readMatrices'):
+
+                record['worldMatrix'] = freezeArray(matrixarray.toArray(self._cache.worldMatrix(node)))
+
+        if parentInverseMatrix and 'parentInverseMatrix' not in record:
+
+            with profiler.phase('readMatrices'):
+
+                record['parentInverseMatrix'] = freezeArray(matrixarray.toArray(self._cache.parentInverseMatrix(node)))
+
+        if boundingBox and 'boundingBox' not in record:
+
+            with profiler.phase('readBoundingBoxes'):
+
+                box = self._cache.boundingBox(node)
+                record['boundingBox'] = freezeArray(numpy.array([box.min.toList(), box.max.toList()], dtype=numpy.float64))
+
+        if orientedBoundingBox and 'orientedBoundingBox' not in record:
+
+            with profiler.phase('readBoundingBoxes'):
+
+                record['orientedBoundingBox'] = freezeArray(self.readOrientedBoundingBox(node, record))
+
+        return handle
+
+    def readOrientedBoundingBox(self, node, record):
+        """
+        Returns the world minimum, center and maximum points of the oriented bounding box for the supplied transform.
+        Transforms that are not meshes fall back on their axis-aligned bounding box!
+
+        :type node: fntransform.FnTransform
+        :type record: Dict[str, Any]
+        :rtype: numpy.ndarray
+        """
+
+        with fnpool.borrow('FnMesh', node.object()) as (fnMesh,):
+
+            if fnMesh.isValid():
+
+                worldMatrix = record.get('worldMatrix', None)
+
+                if worldMatrix is None:
+
+                    worldMatrix = matrixarray.toArray(self._cache.worldMatrix(node))
+
+                frame, minPoint, maxPoint = meshutils.getMeshOrientedBounds(fnMesh)
+                return meshutils.getOrientedBoundsPoints(frame, minPoint, maxPoint, worldMatrix=worldMatrix)
+
+        box = self._cache.boundingBox(node)
+        minPoint, maxPoint = numpy.array(box.min.toList(), dtype=numpy.float64), numpy.array(box.max.toList(), dtype=numpy.float64)
+
+        return numpy.array([minPoint, (minPoint + maxPoint) * 0.5, maxPoint], dtype=numpy.float64)
+
+    def readMany(self, nodes, **kwargs):
+        """
+        Reads the requested values from the supplied transform function sets.
+
+        :type nodes: List[fntransform.FnTransform]
+        :key worldMatrix: bool
+        :key parentInverseMatrix: bool
+        :key boundingBox: bool
+        :key orientedBoundingBox: bool
+        :rtype: List[int]
+        """
+
+        return [self.read(node, **kwargs) for node in nodes]
+
+    def freeze(self):
+        """
+        Returns an immutable snapshot of everything read so far.
+
+        :rtype: SceneSnapshot
+        """
+
+        transforms = {handle: TransformSnapshot(**record) for (handle, record) in self._records.items()}
+        selection = self._selection if self._selection is not None else ()
+
+        return SceneSnapshot(selection=selection, transforms=MappingProxyType(transforms))
+    # endregion
+
+
+def freezeArray(array):
+    """
+    Marks the supplied array as read-only.
+
+    :type array: numpy.ndarray
+    :rtype: numpy.ndarray
+    """
+
+    array.flags.writeable = False
+    return array
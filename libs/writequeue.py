@@ -0,0 +1,281 @@
+import numpy
+
+from itertools import groupby
+from dataclasses import dataclass, field
+from typing import Any, Dict, Union
+from dcc.decorators.undo import undo
+from . import matrixarray, eulerutils, hierarchyutils, profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+@dataclass
+class WriteEntry(object):
+    """
+    Data class that stores a pending matrix write.
+    """
+
+    node: Any
+    matrix: Any
+    preserveChildren: bool = False
+    freezeTransform: bool = False
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    eulerRotation: Any = None
+    depth: Union[int, None] = None
+
+
+class WriteQueue(object):
+    """
+    Collects computed matrices so they can be written back to the scene in a single pass.
+    Writes are grouped by operation type inside one undo chunk rather than interleaved with reads.
+    Euler unwrapping is opt-in since it costs two extra scene reads and one extra write per node!
+    """
+
+    # region Dunderscores
+    __slots__ = ('_entries', '_cache', '_unwrapEulers')
+
+    def __init__(self, cache=None, unwrapEulers=False):
+        """
+        Private method called after a new instance has been created.
+
+        :type cache: Union[querycache.QueryCache, None]
+        :type unwrapEulers: bool
+        :rtype: None
+        """
+
+        # Call parent method
+        #
+        super(WriteQueue, self).__init__()
+
+        # Declare private variables
+        #
+        self._entries = []
+        self._cache = cache
+        self._unwrapEulers = unwrapEulers
+
+    def __len__(self):
+        """
+        Private method that evaluates the number of pending writes.
+
+        :rtype: int
+        """
+
+        return len(self._entries)
+    # endregion
+
+    # region Methods
+    def push(self, node, matrix, preserveChildren=False, freezeTransform=False, depth=None, **kwargs):
+        """
+        Queues a matrix write for the supplied node.
+        Callers that already know how many selected ancestors the node has can supply it as the depth, otherwise it is evaluated on flush if required.
+        Any additional keywords are passed onto `setMatrix`.
+
+        :type node: fntransform.FnTransform
+        :type matrix: transformationmatrix.TransformationMatrix
+        :type preserveChildren: bool
+        :type freezeTransform: bool
+        :type depth: Union[int, None]
+        :rtype: None
+        """
+
+        entry = WriteEntry(node=node, matrix=matrix, preserveChildren=preserveChildren, freezeTransform=freezeTransform, kwargs=kwargs, depth=depth)
+        self._entries.append(entry)
+
+    def pushMany(self, nodes, matrices, depths=None, **kwargs):
+        """
+        Queues matrix writes for the supplied nodes.
+
+        :type nodes: List[fntransform.FnTransform]
+        :type matrices: Union[matrixarray.MatrixArray, List[transformationmatrix.TransformationMatrix]]
+        :type depths: Union[List[int], None]
+        :key preserveChildren: bool
+        :key freezeTransform: bool
+        :rtype: None
+        """
+
+        depths = [None] * len(nodes) if depths is None else depths
+
+        for (node, matrix, depth) in zip(nodes, matrices, depths):
+
+            self.push(node, matrix, depth=depth, **kwargs)
+
+    def clear(self):
+        """
+        Removes all pending writes.
+
+        :rtype: None
+        """
+
+        self._entries.clear()
+
+    def flush(self):
+        """
+        Writes all pending matrices to the scene.
+
+        :rtype: None
+        """
+
+        # Check if there is anything to write
+        #
+        if len(self._entries) == 0:
+
+            return
+
+        # Write entries and clear queue
+        #
+        try:
+
+            flushEntries(self._entries, cache=self._cache, unwrapEulers=self._unwrapEulers)
+
+        finally:
+
+            self._entries.clear()
+    # endregion
+
+
+def updateDepths(entries):
+    """
+    Updates the number of queued ancestors for each entry.
+    Nested entries must be flushed after their ancestors since snapshots and frozen transforms affect descendants.
+
+    :type entries: List[WriteEntry]
+    :rtype: None
+    """
+
+    parents, ancestors = hierarchyutils.getSelectedHierarchy([entry.node for entry in entries])
+
+    for (entry, indices) in zip(entries, ancestors):
+
+        entry.depth = len(indices)
+
+
+def updateEulers(entries):
+    """
+    Stores the euler rotation closest to each node's current euler channels, so it can be written after `setMatrix`.
+    Without this each matrix is decomposed independently, which flips rotations that cross 180 degrees.
+    Entries that are frozen afterwards, skip any rotation axis, or whose function sets cannot write euler channels are left untouched.
+
+    :type entries: List[WriteEntry]
+    :rtype: None
+    """
+
+    entries = [entry for entry in entries if not entry.freezeTransform and not eulerutils.isRotateSkipped(**entry.kwargs)]
+    entries = [entry for entry in entries if eulerutils.canWriteEulers([entry.node])]
+
+    if len(entries) == 0:
+
+        return
+
+    # Read current euler channels
+    #
+    eulers = eulerutils.readEulers([entry.node for entry in entries])
+
+    if eulers is None:
+
+        return
+
+    rotationOrders, previous = eulers
+
+    # Pick closest solutions for every node at once
+    #
+    matrices = numpy.stack([matrixarray.toArray(entry.matrix) for entry in entries])[:, None]
+    eulerRotations = eulerutils.unwrapEulers(eulerutils.getEulers(matrices, rotationOrders), rotationOrders, previous=previous)[:, 0]
+
+    for (entry, eulerRotation) in zip(entries, eulerRotations):
+
+        entry.eulerRotation = eulerRotation
+
+
+def getDepth(entry):
+    """
+    Returns the number of queued ancestors for the supplied entry.
+    Entries without a depth are flushed in the first wave.
+
+    :type entry: WriteEntry
+    :rtype: int
+    """
+
+    return entry.depth if entry.depth is not None else 0
+
+
+@undo(name='Flush Matrices')
+def flushEntries(entries, cache=None, unwrapEulers=False):
+    """
+    Writes the supplied entries to the scene grouped by operation type.
+    Snapshots are taken before any matrices are set and restored once every matrix is written.
+    If `unwrapEulers` is enabled then each matrix is followed by the euler rotation closest to the node's current channels.
+
+    :type entries: List[WriteEntry]
+    :type cache: Union[querycache.QueryCache, None]
+    :type unwrapEulers: bool
+    :rtype: None
+    """
+
+    # Check if any entries affect their descendants
+    #
+    requiresDepth = len(entries) > 1 and any(entry.preserveChildren or entry.freezeTransform for entry in entries)
+    hasDepth = all(entry.depth is not None for entry in entries)
+
+    if requiresDepth and not hasDepth:
+
+        with profiler.phase('hierarchy'):
+
+            updateDepths(entries)
+
+    if unwrapEulers:
+
+        with profiler.phase('eulers'):
+
+            updateEulers(entries)
+
+    profiler.count('writes', len(entries))
+
+    # Iterate through entries in hierarchical waves
+    #
+    for (depth, wave) in groupby(sorted(entries, key=getDepth), key=getDepth):
+
+        wave = list(wave)
+        preserved = [entry for entry in wave if entry.preserveChildren]
+
+        with profiler.phase('snapshot'):
+
+            for entry in preserved:
+
+                entry.node.snapshot()
+
+        with profiler.phase('setMatrix'):
+
+            for entry in wave:
+
+                entry.node.setMatrix(entry.matrix, **entry.kwargs)
+
+                if entry.eulerRotation is not None:
+
+                    entry.node.setEulerRotation(entry.eulerRotation)
+
+        with profiler.phase('freezeTransform'):
+
+            for entry in wave:
+
+                if entry.freezeTransform:
+
+                    entry.node.freezeTransform()
+
+        with profiler.phase('assumeSnapshot'):
+
+            for entry in preserved:
+
+                entry.node.assumeSnapshot()
+
+        # Invalidate any cached queries
+        #
+        if cache is not None:
+
+            with profiler.phase('invalidate'):
+
+                for entry in wave:
+
+                    cache.invalidate(entry.node)
@@ -0,0 +1,37 @@
+import pytest
+
+
+@pytest.fixture
+def scene(request):
+    """
+    Returns an empty mock scene that is current for the duration of a test.
+    Tests can opt into the mock's extension APIs by indirectly parametrizing this fixture with true.
+
+    :rtype: mockscene.MockScene
+    """
+
+    pytest.importorskip('dcc')
+    from ..libs import mockscene
+
+    current = mockscene.MockScene(extensions=getattr(request, 'param', False))
+    mockscene.install(current)
+
+    try:
+
+        yield current
+
+    finally:
+
+        mockscene.uninstall()
+
+
+@pytest.fixture
+def fnScene(scene):
+    """
+    Returns an instrumented scene function set bound to the current mock scene.
+
+    :rtype: mockscene.FnMockScene
+    """
+
+    from ..libs import fnpool
+    return fnpool.createScene()
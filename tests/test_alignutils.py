@@ -0,0 +1,58 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+pytest.importorskip('dcc')
+
+from ..libs import alignutils, scenesnapshot, fnpool
+from ..libs.benchmarks import randomMatrices
+
+
+@pytest.mark.parametrize('preserveChildren', [False, True])
+@pytest.mark.parametrize('reverse', [False, True])
+def test_one_to_many_nested_targets(scene, preserveChildren, reverse):
+
+    source = scene.createNode('source', matrix=randomMatrices(1, seed=1)[0])
+    parent = scene.createNode('parent', matrix=randomMatrices(1, seed=2)[0])
+    child = scene.createNode('child', parent=parent, matrix=randomMatrices(1, seed=3)[0])
+
+    targets = [child, parent] if reverse else [parent, child]
+    alignutils.alignTransforms([source], targets, preserveChildren=preserveChildren)
+
+    expected = scene.worldMatrix(source)
+
+    numpy.testing.assert_allclose(scene.worldMatrix(parent), expected, atol=1e-9)
+    numpy.testing.assert_allclose(scene.worldMatrix(child), expected, atol=1e-9)
+
+
+def test_pairs_nested_targets(scene):
+
+    sources = scene.createNodes(['source1', 'source2'], matrices=randomMatrices(2, seed=4))
+    parent = scene.createNode('parent', matrix=randomMatrices(1, seed=5)[0])
+    middle = scene.createNode('middle', parent=parent, matrix=randomMatrices(1, seed=6)[0])
+    child = scene.createNode('child', parent=middle, matrix=randomMatrices(1, seed=7)[0])
+
+    alignutils.alignTransforms(sources, [parent, child])
+
+    numpy.testing.assert_allclose(scene.worldMatrix(parent), scene.worldMatrix(sources[0]), atol=1e-9)
+    numpy.testing.assert_allclose(scene.worldMatrix(child), scene.worldMatrix(sources[1]), atol=1e-9)
+
+
+def test_function_sets_released_on_error(scene):
+
+    class FailingTransaction(scenesnapshot.ReadTransaction):
+
+        def readMany(self, nodes, **kwargs):
+
+            raise RuntimeError('readMany')
+
+    source, target = scene.createNodes(['source', 'target'], matrices=randomMatrices(2, seed=8))
+
+    pool = fnpool.getPool()
+    before = pool.stats()
+
+    with pytest.raises(RuntimeError):
+
+        alignutils.alignTransforms([source], [target], transaction=FailingTransaction())
+
+    after = pool.stats()
+    assert after['free'] == before['free'] + (after['allocations'] - before['allocations'])
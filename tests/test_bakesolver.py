@@ -0,0 +1,115 @@
+import sys
+import pytest
+import multiprocessing.spawn
+
+numpy = pytest.importorskip('numpy')
+
+from ..libs import bakesolver, eulerutils
+
+
+def createJob(seed, targetCount=3, frameCount=24, tolerance=0.01):
+
+    rng = numpy.random.default_rng(seed)
+
+    angles = numpy.cumsum(rng.uniform(-0.2, 0.2, (1, frameCount, 3)), axis=1)
+    sourceWorldArray = numpy.tile(numpy.eye(4), (1, frameCount, 1, 1))
+    sourceWorldArray[..., :3, :3] = eulerutils.composeEulers(angles)
+    sourceWorldArray[..., 3, :3] = rng.uniform(-10.0, 10.0, (1, frameCount, 3))
+
+    offsetMatrices = numpy.tile(numpy.eye(4), (targetCount, 1, 1))
+    offsetMatrices[:, 3, :3] = rng.uniform(-1.0, 1.0, (targetCount, 3))
+
+    return bakesolver.BakeJob(
+        frames=numpy.arange(float(frameCount)),
+        sourceWorldArray=sourceWorldArray,
+        targetParentInverseArray=numpy.tile(numpy.eye(4), (targetCount, frameCount, 1, 1)),
+        nearestWorldArray=numpy.zeros((0, frameCount, 4, 4)),
+        nested=numpy.zeros(0, dtype=int),
+        nearest=numpy.zeros(0, dtype=int),
+        offsetMatrices=offsetMatrices,
+        tolerance=tolerance,
+        rotationOrders=numpy.zeros(targetCount, dtype=int),
+        eulerRotations=numpy.zeros((targetCount, 3))
+    )
+
+
+def assertResultsEqual(results, expected):
+
+    assert len(results) == len(expected)
+
+    for (result, expectedResult) in zip(results, expected):
+
+        numpy.testing.assert_array_equal(result.matrices, expectedResult.matrices)
+        numpy.testing.assert_array_equal(result.masks, expectedResult.masks)
+        numpy.testing.assert_array_equal(result.tangents, expectedResult.tangents)
+        numpy.testing.assert_array_equal(result.eulerRotations, expectedResult.eulerRotations)
+
+
+def test_solve_bake_follows_offsets():
+
+    job = createJob(0, tolerance=None)
+    result = bakesolver.solveBake(job)
+
+    numpy.testing.assert_allclose(result.matrices, job.offsetMatrices[:, None] @ job.sourceWorldArray, atol=1e-12)
+    assert result.masks is None and result.tangents is None
+
+
+def test_solve_bake_linear_without_hermite():
+
+    job = createJob(1)
+    job.hermite = False
+
+    result = bakesolver.solveBake(job)
+
+    assert result.tangents is None and result.masks[:, [0, -1]].all()
+
+
+def test_process_count():
+
+    jobs = [createJob(seed, targetCount=1, frameCount=2) for seed in range(4)]
+
+    assert bakesolver.getProcessCount(jobs) == 1
+    assert bakesolver.getProcessCount(jobs, processes=8) == 4
+    assert bakesolver.getProcessCount(jobs[:1], processes=8) == 1
+
+
+def test_pool_matches_serial():
+
+    jobs = [createJob(seed) for seed in range(4)]
+
+    expected = bakesolver.solveBakes(jobs, processes=1)
+    results = bakesolver.solveBakes(jobs, processes=2)
+
+    assertResultsEqual(results, expected)
+
+
+def test_pool_restores_executable():
+
+    previous = multiprocessing.spawn.get_executable()
+    jobs = [createJob(seed) for seed in range(2)]
+
+    bakesolver.solveBakes(jobs, processes=2, executable=sys.executable)
+
+    assert multiprocessing.spawn.get_executable() == previous
+
+
+def test_executable_resolved_next_to_dcc(tmp_path, monkeypatch):
+
+    dcc = tmp_path / 'maya'
+    dcc.touch()
+
+    monkeypatch.setattr(bakesolver.multiprocessing.spawn, 'get_executable', lambda: str(dcc))
+    assert bakesolver.getExecutable() is None
+
+    interpreter = tmp_path / 'mayapy'
+    interpreter.touch()
+
+    assert bakesolver.getExecutable() == str(interpreter)
+
+
+def test_pool_without_interpreter_solves_serially(monkeypatch):
+
+    monkeypatch.setattr(bakesolver, 'getExecutable', lambda: None)
+
+    jobs = [createJob(seed) for seed in range(2)]
+    assertResultsEqual(bakesolver.solveBakes(jobs, processes=2), bakesolver.solveBakes(jobs, processes=1))
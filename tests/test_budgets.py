@@ -0,0 +1,159 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+pytest.importorskip('dcc')
+
+from ..libs import callbudget, alignutils, aimutils, matrixutils, bakeutils, framecache, hierarchyutils, fnpool
+from ..libs.benchmarks import randomMatrices
+
+
+def createNodes(scene, count, seed=0):
+
+    handles = scene.createNodes([f'node{i}' for i in range(count)], matrices=randomMatrices(count, seed=seed))
+    child = scene.createNode('child', parent=handles[-1], matrix=randomMatrices(1, seed=seed + 1)[0])
+
+    return handles + [child]
+
+
+@pytest.mark.parametrize('alignMode', [0, 1])
+@pytest.mark.parametrize('preserveChildren', [False, True])
+@pytest.mark.parametrize('freezeTransform', [False, True])
+def test_align_budget(scene, alignMode, preserveChildren, freezeTransform):
+
+    handles = createNodes(scene, 7)
+    sources, targets = alignutils.splitSelection(handles, alignMode=alignMode)
+
+    with callbudget.counting('QAlignTab') as counter:
+
+        alignutils.alignTransforms(sources, targets, preserveChildren=preserveChildren, freezeTransform=freezeTransform)
+
+    assert counter['setMatrix'] == len(targets)
+    callbudget.assertBudget(counter, len(handles))
+
+
+@pytest.mark.parametrize('preserveChildren', [False, True])
+def test_aim_budget(scene, fnScene, preserveChildren):
+
+    handles = createNodes(scene, 6)
+
+    with callbudget.counting('QAimTab', fnScene) as counter:
+
+        aimutils.aimTransforms(handles, fnScene, preserveChildren=preserveChildren)
+
+    assert counter['setMatrix'] == len(handles) - 1
+    callbudget.assertBudget(counter, len(handles))
+
+
+@pytest.mark.parametrize('maintainOffset', [False, True])
+def test_matrix_budget(scene, maintainOffset):
+
+    handles = createNodes(scene, 6)
+
+    with callbudget.counting('QMatrixTab') as counter:
+
+        matrixutils.applyMatrix(handles, randomMatrices(1, seed=9)[0], maintainOffset=maintainOffset)
+
+    assert counter['setMatrix'] == len(handles)
+    callbudget.assertBudget(counter, len(handles))
+
+
+@pytest.mark.parametrize('scene', [False, True], ids=['fallback', 'bulk'], indirect=True)
+@pytest.mark.parametrize('tolerance', [None, 0.01])
+def test_time_budget(scene, fnScene, tolerance):
+
+    handles = createNodes(scene, 5)
+    sources, targets = alignutils.splitSelection(handles, alignMode=0)
+    frameCount = 12
+
+    with callbudget.counting('QTimeTab', fnScene) as counter:
+
+        bakeutils.bakeTransforms(sources, targets, startFrame=0, endFrame=frameCount - 1, maintainOffset=True, tolerance=tolerance, scene=fnScene)
+
+    assert counter['setTime'] > frameCount
+    callbudget.assertBudget(counter, len(handles), frameCount=frameCount)
+
+
+def test_time_frame_cache(scene, fnScene):
+
+    handles = createNodes(scene, 3)
+    sources, targets = alignutils.splitSelection(handles, alignMode=0)
+
+    with callbudget.counting('QTimeTab', fnScene) as uncached:
+
+        bakeutils.bakeTransforms(sources, targets, startFrame=0, endFrame=9, scene=fnScene)
+
+    assert uncached['animationVersion'] == 0 and uncached['iterDescendants'] == 0
+
+    frameCache = framecache.getCache()
+    bakeutils.bakeTransforms(sources, targets, startFrame=0, endFrame=9, scene=fnScene, frameCache=frameCache)
+
+    with callbudget.counting('QTimeTab', fnScene) as cached:
+
+        bakeutils.bakeTransforms(sources, targets, startFrame=0, endFrame=9, scene=fnScene, frameCache=frameCache)
+
+    assert cached['worldMatrix'] < uncached['worldMatrix']
+    callbudget.assertBudget(cached, len(handles), frameCount=10)
+
+
+def test_instrumented_while_counting(scene, fnScene):
+
+    with fnpool.borrow('FnNode', None) as (fnNode,):
+
+        assert callbudget.uninstrument(type(fnNode)) is type(fnNode)
+
+    with callbudget.counting('QAimTab', fnScene) as counter:
+
+        with fnpool.borrow('FnNode', None) as (fnNode,):
+
+            assert callbudget.uninstrument(type(fnNode)) is not type(fnNode)
+
+        fnScene.getActiveSelection()
+
+    assert counter['getActiveSelection'] == 1
+    assert callbudget.uninstrument(type(fnScene)) is type(fnScene)
+
+
+def test_parent_budget_deep_hierarchy(scene):
+
+    chain = scene.createChain(hierarchyutils.__depth__ * 3)
+    handles = [scene.createNode(f'leaf{i}', parent=chain[-1]) for i in range(4)] + [chain[0]]
+
+    with callbudget.counting('QMatrixTab') as counter:
+
+        matrixutils.applyMatrix(handles, randomMatrices(1, seed=9)[0], preserveChildren=True)
+
+    assert counter['parent'] > len(handles)
+    callbudget.assertBudget(counter, len(handles))
+
+
+@pytest.mark.parametrize(
+    ('moduleName', 'className', 'minimumCount'),
+    [
+        ('qaligntab', 'QAlignTab', 2),
+        ('qaimtab', 'QAimTab', 2),
+        ('qmatrixtab', 'QMatrixTab', 1),
+        ('qtimetab', 'QTimeTab', 2)
+    ]
+)
+def test_tab_budget(scene, fnScene, moduleName, className, minimumCount):
+
+    QtWidgets = pytest.importorskip('Qt.QtWidgets')
+
+    import importlib
+    module = importlib.import_module(f'..ui.tabs.{moduleName}', package=__package__)
+
+    application = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    tab = getattr(module, className)(scene=fnScene)
+
+    handles = createNodes(scene, max(minimumCount, 5))
+    fnScene.setActiveSelection(handles)
+
+    frameCount = 0
+
+    if className == 'QTimeTab':
+
+        frameCount = 12
+        tab.startFrame, tab.endFrame = 0, frameCount - 1
+
+    tab.profiledApply(force=True)
+    callbudget.assertBudget(tab.lastCalls, len(handles), frameCount=frameCount)
@@ -0,0 +1,47 @@
+import pytest
+
+from ..libs import callbudget
+
+
+class FnCounted(object):
+
+    def outer(self):
+
+        return self.inner() + 1
+
+    def inner(self):
+
+        return 1
+
+
+def test_instrument_counts_outermost_calls():
+
+    cls = callbudget.instrument(FnCounted)
+    assert callbudget.instrument(FnCounted) is cls
+    assert callbudget.instrument(cls) is cls
+    assert issubclass(cls, FnCounted) and cls.__name__ == FnCounted.__name__
+
+    fnCounted = cls()
+    fnCounted.outer()
+
+    with callbudget.counting('test') as counter:
+
+        fnCounted.outer()
+        fnCounted.inner()
+
+    assert counter.calls() == {'outer': 1, 'inner': 1}
+
+
+def test_allowance_per_frame():
+
+    assert callbudget.getAllowance((1, 2), 10, frameCount=5) == 12
+    assert callbudget.getAllowance((1, 2, 3, 4), 10, frameCount=5) == 10 + 2 + 15 + 200
+
+    counter = callbudget.CallCounter('QTimeTab')
+    counter.record('setTime', amount=23)
+
+    with pytest.raises(callbudget.BudgetError):
+
+        callbudget.assertBudget(counter, 4, frameCount=10)
+
+    callbudget.assertBudget(counter, 4, frameCount=11)
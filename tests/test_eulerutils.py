@@ -0,0 +1,31 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from ..libs import eulerutils
+
+
+@pytest.mark.parametrize('rotationOrder', list(eulerutils.RotationOrder))
+def test_compose_decompose_eulers(rotationOrder):
+
+    rng = numpy.random.default_rng(int(rotationOrder))
+    angles = rng.uniform(-1.5, 1.5, (32, 3))
+
+    rotations = eulerutils.composeEulers(angles, rotationOrder=rotationOrder)
+    numpy.testing.assert_allclose(eulerutils.decomposeEulers(rotations, rotationOrder=rotationOrder), angles, atol=1e-9)
+
+
+@pytest.mark.parametrize('rotationOrder', list(eulerutils.RotationOrder))
+def test_unwrap_eulers(rotationOrder):
+
+    rng = numpy.random.default_rng(int(rotationOrder))
+    angles = numpy.cumsum(rng.uniform(-0.3, 0.3, (2, 64, 3)), axis=1)
+
+    rotations = eulerutils.composeEulers(angles, rotationOrder=rotationOrder)
+    matrices = numpy.tile(numpy.eye(4), (2, 64, 1, 1))
+    matrices[..., :3, :3] = rotations
+
+    unwrapped = eulerutils.unwrapEulers(eulerutils.getEulers(matrices, rotationOrder), rotationOrder, previous=angles[:, 0])
+
+    numpy.testing.assert_allclose(eulerutils.composeEulers(unwrapped, rotationOrder=rotationOrder), rotations, atol=1e-9)
+    assert numpy.abs(numpy.diff(unwrapped, axis=1)).max() < 1.0
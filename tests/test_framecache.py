@@ -0,0 +1,76 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+pytest.importorskip('dcc')
+
+from ..libs import framecache
+
+
+class FnHandle(object):
+
+    def __init__(self, handle, version=None):
+
+        self._handle = handle
+        self._version = version
+
+    def handle(self):
+
+        return self._handle
+
+
+def sampleMatrices(count, offset=0.0):
+
+    matrices = numpy.tile(numpy.eye(4), (count, 1, 1))
+    matrices[:, 3, :3] = numpy.arange(count)[:, None] + offset
+
+    return matrices
+
+
+def test_get_put_merges_frames():
+
+    cache = framecache.FrameCache()
+    node = FnHandle(1)
+
+    cache.put(node, 'worldMatrix', numpy.array([0.0, 2.0]), sampleMatrices(2))
+    cache.put(node, 'worldMatrix', numpy.array([1.0]), sampleMatrices(1, offset=5.0))
+
+    matrices, found = cache.get(node, 'worldMatrix', numpy.array([0.0, 1.0, 2.0, 3.0]))
+
+    numpy.testing.assert_array_equal(found, [True, True, True, False])
+    numpy.testing.assert_array_equal(matrices[:, 3, 0], [0.0, 5.0, 1.0, 0.0])
+    assert cache.hits == 3 and cache.misses == 1
+
+
+def test_least_recently_used_evicted():
+
+    entrySize = framecache.FrameEntry(frames=numpy.zeros(4), matrices=sampleMatrices(4)).nbytes
+    cache = framecache.FrameCache(budget=entrySize * 2)
+
+    first, second, third = FnHandle(1), FnHandle(2), FnHandle(3)
+    frames = numpy.arange(4.0)
+
+    cache.put(first, 'worldMatrix', frames, sampleMatrices(4))
+    cache.put(second, 'worldMatrix', frames, sampleMatrices(4))
+    cache.get(first, 'worldMatrix', frames)
+
+    cache.put(third, 'worldMatrix', frames, sampleMatrices(4))
+
+    assert len(cache) == 2 and cache.size == entrySize * 2
+    assert cache.get(first, 'worldMatrix', frames)[1].all()
+    assert not cache.get(second, 'worldMatrix', frames)[1].any()
+
+    cache.budget = entrySize
+    assert len(cache) == 1 and cache.get(first, 'worldMatrix', frames)[1].all()
+
+
+def test_stale_version_discarded():
+
+    cache = framecache.FrameCache()
+    node = FnHandle(1)
+    frames = numpy.arange(3.0)
+
+    cache.put(node, 'worldMatrix', frames, sampleMatrices(3), version=1)
+
+    assert cache.get(node, 'worldMatrix', frames, version=1)[1].all()
+    assert not cache.get(node, 'worldMatrix', frames, version=2)[1].any()
+    assert len(cache) == 0 and cache.size == 0
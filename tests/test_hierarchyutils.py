@@ -0,0 +1,51 @@
+import pytest
+
+pytest.importorskip('dcc')
+
+from ..libs import hierarchyutils, fnpool
+
+
+def getHierarchy(handles, **kwargs):
+
+    with fnpool.borrow('FnNode', *handles) as fnNodes:
+
+        return hierarchyutils.getSelectedHierarchy(fnNodes, **kwargs)
+
+
+def test_nested_through_unselected_parents(scene):
+
+    root = scene.createNode('root')
+    chain = scene.createChain(4, parent=root)
+    leaf = scene.createNode('leaf', parent=chain[-1])
+    sibling = scene.createNode('sibling', parent=root)
+
+    parents, ancestors = getHierarchy([leaf, chain[0], root, sibling])
+
+    assert parents == [-1, 2, -1, 2]
+    assert ancestors == [[1, 2], [2], [], [2]]
+
+
+def test_shared_parents_walked_once(scene):
+
+    chain = scene.createChain(10)
+    leaves = [scene.createNode(f'leaf{i}', parent=chain[-1]) for i in range(5)]
+
+    scene.resetCalls()
+    parents, ancestors = getHierarchy(leaves + [chain[0]])
+
+    assert ancestors == [[5]] * 5 + [[]]
+    assert scene.calls['parent'] == len(chain) + len(leaves)
+
+
+def test_walk_stops_at_max_depth(scene):
+
+    chain = scene.createChain(8)
+    leaves = [scene.createNode(f'leaf{i}', parent=chain[-1]) for i in range(3)]
+
+    scene.resetCalls()
+    parents, ancestors = getHierarchy(leaves + [chain[0]], maxDepth=4)
+
+    assert ancestors == [[]] * 4
+    assert scene.calls['parent'] == len(leaves) * 5 + 1
+
+    assert getHierarchy(leaves + [chain[0]], maxDepth=7)[1] == [[3]] * 3 + [[]]
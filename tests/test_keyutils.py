@@ -0,0 +1,42 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+
+from ..libs import keyutils
+
+
+def sampleCurves(frames):
+
+    return numpy.stack([numpy.sin(frames * 0.2), numpy.cos(frames * 0.15) * 2.0, frames * 0.1], axis=-1)[None]
+
+
+@pytest.mark.parametrize('hermite', [False, True])
+def test_reduce_keys_within_tolerance(hermite):
+
+    frames = numpy.arange(60.0)
+    values = sampleCurves(frames)
+    tangents = keyutils.getTangents(frames, values) if hermite else None
+
+    mask = keyutils.reduceKeys(frames, values, tolerance=0.01, tangents=tangents)
+
+    assert mask[0, 0] and mask[0, -1] and mask.sum() < len(frames)
+    assert numpy.abs(keyutils.evaluateKeys(frames, values, tangents, mask) - values).max() <= 0.01
+
+
+def test_reduce_keys_linear_segments():
+
+    frames = numpy.arange(21.0)
+    values = numpy.abs(frames - 10.0)[None, :, None]
+
+    mask = keyutils.reduceKeys(frames, values, tolerance=1e-6)
+
+    numpy.testing.assert_array_equal(numpy.flatnonzero(mask[0]), [0, 10, 20])
+
+
+def test_key_indices():
+
+    mask = numpy.array([[True, False, False, True, False, True]])
+    previous, following = keyutils.getKeyIndices(mask)
+
+    numpy.testing.assert_array_equal(previous, [[0, 0, 0, 3, 3, 5]])
+    numpy.testing.assert_array_equal(following, [[3, 3, 3, 5, 5, 5]])
@@ -0,0 +1,62 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+pytest.importorskip('dcc')
+
+from ..libs import matrixarray
+from ..libs.benchmarks import randomMatrices
+
+
+class SequenceMatrix(object):
+
+    def __init__(self, array):
+
+        self._rows = numpy.asarray(array).tolist()
+
+    def __len__(self):
+
+        return len(self._rows)
+
+    def __getitem__(self, index):
+
+        return self._rows[index]
+
+
+class IndexedMatrix(object):
+
+    def __init__(self, array):
+
+        self._rows = numpy.asarray(array).tolist()
+
+    def __getitem__(self, index):
+
+        return self._rows[index]
+
+
+@pytest.mark.parametrize(('cls', 'converter'), [(SequenceMatrix, matrixarray.sequenceArray), (IndexedMatrix, matrixarray.indexArray)])
+def test_to_array_converter(cls, converter):
+
+    array = randomMatrices(1, seed=1)[0]
+    array[:, 3] = (0.5, 0.25, 0.125, 1.0)
+
+    numpy.testing.assert_array_equal(matrixarray.toArray(cls(array)), array)
+    assert matrixarray.__converters__[cls] is converter
+
+
+def test_to_matrix_round_trip():
+
+    array = randomMatrices(1, seed=2)[0]
+    numpy.testing.assert_array_equal(matrixarray.toArray(matrixarray.toMatrix(array)), array)
+
+
+def test_axes_keep_scale():
+
+    matrices = matrixarray.MatrixArray(randomMatrices(3, seed=3))
+    matrices.array[:, :3, :3] *= 2.0
+
+    xAxis, yAxis, zAxis, position = matrices.axes()
+    numpy.testing.assert_allclose(numpy.linalg.norm(yAxis, axis=1), 2.0)
+
+    xAxis, yAxis, zAxis, position = matrices.axes(normalize=True)
+    numpy.testing.assert_allclose(numpy.linalg.norm(zAxis, axis=1), 1.0)
+    numpy.testing.assert_array_equal(position, matrices.translation())
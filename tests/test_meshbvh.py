@@ -0,0 +1,83 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+pytest.importorskip('dcc')
+
+from ..libs import meshbvh, meshutils, fnpool
+
+
+def createSurface(scene, rows=12, columns=12, seed=0):
+
+    handle = scene.createGrid('surface', rows, columns, size=4.0)
+    mesh = scene.mesh(handle)
+
+    points = mesh.points.copy()
+    points[:, 1] = numpy.random.default_rng(seed).uniform(-0.25, 0.25, len(points))
+    mesh.points = points
+
+    return handle
+
+
+def getTriangles(scene, handle):
+
+    mesh = scene.mesh(handle)
+    triangles, faceIndices = meshutils.triangulate(mesh.faceVertexCounts, mesh.faceVertexIndices)
+
+    return mesh.points[triangles]
+
+
+def test_closest_point_matches_brute_force(scene):
+
+    handle = createSurface(scene)
+    trianglePoints = getTriangles(scene, handle)
+
+    with fnpool.borrow('FnMesh', handle) as (fnMesh,):
+
+        bvh = meshbvh.getMeshBVH(fnMesh)
+
+    for point in numpy.random.default_rng(1).uniform(-3.0, 3.0, (32, 3)):
+
+        closestPoint, normal, faceIndex, distance = bvh.closestPoint(point)
+        points, squaredDistances = meshbvh.closestPointsOnTriangles(point, trianglePoints)
+
+        assert distance == pytest.approx(numpy.sqrt(squaredDistances.min()), abs=1e-9)
+
+
+def test_raycast_matches_brute_force(scene):
+
+    handle = createSurface(scene)
+    trianglePoints = getTriangles(scene, handle)
+
+    with fnpool.borrow('FnMesh', handle) as (fnMesh,):
+
+        bvh = meshbvh.getMeshBVH(fnMesh)
+
+    direction = numpy.array([0.0, -1.0, 0.0])
+
+    for origin in numpy.random.default_rng(2).uniform(-1.9, 1.9, (32, 3)) + [0.0, 5.0, 0.0]:
+
+        hitPoint, normal, faceIndex, distance = bvh.raycast(origin, direction)
+        assert distance == pytest.approx(meshbvh.intersectTriangles(origin, direction, trianglePoints).min(), abs=1e-9)
+
+
+def test_hierarchy_cached_until_mesh_changes(scene):
+
+    handle = createSurface(scene)
+
+    with fnpool.borrow('FnMesh', handle) as (fnMesh,):
+
+        bvh = meshbvh.getMeshBVH(fnMesh)
+
+        scene.resetCalls()
+        assert meshbvh.getMeshBVH(fnMesh) is bvh
+
+        calls = dict(scene.calls)
+
+        mesh = scene.mesh(handle)
+        points = mesh.points.copy()
+        points[-1] += 1.0
+        mesh.points = points
+
+        assert meshbvh.getMeshBVH(fnMesh) is not bvh
+
+    assert sum(calls.values()) == 1 and calls.get('iterFaceVertexIndices', 0) == 0
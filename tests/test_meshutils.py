@@ -0,0 +1,128 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+pytest.importorskip('dcc')
+
+from ..libs import meshutils, matrixutils, fnpool
+
+
+def createTent(scene):
+
+    points = numpy.array([[-1.0, 0.0, 0.0], [-1.0, 0.0, 1.0], [0.0, 1.0, 0.0], [0.0, 1.0, 1.0], [1.0, 0.0, 0.0], [1.0, 0.0, 1.0]])
+    return scene.createMesh('tent', points, faceVertexCounts=[4, 4], faceVertexIndices=[0, 1, 3, 2, 2, 3, 5, 4])
+
+
+@pytest.mark.parametrize('weighting', list(meshutils.NormalWeighting))
+def test_averaged_normal_ridge(scene, weighting):
+
+    handle = createTent(scene)
+    scene.selectVertices(handle, [2, 3])
+
+    normal = matrixutils.getAveragedNormal(handle, weighting=weighting)
+
+    numpy.testing.assert_allclose(numpy.abs([normal.x, normal.y, normal.z]), [0.0, 1.0, 0.0], atol=1e-9)
+
+
+def test_averaged_normal_defaults_to_vertex_normals(scene):
+
+    handle = createTent(scene)
+    scene.selectVertices(handle, [0])
+
+    normal = matrixutils.getAveragedNormal(handle)
+    expected = matrixutils.getAveragedNormal(handle, weighting=meshutils.NormalWeighting.VERTEX)
+
+    numpy.testing.assert_allclose([normal.x, normal.y, normal.z], [expected.x, expected.y, expected.z], atol=1e-9)
+    assert scene.calls['iterVertexNormals'] == 2
+
+
+def test_averaged_normal_reads_selected_faces(scene):
+
+    handle = scene.createGrid('grid', 10, 10)
+    scene.selectFaces(handle, [0, 1])
+
+    scene.resetCalls()
+    normal = matrixutils.getAveragedNormal(handle, weighting=meshutils.NormalWeighting.AREA)
+
+    numpy.testing.assert_allclose(abs(normal.y), 1.0, atol=1e-9)
+    assert scene.calls['getFaceVertexArrays'] == 0 and scene.calls['iterFaceVertexIndices'] == 1
+
+
+def test_averaged_normal_caches_topology(scene):
+
+    meshutils.clearCache()
+
+    handle = scene.createGrid('grid', 10, 10)
+    scene.selectVertices(handle, [12])
+
+    first = matrixutils.getAveragedNormal(handle, weighting=meshutils.NormalWeighting.ANGLE)
+    reads = scene.calls['getFaceVertexArrays'] + scene.calls['iterFaceVertexIndices']
+
+    second = matrixutils.getAveragedNormal(handle, weighting=meshutils.NormalWeighting.ANGLE)
+
+    assert reads == 1 and scene.calls['getFaceVertexArrays'] + scene.calls['iterFaceVertexIndices'] == reads
+    numpy.testing.assert_allclose([first.x, first.y, first.z], [second.x, second.y, second.z])
+
+
+class FnStreamedMesh(object):
+
+    def __init__(self, points):
+
+        self.points = points
+        self.calls = []
+
+    def getVertices(self, *indices, worldSpace=False):
+
+        self.calls.append(len(indices))
+        return [self.points[index].tolist() for index in indices]
+
+
+def test_vertex_points_streamed_in_chunks(monkeypatch):
+
+    monkeypatch.setattr(meshutils, '__chunk_size__', 4)
+
+    mesh = FnStreamedMesh(numpy.random.default_rng(0).uniform(-1.0, 1.0, (10, 3)))
+    indices = numpy.array([9, 0, 3, 3, 7, 1, 2, 8, 5, 4, 6])
+
+    numpy.testing.assert_array_equal(meshutils.getVertexPoints(mesh, indices), mesh.points[indices])
+    assert mesh.calls == [4, 4, 3]
+
+
+def test_oriented_bounds_rotated_box():
+
+    rng = numpy.random.default_rng(3)
+    localPoints = rng.uniform([-3.0, -1.0, -0.5], [3.0, 1.0, 0.5], (500, 3))
+
+    angle = 0.3
+    rotation = numpy.array([[numpy.cos(angle), numpy.sin(angle), 0.0], [-numpy.sin(angle), numpy.cos(angle), 0.0], [0.0, 0.0, 1.0]])
+    points = (localPoints @ rotation) + [1.0, 2.0, 3.0]
+
+    frame, minPoint, maxPoint = meshutils.getOrientedBounds(points)
+
+    numpy.testing.assert_allclose(frame[:3, :3] @ frame[:3, :3].T, numpy.identity(3), atol=1e-9)
+    numpy.testing.assert_allclose(numpy.abs(frame[0, :3]), numpy.abs(rotation[0]), atol=0.05)
+    numpy.testing.assert_allclose(maxPoint - minPoint, [6.0, 2.0, 1.0], atol=0.1)
+
+    extents = (points - frame[3, :3]) @ frame[:3, :3].T
+    assert (extents >= minPoint - 1e-9).all() and (extents <= maxPoint + 1e-9).all()
+
+
+def test_oriented_bounds_cached_until_mesh_changes(scene):
+
+    handle = scene.createGrid('grid', 8, 8, size=2.0)
+
+    with fnpool.borrow('FnMesh', handle) as (fnMesh,):
+
+        bounds = meshutils.getMeshOrientedBounds(fnMesh)
+
+        scene.resetCalls()
+        assert meshutils.getMeshOrientedBounds(fnMesh) is bounds
+
+        calls = dict(scene.calls)
+
+        mesh = scene.mesh(handle)
+        mesh.points = mesh.points * 2.0
+
+        frame, minPoint, maxPoint = meshutils.getMeshOrientedBounds(fnMesh)
+
+    assert sum(calls.values()) == 1
+    numpy.testing.assert_allclose(maxPoint - minPoint, (bounds[2] - bounds[1]) * 2.0, atol=1e-9)
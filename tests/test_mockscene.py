@@ -0,0 +1,193 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+pytest.importorskip('dcc')
+
+from ..libs import alignutils, aimutils, matrixutils, matrixarray, bakeutils, eulerutils, keyutils
+from ..libs.benchmarks import randomMatrices
+
+
+def rotationMatrices(angles, axis=2):
+
+    eulers = numpy.zeros((len(angles), 3))
+    eulers[:, axis] = angles
+
+    matrices = numpy.tile(numpy.eye(4), (len(angles), 1, 1))
+    matrices[:, :3, :3] = eulerutils.composeEulers(eulers)
+
+    return matrices
+
+
+def createLinks(scene, count, name, seed=0):
+
+    matrices = randomMatrices(count, seed=seed)
+    matrices[:, :3, :3] = rotationMatrices(numpy.random.default_rng(seed).uniform(-1.0, 1.0, count))[:, :3, :3]
+
+    handles = []
+
+    for (index, matrix) in enumerate(matrices):
+
+        handles.append(scene.createNode(f'{name}{index}', parent=handles[-1] if index > 0 else None, matrix=matrix))
+
+    return handles
+
+
+def test_align_one_to_many(scene):
+
+    source, *targets = scene.createNodes([f'node{i}' for i in range(5)], matrices=randomMatrices(5, seed=1))
+    alignutils.alignTransforms([source], targets)
+
+    for target in targets:
+
+        numpy.testing.assert_allclose(scene.worldMatrix(target), scene.worldMatrix(source), atol=1e-9)
+
+
+def test_align_pairs(scene):
+
+    handles = scene.createNodes([f'node{i}' for i in range(6)], matrices=randomMatrices(6, seed=2))
+    sources, targets = alignutils.splitSelection(handles, alignMode=1)
+
+    alignutils.alignTransforms(sources, targets)
+
+    for (source, target) in zip(sources, targets):
+
+        numpy.testing.assert_allclose(scene.worldMatrix(target), scene.worldMatrix(source), atol=1e-9)
+
+
+def test_align_unwraps_eulers(scene):
+
+    source, target = scene.createNodes(['source', 'target'], matrices=rotationMatrices([3.3, 3.0]))
+    alignutils.alignTransforms([source], [target])
+
+    numpy.testing.assert_allclose(scene.eulerRotation(target), [0.0, 0.0, 3.3], atol=1e-9)
+    numpy.testing.assert_allclose(scene.worldMatrix(target), scene.worldMatrix(source), atol=1e-9)
+
+
+def lookAtSequential(scene, handles, preserveChildren=False):
+
+    for (start, end) in zip(handles[:-1], handles[1:]):
+
+        origin = scene.worldMatrix(start)[3, :3]
+        forward = scene.worldMatrix(end)[3, :3] - origin
+
+        aimMatrix = matrixarray.MatrixArray.fromTranslations(origin[None])
+        aimMatrix.lookAt(forwardVector=forward[None], upVector=numpy.array([[0.0, 1.0, 0.0]]))
+
+        matrix = aimMatrix.array[0] @ numpy.linalg.inv(scene.parentMatrix(start))
+
+        children = scene.children(start)
+        snapshot = [scene.worldMatrix(child) for child in children]
+
+        localMatrix = scene.matrix(start)
+        scale = numpy.linalg.norm(localMatrix[:3, :3], axis=1)
+        localMatrix[:3, :3] = matrixarray.normalizeVectors(matrix[:3, :3]) * scale[:, None]
+
+        scene.setLocalMatrix(start, localMatrix)
+
+        if preserveChildren:
+
+            for (child, worldMatrix) in zip(children, snapshot):
+
+                scene.setWorldMatrix(child, worldMatrix)
+
+
+@pytest.mark.parametrize('preserveChildren', [False, True])
+def test_aim_chain_matches_sequential(scene, fnScene, preserveChildren):
+
+    chain = createLinks(scene, 5, 'chain', seed=3)
+    sequence = createLinks(scene, 5, 'sequence', seed=3)
+
+    aimutils.aimTransforms(chain, fnScene, preserveChildren=preserveChildren)
+    lookAtSequential(scene, sequence, preserveChildren=preserveChildren)
+
+    for (link, expected) in zip(chain, sequence):
+
+        numpy.testing.assert_allclose(scene.worldMatrix(link), scene.worldMatrix(expected), atol=1e-9)
+
+
+@pytest.mark.parametrize('maintainOffset', [False, True])
+def test_matrix_apply(scene, maintainOffset):
+
+    handles = scene.createNodes([f'node{i}' for i in range(6)], matrices=randomMatrices(6, seed=4))
+    matrix = randomMatrices(1, seed=5)[0]
+
+    worldMatrices = numpy.array([scene.worldMatrix(handle) for handle in handles])
+    matrixutils.applyMatrix(handles, matrix, maintainOffset=maintainOffset)
+
+    expected = (worldMatrices @ numpy.linalg.inv(worldMatrices[0]) @ matrix) if maintainOffset else numpy.broadcast_to(matrix, worldMatrices.shape)
+
+    for (handle, expectedMatrix) in zip(handles, expected):
+
+        numpy.testing.assert_allclose(scene.worldMatrix(handle), expectedMatrix, atol=1e-9)
+
+
+@pytest.mark.parametrize('scene', [False, True], ids=['fallback', 'bulk'], indirect=True)
+@pytest.mark.parametrize('tolerance', [None, 0.01])
+def test_bake(scene, fnScene, tolerance):
+
+    source, target = scene.createNodes(['source', 'target'], matrices=randomMatrices(2, seed=6))
+
+    times = numpy.arange(0.0, 31.0, 10.0)
+    scene.setKeys(source, times, randomMatrices(len(times), seed=7))
+
+    allScale = (True, True, True)
+    bakeutils.bakeTransforms([source], [target], startFrame=0, endFrame=30, matchScale=allScale, tolerance=tolerance, scene=fnScene)
+
+    keyTimes = scene.keys(target)[0]
+
+    if tolerance is None:
+
+        numpy.testing.assert_array_equal(keyTimes, numpy.arange(31.0))
+
+    else:
+
+        assert len(keyTimes) < 31 and keyTimes[0] == 0.0 and keyTimes[-1] == 30.0
+
+    for frame in range(31):
+
+        fnScene.setTime(frame)
+        numpy.testing.assert_allclose(scene.worldMatrix(target), scene.worldMatrix(source), atol=1e-9 if tolerance is None else tolerance)
+
+
+def test_bake_fallback_reduces_keys(scene, fnScene):
+
+    source, target = scene.createNodes(['source', 'target'], matrices=randomMatrices(2, seed=6))
+
+    times = numpy.arange(0.0, 31.0, 10.0)
+    scene.setKeys(source, times, randomMatrices(len(times), seed=7))
+
+    frames = numpy.arange(31.0)
+    worldMatrices = numpy.array([scene.evaluate(source, frame) for frame in frames])
+    expected = keyutils.reduceKeys(frames, keyutils.getChannels(worldMatrices[None]), tolerance=0.01)
+
+    scene.resetCalls()
+
+    allScale = (True, True, True)
+    bakeutils.bakeTransforms([source], [target], startFrame=0, endFrame=30, matchScale=allScale, tolerance=0.01, scene=fnScene)
+
+    keyTimes = scene.keys(target)[0]
+
+    numpy.testing.assert_array_equal(keyTimes, frames[expected[0]])
+    assert len(keyTimes) < 31 and scene.calls['keyTransform'] == len(keyTimes)
+
+    for frame in frames:
+
+        fnScene.setTime(frame)
+        numpy.testing.assert_allclose(scene.worldMatrix(target), scene.worldMatrix(source), atol=0.01)
+
+
+@pytest.mark.parametrize('scene', [False, True], ids=['fallback', 'bulk'], indirect=True)
+def test_bake_unwraps_eulers(scene, fnScene):
+
+    source, target = scene.createNodes(['source', 'target'])
+
+    frames = numpy.arange(48.0)
+    angles = frames * 0.2
+    scene.setKeys(source, frames, rotationMatrices(angles))
+
+    bakeutils.bakeTransforms([source], [target], startFrame=0, endFrame=47, scene=fnScene)
+
+    eulers = scene.eulerKeys(target)[1]
+
+    numpy.testing.assert_allclose(eulers[:, 2], angles, atol=1e-9)
+    numpy.testing.assert_allclose(eulers[:, :2], 0.0, atol=1e-9)
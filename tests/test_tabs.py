@@ -0,0 +1,69 @@
+import pytest
+
+numpy = pytest.importorskip('numpy')
+pytest.importorskip('dcc')
+
+
+@pytest.fixture
+def application():
+    """
+    Returns the running Qt application, creating one if required.
+
+    :rtype: QtWidgets.QApplication
+    """
+
+    QtWidgets = pytest.importorskip('Qt.QtWidgets')
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_matrix_tab_debounced(scene, fnScene, application, monkeypatch):
+
+    from dcc.dataclasses import vector
+    from ..ui.tabs import qmatrixtab
+
+    tab = qmatrixtab.QMatrixTab(scene=fnScene)
+    calls = []
+
+    composeMatrix = qmatrixtab.matrixutils.composeMatrix
+    monkeypatch.setattr(qmatrixtab.matrixutils, 'composeMatrix', lambda *args, **kwargs: calls.append(args) or composeMatrix(*args, **kwargs))
+
+    tab.forwardAxis, tab.upAxis = 0, 1
+    tab.origin = vector.Vector(1.0, 2.0, 3.0)
+    tab.forwardVector = vector.Vector(0.0, 0.0, 1.0)
+
+    assert tab.isDirty() and len(calls) == 0
+
+    tab.matrix()
+    tab.matrix()
+
+    assert not tab.isDirty() and len(calls) == 1
+
+    tab.upVector = vector.Vector(1.0, 0.0, 0.0)
+    tab.origin = vector.Vector(0.0, 0.0, 0.0)
+    application.processEvents()
+
+    assert not tab.isDirty() and len(calls) == 2
+
+
+def test_tabs_constructed_lazily(scene, application, tmp_path):
+
+    pytest.importorskip('dcc.ui.qsingletonwindow')
+    from Qt import QtCore
+    from ..ui import qezalign
+
+    window = qezalign.QEzAlign()
+
+    assert len(list(window.iterTabs())) == 0
+
+    settings = QtCore.QSettings(str(tmp_path / 'ezalign.ini'), QtCore.QSettings.IniFormat)
+    settings.setValue('editor/currentTabIndex', 2)
+
+    window.loadSettings(settings)
+
+    assert window.currentTabIndex() == 2 and window.matrixTab is not None
+    assert (window.alignTab, window.aimTab, window.timeTab) == (None, None, None)
+
+    window.setCurrentTabIndex(3)
+
+    assert window.timeTab is not None and window.currentTab() is window.timeTab
+    assert (window.alignTab, window.aimTab) == (None, None) and len(list(window.iterTabs())) == 2
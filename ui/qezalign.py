@@ -1,6 +1,8 @@
 from Qt import QtCore, QtWidgets, QtGui
+from dcc import fnqt
 from dcc.ui import qsingletonwindow, qdropdownbutton, qpersistentmenu
-from .tabs import qaligntab, qaimtab, qmatrixtab
+from .tabs import qaligntab, qaimtab, qmatrixtab, qtimetab
+from ..libs import fnpool, profiler
 
 import logging
 logging.basicConfig()
@@ -14,6 +16,13 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
     """
 
     # region Dunderscores
+    __tabs__ = (
+        ('Align', 'alignTab', qaligntab.QAlignTab),
+        ('Aim', 'aimTab', qaimtab.QAimTab),
+        ('Matrix', 'matrixTab', qmatrixtab.QMatrixTab),
+        ('Time', 'timeTab', qtimetab.QTimeTab)
+    )
+
     def __init__(self, *args, **kwargs):
         """
         Private method called after a new instance has been created.
@@ -27,12 +36,19 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
         #
         super(QEzAlign, self).__init__(*args, **kwargs)
 
+        # Declare private variables
+        #
+        self._qt = fnqt.FnQt()
+        self._scene = fnpool.createScene()
+        self._settings = None
+
         # Declare public variables
         #
         self.tabControl = None
         self.alignTab = None
         self.aimTab = None
         self.matrixTab = None
+        self.timeTab = None
 
         self.buttonsWidget = None
         self.buttonsLayout = None
@@ -42,6 +58,7 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
         self.applyMenu = None
         self.preserveChildrenAction = None
         self.freezeTransformAction = None
+        self.profileAction = None
 
     def __setup_ui__(self, *args, **kwargs):
         """
@@ -67,19 +84,25 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
         self.setCentralWidget(centralWidget)
 
         # Initialize tab widget
+        # Tabs are only constructed once they are activated!
         #
         self.tabControl = QtWidgets.QTabWidget(parent=self)
         self.tabControl.setObjectName('tabControl')
         self.tabControl.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding))
-        self.tabControl.currentChanged.connect(self.on_tabControl_currentChanged)
 
-        self.alignTab = qaligntab.QAlignTab(parent=self.tabControl)
-        self.aimTab = qaimtab.QAimTab(parent=self.tabControl)
-        self.matrixTab = qmatrixtab.QMatrixTab(parent=self.tabControl)
+        for (title, name, cls) in self.__tabs__:
 
-        self.tabControl.addTab(self.alignTab, 'Align')
-        self.tabControl.addTab(self.aimTab, 'Aim')
-        self.tabControl.addTab(self.matrixTab, 'Matrix')
+            pageLayout = QtWidgets.QVBoxLayout()
+            pageLayout.setObjectName(f'{name}Layout')
+            pageLayout.setContentsMargins(0, 0, 0, 0)
+
+            page = QtWidgets.QWidget()
+            page.setObjectName(f'{name}Page')
+            page.setLayout(pageLayout)
+
+            self.tabControl.addTab(page, title)
+
+        self.tabControl.currentChanged.connect(self.on_tabControl_currentChanged)
 
         centralLayout.addWidget(self.tabControl)
 
@@ -133,7 +156,14 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
         self.freezeTransformAction.setObjectName('freezeTransformAction')
         self.freezeTransformAction.setCheckable(True)
 
+        self.profileAction = QtWidgets.QAction('&Profile Apply', self.applyMenu)
+        self.profileAction.setObjectName('profileAction')
+        self.profileAction.setCheckable(True)
+        self.profileAction.toggled.connect(self.on_profileAction_toggled)
+
         self.applyMenu.addActions([self.preserveChildrenAction, self.freezeTransformAction])
+        self.applyMenu.addSeparator()
+        self.applyMenu.addAction(self.profileAction)
 
         self.applyPushButton.setMenu(self.applyMenu)
     # endregion
@@ -184,6 +214,29 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
         if isinstance(freezeTransform, bool):
 
             self.freezeTransformAction.setChecked(freezeTransform)
+
+    @property
+    def profile(self):
+        """
+        Getter method used to return the profile flag.
+
+        :rtype: bool
+        """
+
+        return self.profileAction.isChecked()
+
+    @profile.setter
+    def profile(self, profile):
+        """
+        Setter method used to update the profile flag.
+
+        :type profile: bool
+        :rtype: None
+        """
+
+        if isinstance(profile, bool):
+
+            self.profileAction.setChecked(profile)
     # endregion
 
     # region Methods
@@ -200,15 +253,22 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
         super(QEzAlign, self).loadSettings(settings)
 
         # Load user settings
+        # Tab settings are loaded once each tab is constructed
         #
-        self.setCurrentTabIndex(settings.value('editor/currentTabIndex', defaultValue=0, type=int))
+        self._settings = settings
+        self.profile = bool(settings.value('editor/profile', defaultValue=0, type=int))
 
-        # Load tab settings
-        #
         for tab in self.iterTabs():
 
             tab.loadSettings(settings)
 
+        self.setCurrentTabIndex(settings.value('editor/currentTabIndex', defaultValue=0, type=int))
+
+        # Construct the restored tab and initialize its tooltips
+        # The current changed signal is not emitted if the restored index matches the default!
+        #
+        self.on_tabControl_currentChanged(self.currentTabIndex())
+
     def saveSettings(self, settings):
         """
         Saves the user settings.
@@ -226,6 +286,7 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
         settings.setValue('editor/currentTabIndex', self.currentTabIndex())
         settings.setValue('editor/preserveChildren', int(self.preserveChildren))
         settings.setValue('editor/freezeTransform', int(self.freezeTransform))
+        settings.setValue('editor/profile', int(self.profile))
 
         # Save tab settings
         #
@@ -233,6 +294,45 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
 
             tab.saveSettings(settings)
 
+    def ensureTab(self, index):
+        """
+        Returns the tab widget at the specified index.
+        If the tab has not been constructed yet then it is created and its settings are loaded.
+
+        :type index: int
+        :rtype: Union[QAbstractTab, None]
+        """
+
+        # Check if index is in range
+        #
+        if not (0 <= index < len(self.__tabs__)):
+
+            return None
+
+        # Check if tab already exists
+        #
+        title, name, cls = self.__tabs__[index]
+        tab = getattr(self, name)
+
+        if tab is not None:
+
+            return tab
+
+        # Construct tab using the shared function sets
+        #
+        page = self.tabControl.widget(index)
+
+        tab = cls(parent=page, qt=self._qt, scene=self._scene)
+        page.layout().addWidget(tab)
+
+        setattr(self, name, tab)
+
+        if self._settings is not None:
+
+            tab.loadSettings(self._settings)
+
+        return tab
+
     def currentTab(self):
         """
         Returns the tab widget that is currently open.
@@ -240,7 +340,7 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
         :rtype: QAbstractTab
         """
 
-        return self.tabControl.currentWidget()
+        return self.ensureTab(self.currentTabIndex())
 
     def currentTabIndex(self):
         """
@@ -266,26 +366,31 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
     def iterTabs(self):
         """
         Returns a generator that yields tab widgets.
+        Tabs that have not been constructed yet are skipped!
 
         :rtype: iter
         """
 
-        for i in range(self.tabControl.count()):
+        for (title, name, cls) in self.__tabs__:
 
-            yield self.tabControl.widget(i)
+            tab = getattr(self, name)
+
+            if tab is not None:
+
+                yield tab
     # endregion
 
     # region Slots
     @QtCore.Slot(int)
     def on_tabControl_currentChanged(self, index):
         """
-        Adds the tooltip to apply and okay buttons.
+        Constructs the activated tab and adds its tooltip to the apply and okay buttons.
 
         :type index: int
         :rtype: None
         """
 
-        tab = self.sender().widget(index)
+        tab = self.ensureTab(index)
         isValidTab = isinstance(tab, QtWidgets.QWidget)
 
         hasButtons = isinstance(self.applyPushButton, QtWidgets.QPushButton) and isinstance(self.okayPushButton, QtWidgets.QPushButton)
@@ -306,9 +411,31 @@ class QEzAlign(qsingletonwindow.QSingletonWindow):
 
         currentTab = self.currentTab()
 
-        if currentTab is not None:
+        if currentTab is None:
+
+            return
+
+        # Apply operation and report profile
+        #
+        profile = currentTab.profiledApply(preserveChildren=self.preserveChildren, freezeTransform=self.freezeTransform)
+
+        if profile is not None:
+
+            summary = profile.summary()
+
+            log.info(summary)
+            self.statusBar().showMessage(summary)
+
+    @QtCore.Slot(bool)
+    def on_profileAction_toggled(self, checked):
+        """
+        Toggled slot method responsible for enabling apply profiling.
+
+        :type checked: bool
+        :rtype: None
+        """
 
-            currentTab.apply(preserveChildren=self.preserveChildren, freezeTransform=self.freezeTransform)
+        profiler.setEnabled(checked)
 
     @QtCore.Slot(bool)
     def on_okayPushButton_clicked(self, checked=False):
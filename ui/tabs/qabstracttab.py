@@ -1,7 +1,8 @@
 from Qt import QtCore, QtWidgets, QtGui
 from abc import abstractmethod
-from dcc import fnqt, fnscene
+from dcc import fnqt
 from dcc.ui.abstract import qabcmeta
+from ...libs import fnpool, profiler, callbudget
 
 import logging
 logging.basicConfig()
@@ -18,20 +19,28 @@ class QAbstractTab(QtWidgets.QWidget, metaclass=qabcmeta.QABCMeta):
     def __init__(self, *args, **kwargs):
         """
         Private method called after a new instance has been created.
+        Function sets can be shared between tabs by supplying them through the `qt` and `scene` keywords.
 
         :key parent: QtWidgets.QWidget
         :key f: QtCore.Qt.WindowFlags
+        :key qt: fnqt.FnQt
+        :key scene: fnscene.FnScene
         :rtype: None
         """
 
         # Call parent method
         #
+        qt = kwargs.pop('qt', None)
+        scene = kwargs.pop('scene', None)
+
         super(QAbstractTab, self).__init__(*args, **kwargs)
 
         # Declare private variables
         #
-        self._qt = fnqt.FnQt()
-        self._scene = fnscene.FnScene()
+        self._qt = fnqt.FnQt() if qt is None else qt
+        self._scene = fnpool.createScene() if scene is None else scene
+        self._lastProfile = None
+        self._lastCalls = None
 
     def __post_init__(self, *args, **kwargs):
         """
@@ -40,6 +49,9 @@ class QAbstractTab(QtWidgets.QWidget, metaclass=qabcmeta.QABCMeta):
         :rtype: None
         """
 
+        kwargs.pop('qt', None)
+        kwargs.pop('scene', None)
+
         self.__setup_ui__(*args, **kwargs)
 
     @abstractmethod
@@ -73,9 +85,38 @@ class QAbstractTab(QtWidgets.QWidget, metaclass=qabcmeta.QABCMeta):
         """
 
         return self._scene
+
+    @property
+    def lastProfile(self):
+        """
+        Getter method that returns the profile from the last profiled apply.
+
+        :rtype: Union[profiler.Profiler, None]
+        """
+
+        return self._lastProfile
+
+    @property
+    def lastCalls(self):
+        """
+        Getter method that returns the scene calls made by the last profiled apply.
+
+        :rtype: Union[callbudget.CallCounter, None]
+        """
+
+        return self._lastCalls
     # endregion
 
     # region Methods
+    def getActiveSelection(self):
+        """
+        Returns the active selection from the scene.
+
+        :rtype: List[Any]
+        """
+
+        return self.scene.getActiveSelection()
+
     def loadSettings(self, settings):
         """
         Loads the user settings.
@@ -107,4 +148,37 @@ class QAbstractTab(QtWidgets.QWidget, metaclass=qabcmeta.QABCMeta):
         """
 
         pass
+
+    def profiledApply(self, preserveChildren=False, freezeTransform=False, force=False):
+        """
+        Applies the alignment operation while recording the duration of each phase and the scene calls it makes.
+        If profiling is disabled, and not forced, then the operation is applied without any instrumentation and none is returned.
+
+        :type preserveChildren: bool
+        :type freezeTransform: bool
+        :type force: bool
+        :rtype: Union[profiler.Profiler, None]
+        """
+
+        # Check if profiling is enabled
+        #
+        if not (profiler.isEnabled() or force):
+
+            self.apply(preserveChildren=preserveChildren, freezeTransform=freezeTransform)
+            return None
+
+        # Apply operation with instrumented function sets
+        #
+        operation = self.__class__.__name__
+
+        with callbudget.counting(operation, self.scene) as counter, profiler.profile(operation, force=True) as profile:
+
+            self.apply(preserveChildren=preserveChildren, freezeTransform=freezeTransform)
+
+        profile.count('scene calls', counter.total())
+
+        self._lastCalls = counter
+        self._lastProfile = profile
+
+        return profile
     # endregion
@@ -1,10 +1,10 @@
 import json
 
 from Qt import QtCore, QtWidgets, QtGui
-from dcc import fntransform
 from dcc.dataclasses import vector, transformationmatrix
 from dcc.ui import qvectoredit
 from . import qabstracttab
+from ...libs import aimutils, querycache, fnpool, profiler
 
 import logging
 logging.basicConfig()
@@ -41,7 +41,7 @@ class QAimTab(qabstracttab.QAbstractTab):
         #
         self._forwardAxis = -1
         self._upAxis = -1
-        self._worldUpObject = fntransform.FnTransform()
+        self._worldUpObject = fnpool.getPool().getClass('FnTransform')()
 
     def __setup_ui__(self, *args, **kwargs):
         """
@@ -474,24 +474,7 @@ class QAimTab(qabstracttab.QAbstractTab):
         :rtype: vector.Vector
         """
 
-        # Get forward vector between nodes
-        #
-        startNode = fntransform.FnTransform(start)
-        endNode = fntransform.FnTransform(end)
-
-        startPoint = startNode.translation(worldSpace=True)
-        endPoint = endNode.translation(worldSpace=True)
-        forwardVector = endPoint - startPoint
-
-        # Check if vector should be normalized
-        #
-        if normalize:
-
-            return forwardVector.normalize()
-
-        else:
-
-            return forwardVector
+        return aimutils.forwardVector(start, end, normalize=normalize)
 
     def upVector(self, start, end, normalize=False):
         """
@@ -503,27 +486,13 @@ class QAimTab(qabstracttab.QAbstractTab):
         :rtype: vector.Vector
         """
 
-        # Inspect world up type
-        #
-        if self.worldUpType == 0:  # Scene
-
-            return self.sceneUpVector()
-
-        elif self.worldUpType == 1:  # Object
-
-            return self.worldUpObjectVector(start)
-
-        elif self.worldUpType == 2:  # Object Rotation Up
-
-            return self.worldUpObjectRotationVector()
-
-        elif self.worldUpType == 3:  # Vector
-
-            return self.worldUpVector.normal()
-
-        else:
-
-            raise RuntimeError('upVector() expects a valid world up type (%s given)!' % self.worldUpType)
+        return aimutils.upVector(
+            start,
+            self.scene,
+            worldUpType=self.worldUpType,
+            worldUpVector=self.worldUpVector,
+            worldUpObject=self.worldUpObject
+        )
 
     def perpendicularVector(self, nodes):
         """
@@ -534,35 +503,7 @@ class QAimTab(qabstracttab.QAbstractTab):
         :rtype: vector.Vector
         """
 
-        # Verify there are enough nodes
-        #
-        numNodes = len(nodes)
-
-        if not (numNodes >= 3):
-
-            log.warning('perpendicularVector() expects at least 3 nodes (%s given)!' % numNodes)
-            return
-
-        # Iterate through nodes
-        #
-        startNode = fntransform.FnTransform(nodes[0])
-        endNode = fntransform.FnTransform()
-
-        origin = startNode.translation(worldSpace=True)
-        vectors = []
-
-        for (startObj, endObj) in zip(nodes[1:-1], nodes[2:]):
-
-            startNode.setObject(startObj)
-            endNode.setObject(endObj)
-
-            startPoint = startNode.translation(worldSpace=True)
-            endPoint = endNode.translation(worldSpace=True)
-
-            cross = (startPoint - origin).normalize() ^ (endPoint - origin).normalize()
-            vectors.append(cross)
-
-        return self.averageVectors(vectors, normalize=True)
+        return aimutils.perpendicularVector(nodes)
 
     def axisVector(self, node, axis):
         """
@@ -573,10 +514,7 @@ class QAimTab(qabstracttab.QAbstractTab):
         :rtype: vector.Vector
         """
 
-        worldMatrix = fntransform.FnTransform(node).worldMatrix()
-        rows = worldMatrix.decompose(normalize=True)
-
-        return rows[axis]
+        return aimutils.axisVector(node, axis)
 
     def averageVectors(self, vectors, normalize=False):
         """
@@ -587,13 +525,7 @@ class QAimTab(qabstracttab.QAbstractTab):
         :rtype: vector.Vector
         """
 
-        vec = sum(vectors) / len(vectors)
-
-        if normalize:
-
-            vec.normalize()
-
-        return vec
+        return aimutils.averageVectors(vectors, normalize=normalize)
 
     def remainingAxis(self):
         """
@@ -611,10 +543,7 @@ class QAimTab(qabstracttab.QAbstractTab):
         :rtype: vector.Vector
         """
 
-        upAxis = self.scene.getUpAxis()
-        index = self.__axes__.index(upAxis.lower())
-
-        return self.__axis_vectors__[index].copy()
+        return aimutils.sceneUpVector(self.scene)
 
     def worldUpObjectVector(self, start, normalize=False):
         """
@@ -625,31 +554,7 @@ class QAimTab(qabstracttab.QAbstractTab):
         :rtype: vector.Vector
         """
 
-        # Check if world up object is valid
-        #
-        worldUpObjectVector = self.worldUpVector.copy()
-
-        if self.worldUpObject.isValid():
-
-            startNode = fntransform.FnTransform(start)
-            startPoint = startNode.translation(worldSpace=True)
-            endPoint = self.worldUpObject.translation(worldSpace=True)
-
-            worldUpObjectVector = (endPoint - startPoint)
-
-        else:
-
-            log.warning('Unable to locate world up object!')
-
-        # Check if vector should be normalized
-        #
-        if normalize:
-
-            return worldUpObjectVector.normalize()
-
-        else:
-
-            return worldUpObjectVector
+        return aimutils.worldUpObjectVector(start, self.worldUpObject, self.worldUpVector, normalize=normalize)
 
     def worldUpObjectRotationVector(self):
         """
@@ -659,16 +564,7 @@ class QAimTab(qabstracttab.QAbstractTab):
         :rtype: vector.Vector
         """
 
-        if self.worldUpObject.isValid():
-
-            worldMatrix = self.worldUpObjectMatrix()
-            xAxis, yAxis, zAxis, position = worldMatrix.decompose(normalize=True)
-
-            return ((xAxis * self.worldUpVector.x) + (yAxis * self.worldUpVector.y) + (zAxis * self.worldUpVector.z)).normalize()
-
-        else:
-
-            return self.worldUpVector.normal()
+        return aimutils.worldUpObjectRotationVector(self.worldUpObject, self.worldUpVector)
 
     def worldUpObjectMatrix(self):
         """
@@ -678,15 +574,7 @@ class QAimTab(qabstracttab.QAbstractTab):
         :rtype: transformationmatrix.TransformationMatrix
         """
 
-        # Check if world up object is alive
-        #
-        if self.worldUpObject.isValid():
-
-            return self.worldUpObject.worldMatrix()
-
-        else:
-
-            return transformationmatrix.TransformationMatrix()
+        return aimutils.worldUpObjectMatrix(self.worldUpObject)
 
     def apply(self, preserveChildren=False, freezeTransform=False):
         """
@@ -700,63 +588,36 @@ class QAimTab(qabstracttab.QAbstractTab):
 
         # Get active selection
         #
-        selection = self.scene.getActiveSelection()
-        selectionCount = len(selection)
+        with profiler.phase('selection'):
+
+            selection = self.getActiveSelection()
+            selectionCount = len(selection)
 
         if not selectionCount >= 2:
 
             log.warning(f'apply() expects at least two selected node ({selectionCount} given)!')
             return
 
-        # Iterate through selection
+        # Aim selection
         #
-        startNode = fntransform.FnTransform()
-        endNode = fntransform.FnTransform()
-
-        for (startObj, endObj) in zip(selection[:-1], selection[1:]):  # Make sure to skip the last item!
-
-            # Attach selected node pairs to function sets
-            #
-            isValidStartNode = startNode.trySetObject(startObj)
-            isValidEndNode = endNode.trySetObject(endObj)
-
-            if not (isValidStartNode and isValidEndNode):
-
-                continue
-
-            # Get origin, forward and up vectors
-            #
-            origin = startNode.translation(worldSpace=True)
-            forwardVector = self.forwardVector(startObj, endObj, normalize=True)
-            upVector = self.upVector(startObj, endObj, normalize=True)
-
-            # Compose aim matrix in parent space
-            #
-            matrix = transformationmatrix.TransformationMatrix(row4=origin)
-            matrix.lookAt(
-                forwardVector=forwardVector, forwardAxis=self.forwardAxis, forwardAxisSign=self.forwardAxisSign,
-                upVector=upVector, upAxis=self.upAxis, upAxisSign=self.upAxisSign,
-            )
-
-            matrix *= startNode.parentInverseMatrix()
-
-            # Apply matrix to start node
-            # Best to skip scale since we could accidentally zero it out
-            #
-            log.info('Applying aim matrix to: %s' % startNode.name())
-
-            startNode.snapshot()
-            startNode.setMatrix(matrix, skipTranslate=True, skipScale=True)
-
-            if freezeTransform:
-
-                startNode.freezeTransform()
-
-            # Check if children should be preserved
-            #
-            if preserveChildren:
-
-                startNode.assumeSnapshot()
+        cache = querycache.QueryCache()
+
+        aimutils.aimTransforms(
+            selection,
+            self.scene,
+            forwardAxis=self.forwardAxis,
+            forwardAxisSign=self.forwardAxisSign,
+            upAxis=self.upAxis,
+            upAxisSign=self.upAxisSign,
+            worldUpType=self.worldUpType,
+            worldUpVector=self.worldUpVector,
+            worldUpObject=self.worldUpObject,
+            preserveChildren=preserveChildren,
+            freezeTransform=freezeTransform,
+            cache=cache
+        )
+
+        log.debug(f'Scene queries: {cache.stats()}')
     # endregion
 
     # region Slots
@@ -808,7 +669,7 @@ class QAimTab(qabstracttab.QAbstractTab):
 
         # Get active selection
         #
-        selection = self.scene.getActiveSelection()
+        selection = self.getActiveSelection()
         selectionCount = len(selection)
 
         worldUpVector = vector.Vector()
@@ -846,7 +707,7 @@ class QAimTab(qabstracttab.QAbstractTab):
 
         # Inspect active selection
         #
-        selection = self.scene.getActiveSelection()
+        selection = self.getActiveSelection()
         selectionCount = len(selection)
 
         if selectionCount != 1:
@@ -1,9 +1,8 @@
 import json
 
 from Qt import QtCore, QtWidgets, QtGui
-from dcc import fntransform
-from dcc.dataclasses import transformationmatrix
 from . import qabstracttab
+from ...libs import alignutils, scenesnapshot
 
 import logging
 logging.basicConfig()
@@ -26,13 +25,50 @@ class QAlignTab(qabstracttab.QAbstractTab):
 
         # Initialize widget
         #
-        self.setWhatsThis('Select the node to copy from then the node to paste to.')
+        self.setWhatsThis('Select the node to copy from then the nodes to paste to, or interleaved source and target pairs.')
 
         # Initialize central layout
         #
         centralLayout = QtWidgets.QVBoxLayout()
         self.setLayout(centralLayout)
 
+        # Initialize mode group-box
+        #
+        self.modeLayout = QtWidgets.QHBoxLayout()
+        self.modeLayout.setObjectName('modeLayout')
+
+        self.modeGroupBox = QtWidgets.QGroupBox('Selection Mode:')
+        self.modeGroupBox.setObjectName('modeGroupBox')
+        self.modeGroupBox.setLayout(self.modeLayout)
+        self.modeGroupBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum))
+        self.modeGroupBox.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.oneToManyRadioButton = QtWidgets.QRadioButton('One-to-Many')
+        self.oneToManyRadioButton.setObjectName('oneToManyRadioButton')
+        self.oneToManyRadioButton.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.oneToManyRadioButton.setFixedHeight(24)
+        self.oneToManyRadioButton.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.oneToManyRadioButton.setChecked(True)
+        self.oneToManyRadioButton.setToolTip('Copies the first selected node onto all remaining selected nodes.')
+
+        self.pairsRadioButton = QtWidgets.QRadioButton('Pairs')
+        self.pairsRadioButton.setObjectName('pairsRadioButton')
+        self.pairsRadioButton.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.pairsRadioButton.setFixedHeight(24)
+        self.pairsRadioButton.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.pairsRadioButton.setToolTip('Copies each source onto the node selected after it: source1, target1, source2, target2...')
+
+        self.modeRadioButtonGroup = QtWidgets.QButtonGroup(self.modeGroupBox)
+        self.modeRadioButtonGroup.setObjectName('modeRadioButtonGroup')
+        self.modeRadioButtonGroup.setExclusive(True)
+        self.modeRadioButtonGroup.addButton(self.oneToManyRadioButton, id=0)
+        self.modeRadioButtonGroup.addButton(self.pairsRadioButton, id=1)
+
+        self.modeLayout.addWidget(self.oneToManyRadioButton)
+        self.modeLayout.addWidget(self.pairsRadioButton)
+
+        centralLayout.addWidget(self.modeGroupBox)
+
         # Initialize translation group-box
         #
         self.translationLayout = QtWidgets.QHBoxLayout()
@@ -130,6 +166,15 @@ class QAlignTab(qabstracttab.QAbstractTab):
         self.sourceLayout.addWidget(self.sourcePivotRadioButton)
         self.sourceLayout.addWidget(self.sourceMaxRadioButton)
 
+        self.sourceOrientedCheckBox = QtWidgets.QCheckBox('Oriented')
+        self.sourceOrientedCheckBox.setObjectName('sourceOrientedCheckBox')
+        self.sourceOrientedCheckBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.sourceOrientedCheckBox.setFixedHeight(24)
+        self.sourceOrientedCheckBox.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.sourceOrientedCheckBox.setToolTip("Uses the mesh's oriented bounding box for the minimum, center and maximum points.")
+
+        self.sourceLayout.addWidget(self.sourceOrientedCheckBox)
+
         # Initialize target object group-box
         #
         self.targetLayout = QtWidgets.QVBoxLayout()
@@ -183,6 +228,15 @@ class QAlignTab(qabstracttab.QAbstractTab):
         self.targetLayout.addWidget(self.targetPivotRadioButton)
         self.targetLayout.addWidget(self.targetMaxRadioButton)
 
+        self.targetOrientedCheckBox = QtWidgets.QCheckBox('Oriented')
+        self.targetOrientedCheckBox.setObjectName('targetOrientedCheckBox')
+        self.targetOrientedCheckBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.targetOrientedCheckBox.setFixedHeight(24)
+        self.targetOrientedCheckBox.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.targetOrientedCheckBox.setToolTip("Uses the mesh's oriented bounding box for the minimum, center and maximum points.")
+
+        self.targetLayout.addWidget(self.targetOrientedCheckBox)
+
         # Initialize source/target object layout
         #
         self.objectLayout = QtWidgets.QHBoxLayout()
@@ -280,6 +334,29 @@ class QAlignTab(qabstracttab.QAbstractTab):
     # endregion
 
     # region Properties
+    @property
+    def alignMode(self):
+        """
+        Getter method that returns the align mode.
+
+        :rtype: int
+        """
+
+        return self.modeRadioButtonGroup.checkedId()
+
+    @alignMode.setter
+    def alignMode(self, alignMode):
+        """
+        Setter method that updates the align mode.
+
+        :type alignMode: int
+        :rtype: None
+        """
+
+        if isinstance(alignMode, int):
+
+            self.modeRadioButtonGroup.buttons()[alignMode].setChecked(True)
+
     @property
     def sourceType(self):
         """
@@ -288,7 +365,7 @@ class QAlignTab(qabstracttab.QAbstractTab):
         :rtype: int
         """
 
-        return self.sourceRadioButtonGroup.checkedId()
+        return int(alignutils.setOriented(self.sourceRadioButtonGroup.checkedId(), self.sourceOrientedCheckBox.isChecked()))
 
     @sourceType.setter
     def sourceType(self, sourceType):
@@ -301,7 +378,8 @@ class QAlignTab(qabstracttab.QAbstractTab):
 
         if isinstance(sourceType, int):
 
-            self.sourceRadioButtonGroup.buttons()[sourceType].setChecked(True)
+            self.sourceOrientedCheckBox.setChecked(alignutils.isOrientedBoundingBoxOffset(sourceType))
+            self.sourceRadioButtonGroup.buttons()[alignutils.setOriented(sourceType, False)].setChecked(True)
 
     @property
     def targetType(self):
@@ -311,7 +389,7 @@ class QAlignTab(qabstracttab.QAbstractTab):
         :rtype: int
         """
 
-        return self.targetRadioButtonGroup.checkedId()
+        return int(alignutils.setOriented(self.targetRadioButtonGroup.checkedId(), self.targetOrientedCheckBox.isChecked()))
 
     @targetType.setter
     def targetType(self, targetType):
@@ -324,7 +402,8 @@ class QAlignTab(qabstracttab.QAbstractTab):
 
         if isinstance(targetType, int):
 
-            self.targetRadioButtonGroup.buttons()[targetType].setChecked(True)
+            self.targetOrientedCheckBox.setChecked(alignutils.isOrientedBoundingBoxOffset(targetType))
+            self.targetRadioButtonGroup.buttons()[alignutils.setOriented(targetType, False)].setChecked(True)
     # endregion
 
     # region Methods
@@ -336,6 +415,7 @@ class QAlignTab(qabstracttab.QAbstractTab):
         :rtype: None
         """
 
+        self.alignMode = settings.value('tabs/align/alignMode', defaultValue=0, type=int)
         self.sourceType = settings.value('tabs/align/sourceType', defaultValue=2, type=int)
         self.targetType = settings.value('tabs/align/targetType', defaultValue=2, type=int)
 
@@ -351,6 +431,7 @@ class QAlignTab(qabstracttab.QAbstractTab):
         :rtype: None
         """
 
+        settings.setValue('tabs/align/alignMode', self.alignMode)
         settings.setValue('tabs/align/sourceType', self.sourceType)
         settings.setValue('tabs/align/targetType', self.targetType)
 
@@ -421,193 +502,52 @@ class QAlignTab(qabstracttab.QAbstractTab):
 
             self.scaleCheckBoxGroup.button(index).setChecked(match)
 
-    def getSourceInput(self):
-        """
-        Evaluates the active selection to return the source input.
-        Please be aware that bounding boxes are returned in world space!
-
-        :rtype: Tuple[fntransform.FnTransform, transformationmatrix.TransformationMatrix]
-        """
-
-        # Get selection list
-        #
-        selection = self.scene.getActiveSelection()
-        selectionCount = len(selection)
-
-        if selectionCount != 2:
-
-            raise TypeError('getSourceInput() expects to 2 selected nodes!')
-
-        # Attach source object to function set
-        #
-        sourceNode = fntransform.FnTransform()
-        success = sourceNode.trySetObject(selection[0])
-
-        if not success:
-
-            raise TypeError('getSourceInput() expects a transform node!')
-
-        # Evaluate source type for offset matrix
-        #
-        worldMatrix = sourceNode.worldMatrix()
-        offsetMatrix = transformationmatrix.TransformationMatrix()
-
-        if self.sourceType == 0:  # Minimum
-
-            boundingBox = sourceNode.boundingBox()
-            translateMatrix = transformationmatrix.TransformationMatrix(row4=boundingBox.min)
-
-            offsetMatrix = (translateMatrix * worldMatrix.inverse()).translationPart()
-
-        elif self.sourceType == 1:  # Center
-
-            boundingBox = sourceNode.boundingBox()
-            centerPoint = (boundingBox.min * 0.5) + (boundingBox.max * 0.5)
-            translateMatrix = transformationmatrix.TransformationMatrix(row4=centerPoint)
-
-            offsetMatrix = (translateMatrix * worldMatrix.inverse()).translationPart()
-
-        elif self.sourceType == 2:  # Pivot Point
-
-            pass
-
-        elif self.sourceType == 3:  # Maximum
-
-            boundingBox = sourceNode.boundingBox()
-            translateMatrix = transformationmatrix.TransformationMatrix(row4=boundingBox.max)
-
-            offsetMatrix = (translateMatrix * worldMatrix.inverse()).translationPart()
-
-        else:
-
-            pass
-
-        # Return results
-        #
-        return sourceNode, offsetMatrix
-
-    def getTargetInput(self):
+    def getSelectionInput(self, transaction):
         """
-        Evaluates the active selection to return the target input.
-        Please be aware that bounding boxes are returned in world space!
+        Evaluates the active selection to return the source and target nodes based on the align mode.
 
-        :rtype: Tuple[fntransform.FnTransform, transformationmatrix.TransformationMatrix]
+        :type transaction: scenesnapshot.ReadTransaction
+        :rtype: Tuple[List[Any], List[Any]]
         """
 
-        # Get selection list
-        #
-        selection = self.scene.getActiveSelection()
-        selectionCount = len(selection)
-
-        if selectionCount != 2:
-
-            raise TypeError('getTargetInput() expects to 2 selected nodes!')
-
-        # Attach source object to function set
-        #
-        targetNode = fntransform.FnTransform()
-        success = targetNode.trySetObject(selection[1])
-
-        if not success:
-
-            raise TypeError('getTargetInput() expects a transform node!')
-
-        # Evaluate source type for offset matrix
-        #
-        worldMatrix = targetNode.worldMatrix()
-        offsetMatrix = transformationmatrix.TransformationMatrix()
-
-        if self.targetType == 0:  # Minimum
-
-            boundingBox = targetNode.boundingBox()
-            translateMatrix = transformationmatrix.TransformationMatrix(row4=boundingBox.min)
-
-            offsetMatrix = (translateMatrix * worldMatrix.inverse()).translationPart()
-
-        elif self.targetType == 1:  # Center
-
-            boundingBox = targetNode.boundingBox()
-            centerPoint = (boundingBox.min * 0.5) + (boundingBox.max * 0.5)
-            translateMatrix = transformationmatrix.TransformationMatrix(row4=centerPoint)
-
-            offsetMatrix = (translateMatrix * worldMatrix.inverse()).translationPart()
-
-        elif self.targetType == 2:  # Pivot Point
-
-            pass
-
-        elif self.targetType == 3:  # Maximum
-
-            boundingBox = targetNode.boundingBox()
-            translateMatrix = transformationmatrix.TransformationMatrix(row4=boundingBox.max)
-
-            offsetMatrix = (translateMatrix * worldMatrix.inverse()).translationPart()
-
-        else:
-
-            pass
-
-        # Return results
-        #
-        return targetNode, offsetMatrix
+        selection = transaction.selection()
+        return alignutils.splitSelection(selection, alignMode=self.alignMode)
 
     def apply(self, preserveChildren=False, freezeTransform=False):
         """
         Aligns the active selection.
-        The selection order consisting of the source to copy from followed by the target to copy to.
+        The selection order consisting of the source to copy from followed by the targets to copy to.
+        Alternatively, pairs mode expects interleaved source and target nodes.
 
         :type preserveChildren: bool
         :type freezeTransform: bool
         :rtype: None
         """
 
-        # Try and evaluate selection
+        # Try and align selection
         #
         try:
 
-            # Get source and target objects
-            #
-            sourceNode, sourceOffsetMatrix = self.getSourceInput()
-            targetNode, targetOffsetMatrix = self.getTargetInput()
-
-            log.info(f'Copying from: {sourceNode.name()}, pasting to {targetNode.name()}')
-
-            # Calculate source transform in target parent space
-            # Don't forget to include the offset matrices!
-            #
-            sourceWorldMatrix = sourceNode.worldMatrix()
-            targetParentInverseMatrix = targetNode.parentInverseMatrix()
-
-            targetMatrix = (targetOffsetMatrix * (sourceOffsetMatrix * sourceWorldMatrix) * targetParentInverseMatrix)
-
-            # Copy transform matrix
-            #
-            skipTranslateX, skipTranslateY, skipTranslateZ = (not x for x in self.matchTranslate())
-            skipRotateX, skipRotateY, skipRotateZ = (not x for x in self.matchRotate())
-            skipScaleX, skipScaleY, skipScaleZ = (not x for x in self.matchScale())
-
-            targetNode.snapshot()
-            targetNode.setMatrix(
-                targetMatrix,
-                skipTranslateX=skipTranslateX, skipTranslateY=skipTranslateY, skipTranslateZ=skipTranslateZ,
-                skipRotateX=skipRotateX, skipRotateY=skipRotateY, skipRotateZ=skipRotateZ,
-                skipScaleX=skipScaleX, skipScaleY=skipScaleY, skipScaleZ=skipScaleZ
+            transaction = scenesnapshot.ReadTransaction(scene=self.scene)
+            sources, targets = self.getSelectionInput(transaction)
+
+            alignutils.alignTransforms(
+                sources,
+                targets,
+                sourceType=self.sourceType,
+                targetType=self.targetType,
+                matchTranslate=self.matchTranslate(),
+                matchRotate=self.matchRotate(),
+                matchScale=self.matchScale(),
+                preserveChildren=preserveChildren,
+                freezeTransform=freezeTransform,
+                transaction=transaction
             )
 
-            # Check if transform should be frozen
-            #
-            if freezeTransform:
-
-                targetNode.freezeTransform()
-
-            # Check if children should be preserved
-            #
-            if preserveChildren:
-
-                targetNode.assumeSnapshot()
-
         except TypeError as exception:
 
             log.warning(exception)
             return
+
+        log.debug(f'Scene queries: {transaction.cache.stats()}')
     # endregion
@@ -1,10 +1,10 @@
 import json
 
 from Qt import QtCore, QtWidgets, QtGui
-from dcc import fnnode, fntransform, fnmesh
-from dcc.dataclasses import vector, boundingbox, transformationmatrix
+from dcc.dataclasses import vector
 from dcc.ui import qmatrixedit
 from . import qabstracttab
+from ...libs import matrixutils, meshutils, querycache, profiler
 
 import logging
 logging.basicConfig()
@@ -41,6 +41,12 @@ class QMatrixTab(qabstracttab.QAbstractTab):
         self._forwardVector = vector.Vector.xAxis
         self._upAxis = -1
         self._upVector = vector.Vector.yAxis
+        self._isDirty = False
+
+        self._revalidateTimer = QtCore.QTimer(self)
+        self._revalidateTimer.setSingleShot(True)
+        self._revalidateTimer.setInterval(0)
+        self._revalidateTimer.timeout.connect(self.revalidate)
 
     def __setup_ui__(self, *args, **kwargs):
         """
@@ -51,7 +57,7 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
         # Initialize widget
         #
-        self.setWhatsThis('Select the node to paste the transformation matrix onto.')
+        self.setWhatsThis('Select the nodes to paste the transformation matrix onto.')
 
         # Initialize central layout
         #
@@ -74,7 +80,7 @@ class QMatrixTab(qabstracttab.QAbstractTab):
         self.originPushButton.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
         self.originPushButton.setFixedHeight(24)
         self.originPushButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.originPushButton.setToolTip('Averages the position of the selected nodes or mesh components.')
+        self.originPushButton.setToolTip('Averages the position of the selected nodes or mesh components.\nShift snaps the origin to the closest surface, Alt raycasts it along the forward vector.')
         self.originPushButton.clicked.connect(self.on_originPushButton_clicked)
 
         self.matrixEdit = qmatrixedit.QMatrixEdit()
@@ -83,7 +89,15 @@ class QMatrixTab(qabstracttab.QAbstractTab):
         self.matrixEdit.setRowLabels(['X-Axis:', 'Y-Axis:', 'Z-Axis:', 'Origin:'])
         self.matrixEdit.replaceLabel(3, self.originPushButton)
 
+        self.maintainOffsetCheckBox = QtWidgets.QCheckBox('Maintain Offset')
+        self.maintainOffsetCheckBox.setObjectName('maintainOffsetCheckBox')
+        self.maintainOffsetCheckBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.maintainOffsetCheckBox.setFixedHeight(24)
+        self.maintainOffsetCheckBox.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.maintainOffsetCheckBox.setToolTip('Moves the first selected node onto the matrix while the remaining nodes maintain their offsets from it.')
+
         self.matrixLayout.addWidget(self.matrixEdit)
+        self.matrixLayout.addWidget(self.maintainOffsetCheckBox)
 
         centralLayout.addWidget(self.matrixGroupBox)
 
@@ -103,7 +117,7 @@ class QMatrixTab(qabstracttab.QAbstractTab):
         self.forwardAxisPushButton.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed))
         self.forwardAxisPushButton.setFixedHeight(24)
         self.forwardAxisPushButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.forwardAxisPushButton.setToolTip('Calculates the forward vector from the active selection relative to the origin.')
+        self.forwardAxisPushButton.setToolTip('Calculates the forward vector from the active selection relative to the origin.\nCtrl copies the node axis, Alt averages the selected normals and Shift copies the closest surface normal.')
         self.forwardAxisPushButton.clicked.connect(self.on_forwardAxisPushButton_clicked)
 
         self.forwardXRadioButton = QtWidgets.QRadioButton('X')
@@ -155,7 +169,7 @@ class QMatrixTab(qabstracttab.QAbstractTab):
         self.upAxisPushButton.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed))
         self.upAxisPushButton.setFixedHeight(24)
         self.upAxisPushButton.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.upAxisPushButton.setToolTip('Calculates the up vector from the active selection relative to the origin.')
+        self.upAxisPushButton.setToolTip('Calculates the up vector from the active selection relative to the origin.\nCtrl copies the node axis, Alt averages the selected normals and Shift copies the closest surface normal.')
         self.upAxisPushButton.clicked.connect(self.on_upAxisPushButton_clicked)
 
         self.upXRadioButton = QtWidgets.QRadioButton('X')
@@ -190,6 +204,41 @@ class QMatrixTab(qabstracttab.QAbstractTab):
         self.upAxisLayout.addWidget(self.upZRadioButton, alignment=QtCore.Qt.AlignCenter)
 
         centralLayout.addWidget(self.upAxisGroupBox)
+
+        # Initialize normals group-box
+        #
+        self.normalsLayout = QtWidgets.QHBoxLayout()
+        self.normalsLayout.setObjectName('normalsLayout')
+
+        self.normalsGroupBox = QtWidgets.QGroupBox('Normals:')
+        self.normalsGroupBox.setObjectName('normalsGroupBox')
+        self.normalsGroupBox.setLayout(self.normalsLayout)
+        self.normalsGroupBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding))
+        self.normalsGroupBox.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.normalWeightingLabel = QtWidgets.QLabel('Weight:')
+        self.normalWeightingLabel.setObjectName('normalWeightingLabel')
+        self.normalWeightingLabel.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed))
+        self.normalWeightingLabel.setFixedSize(QtCore.QSize(40, 24))
+        self.normalWeightingLabel.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+        self.normalWeightingLabel.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.normalWeightingComboBox = QtWidgets.QComboBox()
+        self.normalWeightingComboBox.setObjectName('normalWeightingComboBox')
+        self.normalWeightingComboBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.normalWeightingComboBox.setFixedHeight(24)
+        self.normalWeightingComboBox.addItems(['Uniform', 'Area', 'Angle', 'Vertex'])
+        self.normalWeightingComboBox.setItemData(0, 'Weighs every adjacent face equally.', role=QtCore.Qt.ToolTipRole)
+        self.normalWeightingComboBox.setItemData(1, 'Weighs every adjacent face by its surface area.', role=QtCore.Qt.ToolTipRole)
+        self.normalWeightingComboBox.setItemData(2, 'Weighs every adjacent face by its corner angle.', role=QtCore.Qt.ToolTipRole)
+        self.normalWeightingComboBox.setItemData(3, 'Averages the vertex normals from the DCC, including any hard edges or locked normals.', role=QtCore.Qt.ToolTipRole)
+        self.normalWeightingComboBox.setToolTip('Changes the weighting used to average normals when picking with the Alt modifier.')
+        self.normalWeightingComboBox.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.normalsLayout.addWidget(self.normalWeightingLabel)
+        self.normalsLayout.addWidget(self.normalWeightingComboBox)
+
+        centralLayout.addWidget(self.normalsGroupBox)
     # endregion
 
     # region Properties
@@ -322,6 +371,50 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
             self._upVector = vector.Vector(*upVector)
             self.invalidate()
+
+    @property
+    def normalWeighting(self):
+        """
+        Getter method that returns the normal weighting.
+
+        :rtype: int
+        """
+
+        return self.normalWeightingComboBox.currentIndex()
+
+    @normalWeighting.setter
+    def normalWeighting(self, normalWeighting):
+        """
+        Setter method that updates the normal weighting.
+
+        :type normalWeighting: int
+        :rtype: None
+        """
+
+        if isinstance(normalWeighting, int):
+
+            self.normalWeightingComboBox.setCurrentIndex(normalWeighting)
+
+    @property
+    def maintainOffset(self):
+        """
+        Getter method that returns the maintain offset flag.
+
+        :rtype: bool
+        """
+
+        return self.maintainOffsetCheckBox.isChecked()
+
+    @maintainOffset.setter
+    def maintainOffset(self, maintainOffset):
+        """
+        Setter method that updates the maintain offset flag.
+
+        :type maintainOffset: bool
+        :rtype: None
+        """
+
+        self.maintainOffsetCheckBox.setChecked(bool(maintainOffset))
     # endregion
 
     # region Methods
@@ -340,6 +433,9 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
         self.upAxis = settings.value('tabs/matrix/upAxis', defaultValue=1, type=int)
         self.upVector = json.loads(settings.value('tabs/matrix/upVector', defaultValue='[0.0, 1.0, 0.0]', type=str))
+
+        self.normalWeighting = settings.value('tabs/matrix/normalWeighting', defaultValue=int(meshutils.NormalWeighting.VERTEX), type=int)
+        self.maintainOffset = settings.value('tabs/matrix/maintainOffset', defaultValue=False, type=bool)
         
     def saveSettings(self, settings):
         """
@@ -357,6 +453,9 @@ class QMatrixTab(qabstracttab.QAbstractTab):
         settings.setValue('tabs/matrix/upAxis', self.upAxis)
         settings.setValue('tabs/matrix/upVector', json.dumps(self.upVector.toList()))
 
+        settings.setValue('tabs/matrix/normalWeighting', self.normalWeighting)
+        settings.setValue('tabs/matrix/maintainOffset', self.maintainOffset)
+
     def remainingAxis(self):
         """
         Getter method that returns the unused axis.
@@ -366,16 +465,46 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
         return [x for x in [0, 1, 2] if x not in (self.forwardAxis, self.upAxis)][0]
 
+    def isDirty(self):
+        """
+        Evaluates if the transformation matrix is waiting to be recomposed.
+
+        :rtype: bool
+        """
+
+        return self._isDirty
+
     def invalidate(self):
         """
         Invalidates the transformation matrix.
+        The matrix is recomposed at most once per event loop iteration, or sooner whenever `matrix` is requested.
+
+        :rtype: None
+        """
+
+        self._isDirty = True
+
+        if not self._revalidateTimer.isActive():
+
+            self._revalidateTimer.start()
+
+    def revalidate(self):
+        """
+        Recomposes the transformation matrix if it has been invalidated.
 
         :rtype: None
         """
 
         # Redundancy check
         #
-        if not ((0 <= self.forwardAxis < 3) and (0 <= self.upAxis < 3) and self.forwardAxis != self.upAxis):
+        if not self._isDirty:
+
+            return
+
+        self._isDirty = False
+        self._revalidateTimer.stop()
+
+        if not matrixutils.isValidAxes(self.forwardAxis, self.upAxis):
 
             return
 
@@ -385,14 +514,30 @@ class QMatrixTab(qabstracttab.QAbstractTab):
         log.debug(f'Forward Axis: {self.forwardAxis}, Forward Vector: {self.forwardVector}')
         log.debug(f'Up Axis: {self.upAxis}, Up Vector: {self.upVector}')
 
-        matrix = transformationmatrix.TransformationMatrix(row4=self.origin)
-        matrix.lookAt(forwardVector=self.forwardVector, forwardAxis=self.forwardAxis, upVector=self.upVector, upAxis=self.upAxis)
+        matrix = matrixutils.composeMatrix(
+            self.origin,
+            self.forwardVector,
+            self.upVector,
+            forwardAxis=self.forwardAxis,
+            upAxis=self.upAxis
+        )
 
         # Update matrix widget
         #
         log.debug(f'Matrix = {matrix}')
         self.matrixEdit.setMatrix(matrix)
 
+    def matrix(self):
+        """
+        Returns the transformation matrix from the matrix widget.
+        Any pending changes are recomposed first.
+
+        :rtype: transformationmatrix.TransformationMatrix
+        """
+
+        self.revalidate()
+        return self.matrixEdit.matrix()
+
     @staticmethod
     def getAxisVector(node, axis=0):
         """
@@ -400,14 +545,10 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
         :type node: Any
         :type axis: int
-        :rtype: transformationmatrix.TransformationMatrix
+        :rtype: vector.Vector
         """
 
-        fnTransform = fntransform.FnTransform(node)
-        worldMatrix = fnTransform.worldMatrix()
-        row = worldMatrix[axis]
-
-        return vector.Vector(row[0], row[1], row[2]).normalize()
+        return matrixutils.getAxisVector(node, axis=axis)
 
     def getCenterPosition(self):
         """
@@ -419,7 +560,7 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
         # Evaluate active selection
         #
-        selection = self.scene.getActiveSelection()
+        selection = self.getActiveSelection()
         selectionCount = len(selection)
 
         if selectionCount == 0:
@@ -427,81 +568,64 @@ class QMatrixTab(qabstracttab.QAbstractTab):
             log.warning('No transform nodes found in active selection!')
             return vector.Vector.zero
 
-        # Iterate through selection and expand bounding box
+        # Return bounding box center
         #
-        node = fnnode.FnNode()
-        transform = fntransform.FnTransform()
-        mesh = fnmesh.FnMesh()
-
-        boundingBox = boundingbox.BoundingBox()
-
-        for (index, obj) in enumerate(selection):
-
-            # Check if selection contains a component
-            #
-            node.setObject(obj)
-
-            if node.isMesh():
-
-                mesh.setObject(obj)
-                vertexIndices = mesh.selectedVertices()
-                vertexPoints = mesh.getVertices(*vertexIndices, worldSpace=True)
+        return matrixutils.getCenterPosition(selection)
 
-                boundingBox.expand(*vertexPoints)
-
-            elif node.isTransform():
+    def getAveragedNormal(self):
+        """
+        Returns the averaged normal vector from the selected components using the current normal weighting.
 
-                transform.setObject(obj)
-                translation = transform.translation(worldSpace=True)
+        :rtype: vector.Vector
+        """
 
-                boundingBox.expand(translation)
+        # Evaluate active selection
+        #
+        selection = self.getActiveSelection()
+        selectionCount = len(selection)
 
-            else:
+        if selectionCount != 1:
 
-                continue
+            log.warning('No meshes found in active selection!')
+            return vector.Vector(1.0, 0.0, 0.0)
 
-        # Return bounding box center
+        # Return averaged normal
         #
-        return boundingBox.center()
+        return matrixutils.getAveragedNormal(selection[0], weighting=self.normalWeighting)
 
-    def getAveragedNormal(self):
+    def getSurfacePoint(self, direction=None):
         """
-        Returns the averaged normal vector from the active selection.
+        Returns the closest surface position and normal on the selected meshes relative to the origin.
+        If a direction is supplied then the surface is raycast from the origin instead.
 
-        :rtype: numpy.array
+        :type direction: Union[vector.Vector, None]
+        :rtype: Union[Tuple[vector.Vector, vector.Vector], None]
         """
 
         # Evaluate active selection
         #
-        selection = self.scene.getActiveSelection()
+        selection = self.getActiveSelection()
         selectionCount = len(selection)
 
-        normal = vector.Vector(1.0, 0.0, 0.0)
-
-        if selectionCount != 1:
+        if selectionCount == 0:
 
             log.warning('No meshes found in active selection!')
-            return normal
+            return None
 
-        # Iterate through component selection
+        # Query mesh surfaces
         #
-        fnMesh = fnmesh.FnMesh()
-        success = fnMesh.trySetObject(selection[0])
+        result = matrixutils.getSurfacePoint(selection, self.origin, direction=direction)
 
-        if success:
+        if result is None:
 
-            vertexIndices = fnMesh.selectedVertices()
-            normals = list(fnMesh.iterVertexNormals(*vertexIndices))
+            log.warning('Unable to locate surface from origin!')
 
-            return (sum(normals) / len(normals)).normalize()
-
-        else:
-
-            return normal
+        return result
 
     def apply(self, preserveChildren=False, freezeTransform=False):
         """
         Aligns the active selection to the user defined matrix.
+        If maintain offset is enabled then the selected nodes keep their offsets from the first selected node.
 
         :type preserveChildren: bool
         :type freezeTransform: bool
@@ -510,41 +634,37 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
         # Get active selection
         #
-        selection = self.scene.getActiveSelection()
-        selectionCount = len(selection)
+        with profiler.phase('selection'):
 
-        if selectionCount != 1:
+            selection = self.getActiveSelection()
+            selectionCount = len(selection)
 
-            log.warning('apply() expects one selected node (%s given)!' % selectionCount)
+        if selectionCount == 0:
+
+            log.warning('apply() expects at least one selected node (%s given)!' % selectionCount)
             return
 
-        # Get exclusive matrix
+        # Apply matrix to selected nodes
         #
-        node = fntransform.FnTransform()
-        success = node.trySetObject(selection[0])
+        cache = querycache.QueryCache()
 
-        if success:
+        try:
 
-            # Compose matrix in parent space
-            #
-            parentInverseMatrix = node.parentInverseMatrix()
-            worldMatrix = self.matrixEdit.matrix()
-            matrix = worldMatrix * parentInverseMatrix
+            matrixutils.applyMatrix(
+                selection,
+                self.matrix(),
+                maintainOffset=self.maintainOffset,
+                preserveChildren=preserveChildren,
+                freezeTransform=freezeTransform,
+                cache=cache
+            )
 
-            node.snapshot()
-            node.setMatrix(matrix, skipScale=True, preserveChildren=preserveChildren)
+        except TypeError as exception:
 
-            # Check if transform should be frozen
-            #
-            if freezeTransform:
-
-                node.freezeTransform()
-
-            # Check if children should be preserved
-            #
-            if preserveChildren:
+            log.warning(exception)
+            return
 
-                node.assumeSnapshot()
+        log.debug(f'Scene queries: {cache.stats()}')
     # endregion
 
     # region Slots
@@ -600,7 +720,29 @@ class QMatrixTab(qabstracttab.QAbstractTab):
         :rtype: None
         """
 
-        self.origin = self.getCenterPosition()
+        # Evaluate keyboard modifiers
+        #
+        modifiers = QtWidgets.QApplication.keyboardModifiers()
+
+        if modifiers == QtCore.Qt.ShiftModifier:
+
+            result = self.getSurfacePoint()
+
+            if result is not None:
+
+                self.origin = result[0]
+
+        elif modifiers == QtCore.Qt.AltModifier:
+
+            result = self.getSurfacePoint(direction=self.forwardVector)
+
+            if result is not None:
+
+                self.origin = result[0]
+
+        else:
+
+            self.origin = self.getCenterPosition()
 
     @QtCore.Slot(bool)
     def on_forwardAxisPushButton_clicked(self, checked=False):
@@ -614,7 +756,7 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
         # Check if anything is selected
         #
-        selection = self.scene.getActiveSelection()
+        selection = self.getActiveSelection()
         selectionCount = len(selection)
 
         if selectionCount > 0:
@@ -631,6 +773,14 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
                 self.forwardVector = self.getAveragedNormal()
 
+            elif modifiers == QtCore.Qt.ShiftModifier:
+
+                result = self.getSurfacePoint()
+
+                if result is not None:
+
+                    self.forwardVector = result[1]
+
             else:
 
                 self.forwardVector = (self.getCenterPosition() - self.origin).normalize()
@@ -651,7 +801,7 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
         # Check if anything is selected
         #
-        selection = self.scene.getActiveSelection()
+        selection = self.getActiveSelection()
         selectionCount = len(selection)
 
         if selectionCount:
@@ -668,6 +818,14 @@ class QMatrixTab(qabstracttab.QAbstractTab):
 
                 self.upVector = self.getAveragedNormal()
 
+            elif modifiers == QtCore.Qt.ShiftModifier:
+
+                result = self.getSurfacePoint()
+
+                if result is not None:
+
+                    self.upVector = result[1]
+
             else:
 
                 self.upVector = (self.getCenterPosition() - self.origin).normalize()
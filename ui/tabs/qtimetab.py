@@ -0,0 +1,553 @@
+from Qt import QtCore, QtWidgets, QtGui
+from . import qabstracttab
+from ...libs import alignutils, bakeutils, querycache, framecache, profiler
+
+import logging
+logging.basicConfig()
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+
+
+class QTimeTab(qabstracttab.QAbstractTab):
+    """
+    Overload of `QAbstractTab` that bakes transforms over a span of time.
+    """
+
+    # region Dunderscores
+    __frame_limit__ = 1000000
+
+    def __setup_ui__(self, *args, **kwargs):
+        """
+        Private method that initializes the user interface.
+
+        :rtype: None
+        """
+
+        # Initialize widget
+        #
+        self.setWhatsThis(
+            'Select the source node followed by the nodes to bake onto.\n'
+            'Keys are written frame by frame inside a single undo chunk, with the DCC\'s default tangents.'
+        )
+
+        # Initialize central layout
+        #
+        centralLayout = QtWidgets.QVBoxLayout()
+        self.setLayout(centralLayout)
+
+        # Initialize mode group-box
+        #
+        self.modeLayout = QtWidgets.QHBoxLayout()
+        self.modeLayout.setObjectName('modeLayout')
+
+        self.modeGroupBox = QtWidgets.QGroupBox('Selection Mode:')
+        self.modeGroupBox.setObjectName('modeGroupBox')
+        self.modeGroupBox.setLayout(self.modeLayout)
+        self.modeGroupBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum))
+        self.modeGroupBox.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.oneToManyRadioButton = QtWidgets.QRadioButton('One-to-Many')
+        self.oneToManyRadioButton.setObjectName('oneToManyRadioButton')
+        self.oneToManyRadioButton.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.oneToManyRadioButton.setFixedHeight(24)
+        self.oneToManyRadioButton.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.oneToManyRadioButton.setChecked(True)
+        self.oneToManyRadioButton.setToolTip('Bakes the first selected node onto all remaining selected nodes.')
+
+        self.pairsRadioButton = QtWidgets.QRadioButton('Pairs')
+        self.pairsRadioButton.setObjectName('pairsRadioButton')
+        self.pairsRadioButton.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.pairsRadioButton.setFixedHeight(24)
+        self.pairsRadioButton.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.pairsRadioButton.setToolTip('Bakes each source onto the node selected after it: source1, target1, source2, target2...')
+
+        self.modeRadioButtonGroup = QtWidgets.QButtonGroup(self.modeGroupBox)
+        self.modeRadioButtonGroup.setObjectName('modeRadioButtonGroup')
+        self.modeRadioButtonGroup.setExclusive(True)
+        self.modeRadioButtonGroup.addButton(self.oneToManyRadioButton, id=0)
+        self.modeRadioButtonGroup.addButton(self.pairsRadioButton, id=1)
+
+        self.modeLayout.addWidget(self.oneToManyRadioButton)
+        self.modeLayout.addWidget(self.pairsRadioButton)
+
+        centralLayout.addWidget(self.modeGroupBox)
+
+        # Initialize frame range group-box
+        #
+        self.rangeLayout = QtWidgets.QGridLayout()
+        self.rangeLayout.setObjectName('rangeLayout')
+
+        self.rangeGroupBox = QtWidgets.QGroupBox('Frame Range:')
+        self.rangeGroupBox.setObjectName('rangeGroupBox')
+        self.rangeGroupBox.setLayout(self.rangeLayout)
+        self.rangeGroupBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum))
+        self.rangeGroupBox.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.startLabel = QtWidgets.QLabel('Start:')
+        self.startLabel.setObjectName('startLabel')
+        self.startLabel.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed))
+        self.startLabel.setFixedHeight(24)
+        self.startLabel.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+
+        self.startSpinBox = QtWidgets.QSpinBox()
+        self.startSpinBox.setObjectName('startSpinBox')
+        self.startSpinBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.startSpinBox.setFixedHeight(24)
+        self.startSpinBox.setRange(-self.__frame_limit__, self.__frame_limit__)
+        self.startSpinBox.setValue(0)
+
+        self.endLabel = QtWidgets.QLabel('End:')
+        self.endLabel.setObjectName('endLabel')
+        self.endLabel.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed))
+        self.endLabel.setFixedHeight(24)
+        self.endLabel.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+
+        self.endSpinBox = QtWidgets.QSpinBox()
+        self.endSpinBox.setObjectName('endSpinBox')
+        self.endSpinBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.endSpinBox.setFixedHeight(24)
+        self.endSpinBox.setRange(-self.__frame_limit__, self.__frame_limit__)
+        self.endSpinBox.setValue(100)
+
+        self.stepLabel = QtWidgets.QLabel('Step:')
+        self.stepLabel.setObjectName('stepLabel')
+        self.stepLabel.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Fixed))
+        self.stepLabel.setFixedHeight(24)
+        self.stepLabel.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+
+        self.stepSpinBox = QtWidgets.QSpinBox()
+        self.stepSpinBox.setObjectName('stepSpinBox')
+        self.stepSpinBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.stepSpinBox.setFixedHeight(24)
+        self.stepSpinBox.setRange(1, self.__frame_limit__)
+        self.stepSpinBox.setValue(1)
+        self.stepSpinBox.setToolTip('Keys every nth frame, the end frame is always keyed.')
+
+        self.timelinePushButton = QtWidgets.QPushButton('Timeline')
+        self.timelinePushButton.setObjectName('timelinePushButton')
+        self.timelinePushButton.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.timelinePushButton.setFixedHeight(24)
+        self.timelinePushButton.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.timelinePushButton.setToolTip('Copies the start and end frames from the scene timeline.')
+        self.timelinePushButton.clicked.connect(self.on_timelinePushButton_clicked)
+
+        self.reduceKeysCheckBox = QtWidgets.QCheckBox('Reduce Keys')
+        self.reduceKeysCheckBox.setObjectName('reduceKeysCheckBox')
+        self.reduceKeysCheckBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.reduceKeysCheckBox.setFixedHeight(24)
+        self.reduceKeysCheckBox.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.reduceKeysCheckBox.setToolTip('Reduces the baked keys to the fewest keys that stay within the tolerance.\nKeys are reduced against linear interpolation, the DCC\'s default tangents may deviate between keys!')
+
+        self.toleranceSpinBox = QtWidgets.QDoubleSpinBox()
+        self.toleranceSpinBox.setObjectName('toleranceSpinBox')
+        self.toleranceSpinBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.toleranceSpinBox.setFixedHeight(24)
+        self.toleranceSpinBox.setDecimals(4)
+        self.toleranceSpinBox.setRange(0.0001, 1.0)
+        self.toleranceSpinBox.setSingleStep(0.001)
+        self.toleranceSpinBox.setValue(0.001)
+        self.toleranceSpinBox.setToolTip('The maximum deviation from the baked matrices, in scene units for positions and roughly radians for axes.')
+
+        self.sharedCacheCheckBox = QtWidgets.QCheckBox('Reuse Samples')
+        self.sharedCacheCheckBox.setObjectName('sharedCacheCheckBox')
+        self.sharedCacheCheckBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.sharedCacheCheckBox.setFixedHeight(24)
+        self.sharedCacheCheckBox.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.sharedCacheCheckBox.setToolTip('Reuses frames sampled by previous bakes.\nEdits made outside of this tool may not be detected, clear the cache after changing any animation!')
+
+        self.clearCachePushButton = QtWidgets.QPushButton('Clear Cache')
+        self.clearCachePushButton.setObjectName('clearCachePushButton')
+        self.clearCachePushButton.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.clearCachePushButton.setFixedHeight(24)
+        self.clearCachePushButton.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.clearCachePushButton.setToolTip('Discards every frame sampled by previous bakes.')
+        self.clearCachePushButton.clicked.connect(self.on_clearCachePushButton_clicked)
+
+        self.rangeLayout.addWidget(self.startLabel, 0, 0)
+        self.rangeLayout.addWidget(self.startSpinBox, 0, 1)
+        self.rangeLayout.addWidget(self.endLabel, 0, 2)
+        self.rangeLayout.addWidget(self.endSpinBox, 0, 3)
+        self.rangeLayout.addWidget(self.stepLabel, 1, 0)
+        self.rangeLayout.addWidget(self.stepSpinBox, 1, 1)
+        self.rangeLayout.addWidget(self.timelinePushButton, 1, 2, 1, 2)
+        self.rangeLayout.addWidget(self.reduceKeysCheckBox, 2, 0, 1, 2)
+        self.rangeLayout.addWidget(self.toleranceSpinBox, 2, 2, 1, 2)
+        self.rangeLayout.addWidget(self.sharedCacheCheckBox, 3, 0, 1, 2)
+        self.rangeLayout.addWidget(self.clearCachePushButton, 3, 2, 1, 2)
+
+        centralLayout.addWidget(self.rangeGroupBox)
+
+        # Initialize match group-box
+        #
+        self.matchLayout = QtWidgets.QHBoxLayout()
+        self.matchLayout.setObjectName('matchLayout')
+
+        self.matchGroupBox = QtWidgets.QGroupBox('Match:')
+        self.matchGroupBox.setObjectName('matchGroupBox')
+        self.matchGroupBox.setLayout(self.matchLayout)
+        self.matchGroupBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Minimum))
+        self.matchGroupBox.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.translateCheckBox = QtWidgets.QCheckBox('Translate')
+        self.translateCheckBox.setObjectName('translateCheckBox')
+        self.translateCheckBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.translateCheckBox.setFixedHeight(24)
+        self.translateCheckBox.setChecked(True)
+        self.translateCheckBox.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.rotateCheckBox = QtWidgets.QCheckBox('Rotate')
+        self.rotateCheckBox.setObjectName('rotateCheckBox')
+        self.rotateCheckBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.rotateCheckBox.setFixedHeight(24)
+        self.rotateCheckBox.setChecked(True)
+        self.rotateCheckBox.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.scaleCheckBox = QtWidgets.QCheckBox('Scale')
+        self.scaleCheckBox.setObjectName('scaleCheckBox')
+        self.scaleCheckBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.scaleCheckBox.setFixedHeight(24)
+        self.scaleCheckBox.setChecked(False)
+        self.scaleCheckBox.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        self.maintainOffsetCheckBox = QtWidgets.QCheckBox('Maintain Offset')
+        self.maintainOffsetCheckBox.setObjectName('maintainOffsetCheckBox')
+        self.maintainOffsetCheckBox.setSizePolicy(QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed))
+        self.maintainOffsetCheckBox.setFixedHeight(24)
+        self.maintainOffsetCheckBox.setFocusPolicy(QtCore.Qt.NoFocus)
+        self.maintainOffsetCheckBox.setToolTip('Keeps the offset between each source and target at the current time.')
+
+        self.matchLayout.addWidget(self.translateCheckBox)
+        self.matchLayout.addWidget(self.rotateCheckBox)
+        self.matchLayout.addWidget(self.scaleCheckBox)
+        self.matchLayout.addWidget(self.maintainOffsetCheckBox)
+
+        centralLayout.addWidget(self.matchGroupBox)
+    # endregion
+
+    # region Properties
+    @property
+    def alignMode(self):
+        """
+        Getter method that returns the align mode.
+
+        :rtype: int
+        """
+
+        return self.modeRadioButtonGroup.checkedId()
+
+    @alignMode.setter
+    def alignMode(self, alignMode):
+        """
+        Setter method that updates the align mode.
+
+        :type alignMode: int
+        :rtype: None
+        """
+
+        if isinstance(alignMode, int):
+
+            self.modeRadioButtonGroup.buttons()[alignMode].setChecked(True)
+
+    @property
+    def startFrame(self):
+        """
+        Getter method that returns the start frame.
+
+        :rtype: int
+        """
+
+        return self.startSpinBox.value()
+
+    @startFrame.setter
+    def startFrame(self, startFrame):
+        """
+        Setter method that updates the start frame.
+
+        :type startFrame: int
+        :rtype: None
+        """
+
+        self.startSpinBox.setValue(int(startFrame))
+
+    @property
+    def endFrame(self):
+        """
+        Getter method that returns the end frame.
+
+        :rtype: int
+        """
+
+        return self.endSpinBox.value()
+
+    @endFrame.setter
+    def endFrame(self, endFrame):
+        """
+        Setter method that updates the end frame.
+
+        :type endFrame: int
+        :rtype: None
+        """
+
+        self.endSpinBox.setValue(int(endFrame))
+
+    @property
+    def step(self):
+        """
+        Getter method that returns the frame step.
+
+        :rtype: int
+        """
+
+        return self.stepSpinBox.value()
+
+    @step.setter
+    def step(self, step):
+        """
+        Setter method that updates the frame step.
+
+        :type step: int
+        :rtype: None
+        """
+
+        self.stepSpinBox.setValue(int(step))
+
+    @property
+    def reduceKeys(self):
+        """
+        Getter method that returns the reduce keys flag.
+
+        :rtype: bool
+        """
+
+        return self.reduceKeysCheckBox.isChecked()
+
+    @reduceKeys.setter
+    def reduceKeys(self, reduceKeys):
+        """
+        Setter method that updates the reduce keys flag.
+
+        :type reduceKeys: bool
+        :rtype: None
+        """
+
+        self.reduceKeysCheckBox.setChecked(bool(reduceKeys))
+
+    @property
+    def tolerance(self):
+        """
+        Getter method that returns the key reduction tolerance.
+
+        :rtype: float
+        """
+
+        return self.toleranceSpinBox.value()
+
+    @tolerance.setter
+    def tolerance(self, tolerance):
+        """
+        Setter method that updates the key reduction tolerance.
+
+        :type tolerance: float
+        :rtype: None
+        """
+
+        self.toleranceSpinBox.setValue(float(tolerance))
+
+    @property
+    def sharedCache(self):
+        """
+        Getter method that returns the shared cache flag.
+
+        :rtype: bool
+        """
+
+        return self.sharedCacheCheckBox.isChecked()
+
+    @sharedCache.setter
+    def sharedCache(self, sharedCache):
+        """
+        Setter method that updates the shared cache flag.
+
+        :type sharedCache: bool
+        :rtype: None
+        """
+
+        self.sharedCacheCheckBox.setChecked(bool(sharedCache))
+
+    @property
+    def maintainOffset(self):
+        """
+        Getter method that returns the maintain offset flag.
+
+        :rtype: bool
+        """
+
+        return self.maintainOffsetCheckBox.isChecked()
+
+    @maintainOffset.setter
+    def maintainOffset(self, maintainOffset):
+        """
+        Setter method that updates the maintain offset flag.
+
+        :type maintainOffset: bool
+        :rtype: None
+        """
+
+        self.maintainOffsetCheckBox.setChecked(bool(maintainOffset))
+    # endregion
+
+    # region Methods
+    def loadSettings(self, settings):
+        """
+        Loads the user settings.
+
+        :type settings: QtCore.QSettings
+        :rtype: None
+        """
+
+        self.alignMode = settings.value('tabs/time/alignMode', defaultValue=0, type=int)
+        self.step = settings.value('tabs/time/step', defaultValue=1, type=int)
+        self.reduceKeys = settings.value('tabs/time/reduceKeys', defaultValue=False, type=bool)
+        self.tolerance = settings.value('tabs/time/tolerance', defaultValue=0.001, type=float)
+        self.sharedCache = settings.value('tabs/time/sharedCache', defaultValue=False, type=bool)
+        self.maintainOffset = settings.value('tabs/time/maintainOffset', defaultValue=False, type=bool)
+
+        self.translateCheckBox.setChecked(settings.value('tabs/time/matchTranslate', defaultValue=True, type=bool))
+        self.rotateCheckBox.setChecked(settings.value('tabs/time/matchRotate', defaultValue=True, type=bool))
+        self.scaleCheckBox.setChecked(settings.value('tabs/time/matchScale', defaultValue=False, type=bool))
+
+        self.updateFrameRange()
+
+    def saveSettings(self, settings):
+        """
+        Saves the user settings.
+
+        :type settings: QtCore.QSettings
+        :rtype: None
+        """
+
+        settings.setValue('tabs/time/alignMode', self.alignMode)
+        settings.setValue('tabs/time/step', self.step)
+        settings.setValue('tabs/time/reduceKeys', self.reduceKeys)
+        settings.setValue('tabs/time/tolerance', self.tolerance)
+        settings.setValue('tabs/time/sharedCache', self.sharedCache)
+        settings.setValue('tabs/time/maintainOffset', self.maintainOffset)
+
+        settings.setValue('tabs/time/matchTranslate', self.translateCheckBox.isChecked())
+        settings.setValue('tabs/time/matchRotate', self.rotateCheckBox.isChecked())
+        settings.setValue('tabs/time/matchScale', self.scaleCheckBox.isChecked())
+
+    def matchTranslate(self):
+        """
+        Returns the `matchTranslate` flags.
+
+        :rtype: Tuple[bool, bool, bool]
+        """
+
+        return (self.translateCheckBox.isChecked(),) * 3
+
+    def matchRotate(self):
+        """
+        Returns the `matchRotate` flags.
+
+        :rtype: Tuple[bool, bool, bool]
+        """
+
+        return (self.rotateCheckBox.isChecked(),) * 3
+
+    def matchScale(self):
+        """
+        Returns the `matchScale` flags.
+
+        :rtype: Tuple[bool, bool, bool]
+        """
+
+        return (self.scaleCheckBox.isChecked(),) * 3
+
+    def updateFrameRange(self):
+        """
+        Copies the start and end frames from the scene timeline.
+
+        :rtype: None
+        """
+
+        self.startFrame, self.endFrame = bakeutils.getFrameRange(self.scene)
+
+    def apply(self, preserveChildren=False, freezeTransform=False):
+        """
+        Bakes the active selection over the current frame range.
+        If key reduction is enabled then the baked keys are reduced to fit within the tolerance.
+        If reuse samples is enabled then frames are shared with previous bakes through the shared frame cache.
+        The selection order consisting of the source to bake from followed by the targets to bake onto.
+        Alternatively, pairs mode expects interleaved source and target nodes.
+        Baked keys always replace the local matrices, so the preserve children and freeze transform flags are ignored!
+
+        :type preserveChildren: bool
+        :type freezeTransform: bool
+        :rtype: None
+        """
+
+        # Get active selection
+        #
+        with profiler.phase('selection'):
+
+            selection = self.getActiveSelection()
+
+        # Try and bake selection
+        #
+        cache = querycache.QueryCache()
+
+        try:
+
+            sources, targets = alignutils.splitSelection(selection, alignMode=self.alignMode)
+
+            bakeutils.bakeTransforms(
+                sources,
+                targets,
+                startFrame=self.startFrame,
+                endFrame=self.endFrame,
+                step=self.step,
+                maintainOffset=self.maintainOffset,
+                matchTranslate=self.matchTranslate(),
+                matchRotate=self.matchRotate(),
+                matchScale=self.matchScale(),
+                tolerance=self.tolerance if self.reduceKeys else None,
+                scene=self.scene,
+                cache=cache,
+                frameCache=framecache.getCache() if self.sharedCache else None
+            )
+
+        except TypeError as exception:
+
+            log.warning(exception)
+            return
+
+        log.debug(f'Scene queries: {cache.stats()}')
+    # endregion
+
+    # region Slots
+    @QtCore.Slot(bool)
+    def on_timelinePushButton_clicked(self, checked=False):
+        """
+        Slot method for the timelinePushButton's `clicked` signal.
+        This method copies the frame range from the scene timeline.
+
+        :type checked: bool
+        :rtype: None
+        """
+
+        self.updateFrameRange()
+
+    @QtCore.Slot(bool)
+    def on_clearCachePushButton_clicked(self, checked=False):
+        """
+        Slot method for the clearCachePushButton's `clicked` signal.
+        This method discards every frame sampled by previous bakes.
+
+        :type checked: bool
+        :rtype: None
+        """
+
+        framecache.clearCache()
+        log.info('Cleared frame cache.')
+    # endregion